@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException, Response, status
+
+from src.management.logger import configure_logger
+from src.management.metrics import CONTENT_TYPE
+from src.services.metrics_service import get_metrics_service
+
+router = APIRouter()
+logger = configure_logger("MetricsAPI", "red")
+metrics_service = get_metrics_service()
+
+
+@router.get("", status_code=status.HTTP_200_OK, response_class=Response)
+async def get_metrics() -> Response:
+    """Export peer and internal latency metrics in Prometheus text format."""
+    try:
+        return Response(content=metrics_service.render(), media_type=CONTENT_TYPE)
+    except Exception as exc:
+        logger.error(f"Failed to render metrics: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
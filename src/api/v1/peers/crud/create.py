@@ -1,13 +1,32 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 
 from src.api.v1.peers.logger import logger
-from src.api.v1.peers.schemas import CreatePeerRequest, CreatePeerResponse
-from src.services.management.protocol_factory import create_protocol_service, get_active_protocol_name
+from src.api.v1.peers.schemas import (
+    BatchCreatePeerResult,
+    BatchCreatePeersRequest,
+    BatchCreatePeersResponse,
+    CreatePeerRequest,
+    CreatePeerResponse,
+)
+from src.management.settings import get_settings
+from src.services.management.protocol_factory import get_protocol_service, get_active_protocol_name
 
 
 router = APIRouter()
 
 
+def _to_create_response(result: dict) -> CreatePeerResponse:
+    return CreatePeerResponse(
+        public_key=result["public_key"],
+        private_key=result["private_key"],
+        allocated_ip=result["allocated_ip"],
+        endpoint=result["endpoint"],
+        app_type=result["app_type"],
+        protocol=result["protocol"],
+        config=result["config"],
+    )
+
+
 @router.post(
     "/",
     response_model=CreatePeerResponse,
@@ -17,7 +36,7 @@ async def create_peer(payload: CreatePeerRequest) -> CreatePeerResponse:
     """Create a new peer with automatic IP allocation."""
     try:
         protocol_name = get_active_protocol_name()
-        service = create_protocol_service(protocol_name)
+        service = get_protocol_service(protocol_name)
 
         result = await service.create_peer(
             app_type=payload.app_type.value,
@@ -28,15 +47,7 @@ async def create_peer(payload: CreatePeerRequest) -> CreatePeerResponse:
             f"app_type={result['app_type']} ip={result['allocated_ip']}"
         )
 
-        return CreatePeerResponse(
-            public_key=result["public_key"],
-            private_key=result["private_key"],
-            allocated_ip=result["allocated_ip"],
-            endpoint=result["endpoint"],
-            app_type=result["app_type"],
-            protocol=result["protocol"],
-            config=result["config"],
-        )
+        return _to_create_response(result)
 
     except ValueError as exc:
         logger.error(f"Validation error: {exc}")
@@ -50,3 +61,70 @@ async def create_peer(payload: CreatePeerRequest) -> CreatePeerResponse:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(exc),
         )
+
+
+@router.post(
+    "/batch",
+    response_model=BatchCreatePeersResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_peers_batch(
+    payload: BatchCreatePeersRequest,
+    response: Response,
+) -> BatchCreatePeersResponse:
+    """Create many peers with a single config write. Failures are reported per peer."""
+    max_size = get_settings().peer_batch_max_size
+    if len(payload.peers) > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch is limited to {max_size} peers",
+        )
+
+    try:
+        protocol_name = get_active_protocol_name()
+        service = get_protocol_service(protocol_name)
+
+        results = await service.create_peers(
+            [
+                {"app_type": item.app_type.value, "allocated_ip": item.allocated_ip}
+                for item in payload.peers
+            ]
+        )
+
+    except ValueError as exc:
+        logger.error(f"Validation error: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    except Exception as exc:
+        logger.error(f"Failed to create peers: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
+
+    items = []
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            items.append(BatchCreatePeerResult(index=index, status="failed", error=str(result)))
+        else:
+            items.append(
+                BatchCreatePeerResult(
+                    index=index,
+                    status="created",
+                    peer=_to_create_response(result),
+                )
+            )
+
+    failed = sum(1 for item in items if item.status == "failed")
+    if failed:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+
+    logger.info(f"Batch create: {len(items) - failed} created, {failed} failed")
+
+    return BatchCreatePeersResponse(
+        created=len(items) - failed,
+        failed=failed,
+        results=items,
+    )
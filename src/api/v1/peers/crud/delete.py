@@ -1,8 +1,14 @@
 from fastapi import APIRouter, HTTPException, status
 
 from src.api.v1.peers.logger import logger
-from src.api.v1.peers.schemas import DeletePeerRequest, DeletePeerResponse
-from src.services.management.protocol_factory import create_protocol_service, get_active_protocol_name 
+from src.api.v1.peers.schemas import (
+    BatchDeletePeersRequest,
+    BatchDeletePeersResponse,
+    DeletePeerRequest,
+    DeletePeerResponse,
+)
+from src.management.settings import get_settings
+from src.services.management.protocol_factory import get_protocol_service, get_active_protocol_name 
 
 
 router = APIRouter()
@@ -18,7 +24,7 @@ async def delete_peer(payload: DeletePeerRequest) -> DeletePeerResponse:
     try:
         public_key = payload.public_key.strip()
         protocol_name = get_active_protocol_name()
-        service = create_protocol_service(protocol_name)
+        service = get_protocol_service(protocol_name)
         deleted = await service.delete_peer(public_key)
 
         if not deleted:
@@ -42,3 +48,40 @@ async def delete_peer(payload: DeletePeerRequest) -> DeletePeerResponse:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(exc),
         )
+
+
+@router.delete(
+    "/batch",
+    response_model=BatchDeletePeersResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def delete_peers_batch(payload: BatchDeletePeersRequest) -> BatchDeletePeersResponse:
+    """Delete many peers with a single config write. Unknown keys are reported as missing."""
+    max_size = get_settings().peer_batch_max_size
+    if len(payload.public_keys) > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch is limited to {max_size} peers",
+        )
+
+    try:
+        public_keys = [key.strip() for key in payload.public_keys if key.strip()]
+        protocol_name = get_active_protocol_name()
+        service = get_protocol_service(protocol_name)
+        result = await service.delete_peers(public_keys)
+
+        logger.info(
+            f"Batch delete: {len(result['deleted'])} deleted, {len(result['missing'])} missing"
+        )
+
+        return BatchDeletePeersResponse(
+            deleted=result["deleted"],
+            missing=result["missing"],
+        )
+
+    except Exception as exc:
+        logger.error(f"Failed to delete peers: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
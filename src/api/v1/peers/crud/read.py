@@ -1,13 +1,122 @@
+import ipaddress
+import json
+import time
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime, timezone
 from typing import Optional, List
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
+from src.api.v1.management.etag import is_not_modified, make_etag, not_modified_response
 from src.api.v1.peers.logger import logger
-from src.api.v1.peers.schemas import ListPeerResponse, AppType
-from src.services.management.protocol_factory import create_protocol_service, get_active_protocol_name
+from src.api.v1.peers.schemas import (
+    ListPeerResponse,
+    AppType,
+    PeerSortField,
+    PeerTrafficSeriesResponse,
+    PeerTrafficUsageResponse,
+    SortOrder,
+    TrafficUsageResponse,
+)
+from src.services.management.peer_index import PeerQuery
+from src.services.management.peer_snapshot import get_peer_snapshot_store
+from src.services.management.protocol_factory import get_active_protocol_name
+from src.services.management.traffic_accounting import (
+    TrafficAccounting,
+    get_traffic_accounting,
+)
+from src.services.management.traffic_series import WINDOW_SECONDS, get_traffic_series_store
 
 router = APIRouter()
 
+STREAM_CHUNK_PEERS = 500
+
+
+def _build_peer_query(
+    app_type: Optional[str],
+    online_only: Optional[bool],
+    sort: PeerSortField,
+    order: SortOrder,
+    ip_prefix: Optional[str],
+    handshake_within: Optional[int],
+    handshake_older_than: Optional[int],
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> PeerQuery:
+    if app_type:
+        try:
+            AppType(app_type)
+        except ValueError:
+            raise ValueError(f"Invalid app_type: {app_type}")
+
+    ip_network = None
+    if ip_prefix:
+        try:
+            ip_network = ipaddress.IPv4Network(ip_prefix, strict=False)
+        except ValueError:
+            raise ValueError(f"Invalid ip_prefix: {ip_prefix}")
+
+    now = time.time()
+    return PeerQuery(
+        sort=sort.value,
+        descending=order == SortOrder.DESC,
+        limit=limit,
+        cursor=cursor,
+        app_type=app_type,
+        online_only=bool(online_only),
+        ip_network=ip_network,
+        handshake_after=now - handshake_within if handshake_within is not None else None,
+        handshake_before=(
+            now - handshake_older_than if handshake_older_than is not None else None
+        ),
+    )
+
+
+def _usage_range(since: Optional[datetime], until: Optional[datetime]) -> tuple[int, int]:
+    start = int(since.timestamp()) if since else 0
+    end = int(until.timestamp()) if until else int(time.time()) + 1
+    if end <= start:
+        raise ValueError("until must be later than since")
+    return start, end
+
+
+def _get_accounting() -> TrafficAccounting:
+    accounting = get_traffic_accounting()
+    if accounting is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Traffic accounting is disabled",
+        )
+    return accounting
+
+
+def _to_list_item(peer: dict, protocol_name: str) -> dict:
+    return {
+        "public_key": peer["public_key"],
+        "allocated_ip": peer["allowed_ips"][0] if peer.get("allowed_ips") else "N/A",
+        "app_type": peer.get("app_type"),
+        "protocol": protocol_name,
+        "endpoint": peer.get("endpoint") or "N/A",
+        "online": peer.get("online", False),
+        "last_handshake": peer.get("last_handshake"),
+        "rx_bytes": peer.get("rx_bytes", 0),
+        "tx_bytes": peer.get("tx_bytes", 0),
+        "lifetime_rx_bytes": peer.get("lifetime_rx_bytes"),
+        "lifetime_tx_bytes": peer.get("lifetime_tx_bytes"),
+    }
+
+
+async def _stream_ndjson(peers: Iterator[dict], protocol_name: str) -> AsyncIterator[bytes]:
+    lines: list[str] = []
+    for peer in peers:
+        lines.append(json.dumps(_to_list_item(peer, protocol_name), separators=(",", ":")))
+        if len(lines) >= STREAM_CHUNK_PEERS:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
 
 @router.get(
     "/",
@@ -15,42 +124,56 @@ router = APIRouter()
     status_code=status.HTTP_200_OK,
 )
 async def list_peers(
+    request: Request,
+    response: Response,
     app_type: Optional[str] = None,
     online_only: Optional[bool] = False,
+    fresh: Optional[bool] = False,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    sort: PeerSortField = PeerSortField.PUBLIC_KEY,
+    order: SortOrder = SortOrder.ASC,
+    ip_prefix: Optional[str] = None,
+    handshake_within: Optional[int] = Query(None, ge=0),
+    handshake_older_than: Optional[int] = Query(None, ge=0),
 ) -> List[ListPeerResponse]:
-    """List all peers with their status and traffic statistics. Optional filters by app_type and online status."""
+    """List peers with their status and traffic statistics. Supports cursor pagination, sorting and filters."""
     try:
-        if app_type:
-            try:
-                AppType(app_type)
-            except ValueError:
-                raise ValueError(f"Invalid app_type: {app_type}")
+        query = _build_peer_query(
+            app_type,
+            online_only,
+            sort,
+            order,
+            ip_prefix,
+            handshake_within,
+            handshake_older_than,
+            limit=limit,
+            cursor=cursor,
+        )
 
         protocol_name = get_active_protocol_name()
-        service = create_protocol_service(protocol_name)
-        peers_data = await service.get_peers()
-
-        peers = []
-        for peer in peers_data:
-            if app_type and peer.get("app_type") != app_type:
-                continue
-
-            if online_only and not peer.get("online"):
-                continue
-
-            peers.append(
-                ListPeerResponse(
-                    public_key=peer["public_key"],
-                    allocated_ip=peer["allowed_ips"][0] if peer.get("allowed_ips") else "N/A",
-                    app_type=peer.get("app_type"),
-                    protocol=protocol_name,
-                    endpoint=peer.get("endpoint") or "N/A",
-                    online=peer.get("online", False),
-                    last_handshake=peer.get("last_handshake"),
-                    rx_bytes=peer.get("rx_bytes", 0),
-                    tx_bytes=peer.get("tx_bytes", 0),
-                )
+        snapshot = await get_peer_snapshot_store(protocol_name).get(fresh=bool(fresh))
+        snapshot_headers = {
+            "X-Snapshot-Version": str(snapshot.version),
+            "X-Snapshot-Timestamp": snapshot.created_at.isoformat(),
+        }
+        response.headers.update(snapshot_headers)
+
+        # Relative handshake filters select different peers as time passes on the same snapshot
+        if handshake_within is None and handshake_older_than is None:
+            query_key = sorted(
+                item for item in request.query_params.multi_items() if item[0] != "fresh"
             )
+            etag = make_etag("peers", protocol_name, snapshot.digest, query_key)
+            if is_not_modified(request, etag):
+                return not_modified_response(etag, snapshot_headers)
+            response.headers["ETag"] = etag
+
+        page, next_cursor = snapshot.index.query(query)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+
+        peers = [ListPeerResponse(**_to_list_item(peer, protocol_name)) for peer in page]
 
         logger.info(f"Listed {len(peers)} peers")
         return peers
@@ -67,3 +190,185 @@ async def list_peers(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(exc),
         )
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def stream_peers(
+    app_type: Optional[str] = None,
+    online_only: Optional[bool] = False,
+    fresh: Optional[bool] = False,
+    cursor: Optional[str] = None,
+    sort: PeerSortField = PeerSortField.PUBLIC_KEY,
+    order: SortOrder = SortOrder.ASC,
+    ip_prefix: Optional[str] = None,
+    handshake_within: Optional[int] = Query(None, ge=0),
+    handshake_older_than: Optional[int] = Query(None, ge=0),
+) -> StreamingResponse:
+    """Stream peers as newline-delimited JSON, one peer per line. Accepts the same filters as the list endpoint."""
+    try:
+        query = _build_peer_query(
+            app_type,
+            online_only,
+            sort,
+            order,
+            ip_prefix,
+            handshake_within,
+            handshake_older_than,
+            cursor=cursor,
+        )
+
+        protocol_name = get_active_protocol_name()
+        snapshot = await get_peer_snapshot_store(protocol_name).get(fresh=bool(fresh))
+        peers = snapshot.index.iter_peers(query)
+
+        logger.info(f"Streaming peers from snapshot v{snapshot.version}")
+        return StreamingResponse(
+            _stream_ndjson(peers, protocol_name),
+            media_type="application/x-ndjson",
+            headers={
+                "X-Snapshot-Version": str(snapshot.version),
+                "X-Snapshot-Timestamp": snapshot.created_at.isoformat(),
+            },
+        )
+
+    except ValueError as exc:
+        logger.error(f"Validation error: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    except Exception as exc:
+        logger.error(f"Failed to stream peers: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
+
+
+@router.get(
+    "/{public_key:path}/traffic/series",
+    response_model=PeerTrafficSeriesResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_peer_traffic_series(public_key: str) -> PeerTrafficSeriesResponse:
+    """Report current and averaged traffic rates of a peer with downsampled 1m/1h/24h history."""
+    try:
+        protocol_name = get_active_protocol_name()
+        snapshot = await get_peer_snapshot_store(protocol_name).get()
+        peer = snapshot.index.find(public_key)
+        series = get_traffic_series_store(protocol_name).get(public_key)
+
+        if peer is None or series is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Peer {public_key[:16]}... not found",
+            )
+
+        now = int(time.time())
+        return PeerTrafficSeriesResponse(
+            public_key=public_key,
+            protocol=protocol_name,
+            rx_bytes=peer.get("rx_bytes", 0),
+            tx_bytes=peer.get("tx_bytes", 0),
+            **series.current_rate(),
+            windows=[series.window(name, now) for name in WINDOW_SECONDS],
+        )
+
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.error(f"Failed to get traffic series: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
+
+
+@router.get(
+    "/traffic/usage",
+    response_model=TrafficUsageResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_traffic_usage(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> TrafficUsageResponse:
+    """Report lifetime traffic of every accounted peer and its usage within an hour-aligned time range."""
+    try:
+        accounting = _get_accounting()
+        start, end = _usage_range(since, until)
+        protocol_name = get_active_protocol_name()
+        peers = await accounting.get_usage(protocol_name, start, end)
+
+        logger.info(f"Traffic usage for {len(peers)} peers")
+        return TrafficUsageResponse(
+            protocol=protocol_name,
+            since=datetime.fromtimestamp(start, timezone.utc),
+            until=datetime.fromtimestamp(end, timezone.utc),
+            peers=peers,
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as exc:
+        logger.error(f"Validation error: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    except Exception as exc:
+        logger.error(f"Failed to get traffic usage: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
+
+
+@router.get(
+    "/{public_key:path}/traffic/usage",
+    response_model=PeerTrafficUsageResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_peer_traffic_usage(
+    public_key: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> PeerTrafficUsageResponse:
+    """Report lifetime traffic of a peer and its hourly usage within a time range."""
+    try:
+        accounting = _get_accounting()
+        start, end = _usage_range(since, until)
+        protocol_name = get_active_protocol_name()
+        usage = await accounting.get_peer_usage(protocol_name, public_key, start, end)
+
+        if usage is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Peer {public_key[:16]}... not found",
+            )
+
+        return PeerTrafficUsageResponse(
+            protocol=protocol_name,
+            since=datetime.fromtimestamp(start, timezone.utc),
+            until=datetime.fromtimestamp(end, timezone.utc),
+            **usage,
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as exc:
+        logger.error(f"Validation error: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    except Exception as exc:
+        logger.error(f"Failed to get peer traffic usage: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
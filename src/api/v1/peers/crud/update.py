@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, status
 
 from src.api.v1.peers.logger import logger
 from src.api.v1.peers.schemas import UpdatePeerRequest, UpdatePeerResponse
-from src.services.management.protocol_factory import create_protocol_service, get_active_protocol_name
+from src.services.management.protocol_factory import get_protocol_service, get_active_protocol_name
 
 
 router = APIRouter()
@@ -18,34 +18,18 @@ async def update_peer(payload: UpdatePeerRequest) -> UpdatePeerResponse:
     try:
         public_key = payload.public_key.strip()
         protocol_name = get_active_protocol_name()
-        service = create_protocol_service(protocol_name)
-        peers_data = await service.get_peers()
-
-        old_peer = None
-        for peer in peers_data:
-            if peer["public_key"] == public_key:
-                old_peer = peer
-                break
+        service = get_protocol_service(protocol_name)
+        result = await service.update_peer(
+            public_key=public_key,
+            app_type=payload.app_type.value,
+        )
 
-        if not old_peer:
+        if result is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Peer {public_key[:16]}... not found",
             )
 
-        old_allocated_ip = (
-            old_peer["allowed_ips"][0]
-            if old_peer.get("allowed_ips")
-            else None
-        )
-
-        await service.delete_peer(public_key)
-
-        result = await service.create_peer(
-            app_type=payload.app_type.value,
-            allocated_ip=old_allocated_ip,
-        )
-
         logger.info(
             f"Peer {public_key[:16]}... updated: "
             f"{result['app_type']} ip={result['allocated_ip']}"
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
 from pydantic import BaseModel, Field
@@ -10,6 +10,21 @@ class AppType(str, Enum):
     AMNEZIA_VPN = "amnezia_vpn"
     AMNEZIA_WG = "amnezia_wg"
 
+
+class PeerSortField(str, Enum):
+    """Fields available for sorting the peer list"""
+    PUBLIC_KEY = "public_key"
+    HANDSHAKE = "handshake"
+    TRAFFIC = "traffic"
+    IP = "ip"
+
+
+class SortOrder(str, Enum):
+    """Sort direction for list endpoints"""
+    ASC = "asc"
+    DESC = "desc"
+
+
 class CreatePeerRequest(BaseModel):
     app_type: AppType = Field(..., description="Application type for peer configuration")
 
@@ -25,6 +40,28 @@ class CreatePeerResponse(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class BatchCreatePeerItem(BaseModel):
+    app_type: AppType = Field(..., description="Application type for peer configuration")
+    allocated_ip: Optional[str] = Field(None, description="Fixed IP address, allocated automatically if omitted")
+
+
+class BatchCreatePeersRequest(BaseModel):
+    peers: List[BatchCreatePeerItem] = Field(..., min_length=1, description="Peers to create")
+
+
+class BatchCreatePeerResult(BaseModel):
+    index: int
+    status: str
+    peer: Optional[CreatePeerResponse] = None
+    error: Optional[str] = None
+
+
+class BatchCreatePeersResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BatchCreatePeerResult]
+
+
 class ListPeerResponse(BaseModel):
     public_key: str
     allocated_ip: str
@@ -35,12 +72,72 @@ class ListPeerResponse(BaseModel):
     last_handshake: Optional[datetime] = None
     rx_bytes: int = 0
     tx_bytes: int = 0
+    lifetime_rx_bytes: Optional[int] = None
+    lifetime_tx_bytes: Optional[int] = None
     created_at: Optional[datetime] = None
 
     class Config:
         populate_by_name = True
 
 
+class TrafficRatePoint(BaseModel):
+    timestamp: datetime
+    rx_bytes_per_second: float
+    tx_bytes_per_second: float
+
+
+class TrafficWindow(BaseModel):
+    window: str
+    rx_bytes_per_second: float
+    tx_bytes_per_second: float
+    points: List[TrafficRatePoint]
+
+
+class PeerTrafficSeriesResponse(BaseModel):
+    public_key: str
+    protocol: str
+    rx_bytes: int
+    tx_bytes: int
+    rx_bytes_per_second: float
+    tx_bytes_per_second: float
+    windows: List[TrafficWindow]
+
+
+class TrafficUsageBucket(BaseModel):
+    bucket: datetime
+    rx_bytes: int
+    tx_bytes: int
+
+
+class PeerTrafficUsageResponse(BaseModel):
+    public_key: str
+    protocol: str
+    since: datetime
+    until: datetime
+    rx_bytes: int
+    tx_bytes: int
+    lifetime_rx_bytes: int
+    lifetime_tx_bytes: int
+    first_seen: datetime
+    updated_at: datetime
+    buckets: List[TrafficUsageBucket]
+
+
+class TrafficUsageItem(BaseModel):
+    public_key: str
+    rx_bytes: int
+    tx_bytes: int
+    lifetime_rx_bytes: int
+    lifetime_tx_bytes: int
+
+
+class TrafficUsageResponse(BaseModel):
+    protocol: str
+    since: datetime
+    until: datetime
+    peers: List[TrafficUsageItem]
+
+
 class UpdatePeerRequest(BaseModel):
     public_key: str = Field(..., description="Public key of peer to update")
     app_type: AppType = Field(..., description="New application type for peer configuration")
@@ -64,3 +161,12 @@ class DeletePeerResponse(BaseModel):
 
 class DeletePeerRequest(BaseModel):
     public_key: str = Field(..., description="Public key of peer to delete")
+
+
+class BatchDeletePeersRequest(BaseModel):
+    public_keys: List[str] = Field(..., min_length=1, description="Public keys of peers to delete")
+
+
+class BatchDeletePeersResponse(BaseModel):
+    deleted: List[str]
+    missing: List[str]
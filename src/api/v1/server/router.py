@@ -1,17 +1,22 @@
-from fastapi import APIRouter, HTTPException, status
+from typing import Optional
 
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from src.api.v1.management.etag import is_not_modified, make_etag, not_modified_response
 from src.api.v1.server.logger import logger
 from src.api.v1.server.schemas import (
+    ReadCoalescingResponse,
     ServerStatusResponse,
     ServerTrafficResponse,
     RestartServerResponse,
 )
 from src.services.host_service import HostService
+from src.services.management.peer_snapshot import get_peer_snapshot_store
 from src.services.management.protocol_factory import (
-    create_protocol_service,
     get_active_protocol_name,
     get_protocol_config,
 )
+from src.services.management.single_flight import get_read_single_flight
 
 router = APIRouter()
 
@@ -30,7 +35,7 @@ except Exception as exc:
     response_model=ServerStatusResponse,
     status_code=status.HTTP_200_OK,
 )
-async def get_server_status() -> ServerStatusResponse:
+async def get_server_status(request: Request, response: Response) -> ServerStatusResponse:
     """Retrieve the current status of the Amnezia server including container state, port, and interface."""
     try:
         protocol_name = get_active_protocol_name()
@@ -39,6 +44,12 @@ async def get_server_status() -> ServerStatusResponse:
         interface = protocol_config["interface"]
 
         is_running = await host_service.is_container_running(container_name)
+        port = await host_service.get_container_port(container_name, "udp") if is_running else None
+
+        etag = make_etag("status", protocol_name, container_name, interface, is_running, port)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        response.headers["ETag"] = etag
 
         if not is_running:
             logger.warning(f"Container {container_name} is not running")
@@ -50,8 +61,6 @@ async def get_server_status() -> ServerStatusResponse:
                 protocol=protocol_name,
             )
 
-        port = await host_service.get_container_port(container_name, "udp")
-
         logger.info(f"Server status: {container_name} running on port {port}")
 
         return ServerStatusResponse(
@@ -75,15 +84,34 @@ async def get_server_status() -> ServerStatusResponse:
     response_model=ServerTrafficResponse,
     status_code=status.HTTP_200_OK,
 )
-async def get_server_traffic() -> ServerTrafficResponse:
+async def get_server_traffic(
+    request: Request,
+    response: Response,
+    fresh: Optional[bool] = False,
+) -> ServerTrafficResponse:
     """Retrieve aggregated traffic statistics for all peers including bytes and connection metrics."""
     try:
         protocol_name = get_active_protocol_name()
-        service = create_protocol_service(protocol_name)
-        peers_data = await service.get_peers()
+        snapshot = await get_peer_snapshot_store(protocol_name).get(fresh=bool(fresh))
+        snapshot_headers = {
+            "X-Snapshot-Version": str(snapshot.version),
+            "X-Snapshot-Timestamp": snapshot.created_at.isoformat(),
+        }
+        etag = make_etag("traffic", protocol_name, snapshot.digest)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag, snapshot_headers)
+        response.headers.update(snapshot_headers)
+        response.headers["ETag"] = etag
+        peers_data = snapshot.peers
 
         total_rx_bytes = sum(peer.get("rx_bytes", 0) for peer in peers_data)
         total_tx_bytes = sum(peer.get("tx_bytes", 0) for peer in peers_data)
+        lifetime_rx_bytes = sum(
+            peer.get("lifetime_rx_bytes", peer.get("rx_bytes", 0)) for peer in peers_data
+        )
+        lifetime_tx_bytes = sum(
+            peer.get("lifetime_tx_bytes", peer.get("tx_bytes", 0)) for peer in peers_data
+        )
         total_peers = len(peers_data)
         online_peers = sum(1 for peer in peers_data if peer.get("online", False))
 
@@ -95,6 +123,8 @@ async def get_server_traffic() -> ServerTrafficResponse:
         return ServerTrafficResponse(
             total_rx_bytes=total_rx_bytes,
             total_tx_bytes=total_tx_bytes,
+            lifetime_rx_bytes=lifetime_rx_bytes,
+            lifetime_tx_bytes=lifetime_tx_bytes,
             total_peers=total_peers,
             online_peers=online_peers,
         )
@@ -107,6 +137,16 @@ async def get_server_traffic() -> ServerTrafficResponse:
         )
 
 
+@router.get(
+    "/coalescing",
+    response_model=ReadCoalescingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_read_coalescing_stats() -> ReadCoalescingResponse:
+    """Report how many container reads were served by an identical read already in flight."""
+    return ReadCoalescingResponse(**get_read_single_flight().stats())
+
+
 @router.post(
     "/restart",
     response_model=RestartServerResponse,
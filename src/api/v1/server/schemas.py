@@ -13,10 +13,19 @@ class ServerStatusResponse(BaseModel):
 class ServerTrafficResponse(BaseModel):
     total_rx_bytes: int
     total_tx_bytes: int
+    lifetime_rx_bytes: int
+    lifetime_tx_bytes: int
     total_peers: int
     online_peers: int
 
 
+class ReadCoalescingResponse(BaseModel):
+    calls: int
+    executions: int
+    coalesced: int
+    in_flight: int
+
+
 class RestartServerResponse(BaseModel):
     status: str
     message: str
@@ -1,32 +1,56 @@
+import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request
 
 from src.management.logger import configure_logger
 from src.management.settings import get_settings
+from src.management.metrics import HTTP_REQUEST_SECONDS
 from src.api.v1.peers.router import router as peers_router
 from src.api.v1.server.router import router as server_router
+from src.api.v1.metrics.router import router as metrics_router
 from src.api.v1.management.middlewares.auth import get_current_api_key
 from src.management.security import get_api_key_storage
 from src.services.sync_scheduler import SyncScheduler
+from src.services.reconcile_scheduler import ReconcileScheduler
+from src.services.snapshot_scheduler import SnapshotScheduler
+from src.services.management.container_state import get_container_state_cache
+from src.services.management.docker_engine import close_docker_engine
+from src.services.management.shell_session import close_shell_sessions
+from src.services.management.traffic_accounting import close_traffic_accounting
 from src.services.management.protocol_factory import (
+    close_protocol_services,
     get_available_protocols,
+    init_protocol_services,
     load_protocol_config,
 )
 
 logger = configure_logger("MAIN", "cyan")
 settings = get_settings()
 sync_scheduler = SyncScheduler()
+reconcile_scheduler = ReconcileScheduler()
+snapshot_scheduler = SnapshotScheduler()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting Amnezia API...")
     load_protocol_config()
     logger.info(f"Loaded protocols: {get_available_protocols()}")
+    init_protocol_services()
+    await get_container_state_cache().start()
     api_key = get_api_key_storage().get_api_key()
     logger.info(f"The API key was successfully installed: {api_key}")
+    await snapshot_scheduler.start()
     await sync_scheduler.start()
+    await reconcile_scheduler.start()
     yield
+    await reconcile_scheduler.stop()
     await sync_scheduler.stop()
+    await snapshot_scheduler.stop()
+    await get_container_state_cache().stop()
+    await close_protocol_services()
+    await close_shell_sessions()
+    await close_docker_engine()
+    close_traffic_accounting()
     logger.info("Shutting down Amnezia API...")
 
 
@@ -56,6 +80,31 @@ app.include_router(
     dependencies=[Depends(get_current_api_key)]
 )
 
+app.include_router(
+    metrics_router,
+    prefix="/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(get_current_api_key)]
+)
+
+
+@app.middleware("http")
+async def observe_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status_code),
+        )
+
 @app.get("/health")
 async def health_check():
     return {
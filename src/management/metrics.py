@@ -0,0 +1,135 @@
+import math
+import re
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_LABEL_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", '"': '\\"'})
+_LABEL_VALUE = re.compile(r"^[A-Za-z0-9_.:-]{1,32}$")
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        series = self._series.get(key)
+        if series is None:
+            series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            self._series[key] = series
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for key, (counts, total, count) in sorted(self._series.items()):
+            base = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(
+                    sample(f"{self.name}_bucket", cumulative, {**base, "le": format_value(bound)})
+                )
+            lines.append(sample(f"{self.name}_bucket", count, {**base, "le": "+Inf"}))
+            lines.append(sample(f"{self.name}_sum", total, base))
+            lines.append(sample(f"{self.name}_count", count, base))
+        return lines
+
+
+def gauge_family(name: str, documentation: str, samples: list[tuple[dict, float]]) -> list[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+    lines.extend(sample(name, value, labels) for labels, value in samples)
+    return lines
+
+
+def sample(name: str, value: float, labels: dict[str, str] | None = None) -> str:
+    if labels:
+        rendered = ",".join(
+            f'{key}="{str(label).translate(_LABEL_ESCAPES)}"' for key, label in labels.items()
+        )
+        return f"{name}{{{rendered}}} {format_value(value)}"
+    return f"{name} {format_value(value)}"
+
+
+def format_value(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if value.is_integer():
+            return str(int(value)) if abs(value) < 1e15 else repr(value)
+        return repr(value)
+    return str(value)
+
+
+def command_label(command: str) -> str:
+    parts = command.split(None, 1)
+    if not parts:
+        return "empty"
+    name = parts[0].rsplit("/", 1)[-1]
+    return name if _LABEL_VALUE.match(name) else "other"
+
+
+DOCKER_EXEC_SECONDS = Histogram(
+    "amnezia_docker_exec_seconds",
+    "Latency of commands executed in protocol containers",
+    ("command",),
+)
+CONFIG_OPERATION_SECONDS = Histogram(
+    "amnezia_config_operation_seconds",
+    "Latency of protocol config reads, writes and runtime syncs",
+    ("protocol", "operation"),
+)
+SNAPSHOT_REFRESH_SECONDS = Histogram(
+    "amnezia_peer_snapshot_refresh_seconds",
+    "Duration of peer snapshot refreshes",
+    ("protocol",),
+)
+SYNC_TICK_SECONDS = Histogram(
+    "amnezia_sync_tick_seconds",
+    "Duration of central API sync ticks",
+    ("result",),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "amnezia_http_request_seconds",
+    "Latency of API requests by route template",
+    ("method", "route", "status"),
+)
+
+HISTOGRAMS = (
+    DOCKER_EXEC_SECONDS,
+    CONFIG_OPERATION_SECONDS,
+    SNAPSHOT_REFRESH_SECONDS,
+    SYNC_TICK_SECONDS,
+    HTTP_REQUEST_SECONDS,
+)
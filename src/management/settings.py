@@ -12,9 +12,27 @@ class Settings(BaseSettings):
 
     central_api_url: str | None = None
     sync_interval_seconds: int = 60
+    sync_delta_enabled: bool = False
+    sync_compression: str = "gzip"
+    sync_max_concurrency: int = 4
+    sync_backoff_max_seconds: int = 900
+    sync_spool_path: str = "data/sync-spool"
+    sync_spool_max_bytes: int = 64 * 1024 * 1024
+    sync_spool_batch_size: int = 50
+    runtime_reconcile_interval_seconds: int = 300
     protocol_config_path: str = "src/management/protocols.yaml"
     persistent_keepalive_seconds: int = 25
     peer_online_threshold_seconds: int = 180
+    config_cache_validate_interval_seconds: float = 1.0
+    mutation_batch_window_ms: int = 20
+    mutation_batch_max_size: int = 500
+    ip_reuse_cooldown_seconds: int = 0
+    peer_batch_max_size: int = 1000
+    peer_snapshot_interval_seconds: int = 5
+    container_state_resync_seconds: int = 60
+    traffic_db_path: str = "data/traffic.db"
+    metrics_peer_mode: str = "top"
+    metrics_peer_top_n: int = 50
     
     model_config = SettingsConfigDict(
         env_file = ".env",
@@ -1,19 +1,17 @@
 import asyncio
-import docker
 from typing import Optional
 from src.management.logger import configure_logger
+from src.services.management.container_state import get_container_state_cache
+from src.services.management.docker_engine import DockerNotFoundError, get_docker_engine
 
 logger = configure_logger("HostService", "cyan")
 
 
 class HostService:
     def __init__(self):
-        try:
-            self.docker_client = docker.from_env()
-            logger.debug("Docker client initialized successfully")
-        except Exception as exc:
-            logger.error(f"Failed to initialize Docker client: {exc}")
-            raise RuntimeError(f"Docker client initialization failed: {exc}")
+        self.docker_engine = get_docker_engine()
+        self.container_states = get_container_state_cache()
+        logger.debug(f"Docker engine client uses {self.docker_engine.socket_path}")
 
     async def run_command(self, cmd: str, timeout: int = 2000, check: bool = True) -> tuple[str, str]:
         logger.debug(f"Executing host command: {cmd}")
@@ -47,9 +45,16 @@ class HostService:
         return stdout_decoded, stderr_decoded
 
     async def list_running_containers(self) -> set[str]:
+        if self.container_states.ready:
+            return self.container_states.running_containers()
+
         try:
-            containers = await asyncio.to_thread(self.docker_client.containers.list)
-            container_names = {container.name for container in containers}
+            containers = await self.docker_engine.list_containers()
+            container_names = {
+                name.lstrip("/")
+                for container in containers
+                for name in container.get("Names") or []
+            }
             logger.debug(f"Found {len(container_names)} running containers: {container_names}")
             return container_names
         except Exception as e:
@@ -61,15 +66,17 @@ class HostService:
             logger.warning("Empty container name provided")
             return False
 
-        containers = await self.list_running_containers()
-        is_running = container_name in containers
+        if self.container_states.ready:
+            is_running = self.container_states.get_state(container_name) == "running"
+        else:
+            is_running = container_name in await self.list_running_containers()
         logger.debug(f"Container {container_name} running: {is_running}")
         return is_running
 
     async def get_container_port(self, container_name: str, protocol: str = "udp") -> Optional[int]:
         try:
-            container = await asyncio.to_thread(self.docker_client.containers.get, container_name)
-            ports = container.attrs.get("NetworkSettings", {}).get("Ports", {})
+            container = await self.container_states.get_details(container_name)
+            ports = (container.get("NetworkSettings") or {}).get("Ports") or {}
 
             logger.debug(f"Container {container_name} ports: {ports}")
 
@@ -83,7 +90,7 @@ class HostService:
             logger.warning(f"No {protocol} port found for container {container_name}")
             return None
 
-        except docker.errors.NotFound:
+        except DockerNotFoundError:
             logger.warning(f"Container {container_name} not found")
             return None
         except Exception as e:
@@ -92,10 +99,9 @@ class HostService:
 
     async def restart_container(self, container_name: str, timeout: int = 10) -> None:
         try:
-            container = await asyncio.to_thread(self.docker_client.containers.get, container_name)
-            await asyncio.to_thread(container.restart, timeout=timeout)
+            await self.docker_engine.restart_container(container_name, timeout=timeout)
             logger.info(f"Container {container_name} restarted successfully")
-        except docker.errors.NotFound:
+        except DockerNotFoundError:
             raise RuntimeError(f"Container {container_name} not found")
         except Exception as exc:
             raise RuntimeError(f"Failed to restart container {container_name}: {exc}")
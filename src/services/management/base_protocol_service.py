@@ -28,6 +28,26 @@ class BaseProtocolService(ABC):
     ) -> dict:
         pass
 
+    @abstractmethod
+    async def create_peers(self, items: list[dict]) -> list[dict | Exception]:
+        pass
+
+    @abstractmethod
+    async def update_peer(self, public_key: str, app_type: str) -> dict | None:
+        pass
+
     @abstractmethod
     async def delete_peer(self, public_key: str) -> bool:
         pass
+
+    @abstractmethod
+    async def delete_peers(self, public_keys: list[str]) -> dict[str, list[str]]:
+        pass
+
+    @abstractmethod
+    async def reconcile_runtime(self) -> None:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
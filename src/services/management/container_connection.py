@@ -1,14 +1,41 @@
 import asyncio
+import hashlib
+import io
+import os
+import re
+import secrets
+import tarfile
+import tempfile
+import time
 from abc import ABC, abstractmethod
-
-import docker
+from contextlib import suppress
+from pathlib import PurePosixPath
 
 from src.management.logger import configure_logger
+from src.management.metrics import DOCKER_EXEC_SECONDS, command_label
+from src.services.management.docker_engine import (
+    DockerEngineError,
+    DockerNotFoundError,
+    get_docker_engine,
+)
 from src.services.management.protocol_factory import get_protocol_config
+from src.services.management.shell_session import get_shell_session
+from src.services.management.single_flight import get_read_single_flight
 
 
 logger = configure_logger("ContainerConnection", "blue")
 
+BATCH_MARKER_PREFIX = "__AMNEZIA_API_BATCH"
+BATCH_SKIPPED_EXIT_CODE = -1
+EXEC_MODE_EXEC = "exec"
+EXEC_MODE_SESSION = "session"
+FILE_ACCESS_EXEC = "exec"
+FILE_ACCESS_HOST = "host"
+FINGERPRINT_COMMAND_KEY = "__fingerprints__"
+# Linux rejects a single exec argument above 128 KiB (MAX_ARG_STRLEN)
+MAX_INLINE_SCRIPT_BYTES = 120 * 1024
+SCRIPT_UPLOAD_DIR = "/tmp"
+
 
 class DockerError(Exception):
     pass
@@ -21,58 +48,352 @@ class ContainerConnection(ABC):
         self.container_name = self.protocol_config.get("container_name")
         self.interface = self.protocol_config.get("interface")
         self.config_path = self.protocol_config.get("config_path")
+        self.exec_mode = str(self.protocol_config.get("exec_mode", EXEC_MODE_EXEC)).lower()
+        self.file_access = str(
+            self.protocol_config.get("file_access", FILE_ACCESS_EXEC)
+        ).lower()
+        self.host_config_path = self.protocol_config.get("host_config_path") or self.config_path
 
         if not self.container_name:
             raise ValueError(f"Protocol {protocol_name} does not define container_name")
+        if self.exec_mode not in {EXEC_MODE_EXEC, EXEC_MODE_SESSION}:
+            raise ValueError(
+                f"Protocol {protocol_name} has unsupported exec_mode: {self.exec_mode}"
+            )
+        if self.file_access not in {FILE_ACCESS_EXEC, FILE_ACCESS_HOST}:
+            raise ValueError(
+                f"Protocol {protocol_name} has unsupported file_access: {self.file_access}"
+            )
+        if self.file_access == FILE_ACCESS_HOST and not self.host_config_path:
+            raise ValueError(
+                f"Protocol {protocol_name} uses host file access without host_config_path"
+            )
 
-        try:
-            self.docker_client = docker.from_env()
-        except Exception as exc:
-            logger.error(f"Failed to initialize Docker client: {exc}")
-            raise DockerError(f"Docker client initialization failed: {exc}")
+        self.docker_engine = get_docker_engine()
 
     async def run_command(self, cmd: str, check: bool = True) -> tuple[str, str]:
         logger.debug(f"Executing in {self.container_name}: {cmd}")
 
-        try:
-            container = await asyncio.to_thread(
-                self.docker_client.containers.get,
-                self.container_name,
-            )
+        exit_code, stdout, stderr = await self._exec(cmd, command_label(cmd))
+        stdout_decoded = stdout.strip()
+        stderr_decoded = stderr.strip()
 
-            exec_result = await asyncio.to_thread(
-                container.exec_run,
-                cmd=["sh", "-c", cmd],
-                stdout=True,
-                stderr=True,
-                demux=True,
-            )
+        if check and exit_code != 0:
+            logger.error(f"Command failed with code {exit_code}: {stderr_decoded}")
+            raise DockerError(f"Command failed: {stderr_decoded or 'Unknown error'}")
 
-            exit_code, (stdout, stderr) = exec_result
-            stdout_decoded = stdout.decode().strip() if stdout else ""
-            stderr_decoded = stderr.decode().strip() if stderr else ""
+        return stdout_decoded, stderr_decoded
 
+    async def run_commands(self, commands: list[str], check: bool = True) -> list[tuple[str, str]]:
+        if not commands:
+            return []
+
+        logger.debug(f"Executing batch of {len(commands)} command(s) in {self.container_name}")
+
+        marker = f"{BATCH_MARKER_PREFIX}_{secrets.token_hex(8)}__"
+        script = self._build_batch_script(commands, marker, stop_on_error=check)
+        command_type = command_label(commands[0]) if len(commands) == 1 else "batch"
+        _, stdout, stderr = await self._exec(script, command_type)
+
+        exit_codes, stdout_parts, stderr_parts = self._split_batch_output(
+            stdout, stderr, marker, len(commands)
+        )
+
+        results: list[tuple[str, str]] = []
+        for command, exit_code, command_stdout, command_stderr in zip(
+            commands, exit_codes, stdout_parts, stderr_parts
+        ):
+            stdout_decoded = command_stdout.strip()
+            stderr_decoded = command_stderr.strip()
             if check and exit_code != 0:
-                logger.error(f"Command failed with code {exit_code}: {stderr_decoded}")
+                logger.error(
+                    f"Batched command failed with code {exit_code}: {stderr_decoded}"
+                )
                 raise DockerError(f"Command failed: {stderr_decoded or 'Unknown error'}")
+            results.append((stdout_decoded, stderr_decoded))
+
+        return results
+
+    async def run_read_commands(self, commands: list[str]) -> list[tuple[str, str]]:
+        if not commands:
+            return []
+        return await get_read_single_flight().run(
+            tuple(commands),
+            lambda: self.run_commands(commands),
+            scope=self.container_name,
+        )
+
+    def _invalidate_reads(self) -> None:
+        get_read_single_flight().invalidate(self.container_name)
+
+    @property
+    def uses_host_files(self) -> bool:
+        return self.file_access == FILE_ACCESS_HOST
+
+    async def read_file(self, path: str) -> str:
+        if self.uses_host_files:
+            return await asyncio.to_thread(self._read_host_file, path)
+
+        ((stdout, _),) = await self.run_read_commands([self.build_read_command(path)])
+        return stdout
+
+    async def write_file(self, path: str, content: str) -> str:
+        self._invalidate_reads()
+        try:
+            if self.uses_host_files:
+                fingerprint = await asyncio.to_thread(self._write_host_file, path, content)
+            else:
+                await self.run_command(self.build_write_command(path, content))
+                fingerprint = self._content_fingerprint(content)
+        finally:
+            self._invalidate_reads()
+        logger.debug(f"File written: {path}")
+        return fingerprint
+
+    async def read_files_with_commands(
+        self,
+        files: dict[str, str],
+        commands: dict[str, str] | None = None,
+    ) -> dict[str, str]:
+        commands = dict(commands or {})
+        results: dict[str, str] = {}
+
+        if self.uses_host_files:
+            for name, path in files.items():
+                results[name] = await asyncio.to_thread(self._read_host_file, path)
+        else:
+            commands = {
+                **{name: self.build_read_command(path) for name, path in files.items()},
+                **commands,
+            }
+
+        if commands:
+            outputs = await self.run_read_commands(list(commands.values()))
+            for name, (stdout, _) in zip(commands, outputs):
+                results[name] = stdout
+
+        return results
+
+    async def write_file_with_commands(
+        self,
+        path: str,
+        content: str,
+        commands: list[str],
+    ) -> str:
+        self._invalidate_reads()
+        try:
+            if self.uses_host_files:
+                fingerprint = await asyncio.to_thread(self._write_host_file, path, content)
+                await self.run_commands(commands)
+            else:
+                await self.run_commands([self.build_write_command(path, content), *commands])
+                fingerprint = self._content_fingerprint(content)
+        finally:
+            self._invalidate_reads()
+        logger.debug(f"File written: {path}")
+        return fingerprint
+
+    async def fingerprint_files_with_commands(
+        self,
+        paths: list[str],
+        commands: dict[str, str],
+    ) -> tuple[dict[str, str | None], dict[str, str]]:
+        fingerprints: dict[str, str | None] = {}
+        batch = dict(commands)
+
+        if self.uses_host_files:
+            fingerprints = {path: self._host_fingerprint(path) for path in paths}
+        elif paths:
+            batch[FINGERPRINT_COMMAND_KEY] = (
+                f"sha256sum {' '.join(paths)} 2>/dev/null; true"
+            )
+
+        outputs: dict[str, str] = {}
+        if batch:
+            results = await self.run_read_commands(list(batch.values()))
+            outputs = {name: stdout for name, (stdout, _) in zip(batch, results)}
+
+        checksums = outputs.pop(FINGERPRINT_COMMAND_KEY, None)
+        if checksums is not None:
+            parsed = {}
+            for line in checksums.splitlines():
+                checksum, _, path = line.strip().partition("  ")
+                parsed[path] = checksum
+            fingerprints = {path: parsed.get(path) for path in paths}
+
+        return fingerprints, outputs
+
+    def build_read_command(self, path: str) -> str:
+        return f"cat {path}"
+
+    def build_write_command(self, path: str, content: str) -> str:
+        delimiter = f"__AMNEZIA_API_EOF_{secrets.token_hex(8)}__"
+        return f"cat > {path} <<'{delimiter}'\n{self._file_content(content)}{delimiter}"
 
-            return stdout_decoded, stderr_decoded
-        except docker.errors.NotFound:
+    def host_path(self, path: str) -> str:
+        container_path = PurePosixPath(path)
+        config_root = PurePosixPath(self.config_path)
+        try:
+            relative = container_path.relative_to(config_root)
+        except ValueError:
+            raise ValueError(f"Path {path} is outside of config_path {self.config_path}")
+        return os.path.join(self.host_config_path, *relative.parts)
+
+    @staticmethod
+    def _file_content(content: str) -> str:
+        return content if content.endswith("\n") else f"{content}\n"
+
+    def _content_fingerprint(self, content: str) -> str:
+        return hashlib.sha256(self._file_content(content).encode()).hexdigest()
+
+    def _host_fingerprint(self, path: str) -> str | None:
+        try:
+            stat = os.stat(self.host_path(path))
+        except OSError:
+            return None
+        return f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _read_host_file(self, path: str) -> str:
+        try:
+            with open(self.host_path(path), "r") as file_handle:
+                return file_handle.read().strip()
+        except OSError as exc:
+            logger.error(f"Failed to read {path} from host: {exc}")
+            raise DockerError(f"Failed to read {path} from host: {exc}")
+
+    def _write_host_file(self, path: str, content: str) -> str | None:
+        target = self.host_path(path)
+        directory, file_name = os.path.split(target)
+        try:
+            current = os.stat(target)
+        except FileNotFoundError:
+            current = None
+
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{file_name}.")
+        except OSError as exc:
+            logger.error(f"Failed to write {path} on host: {exc}")
+            raise DockerError(f"Failed to write {path} on host: {exc}")
+
+        try:
+            with os.fdopen(fd, "w") as file_handle:
+                file_handle.write(self._file_content(content))
+                file_handle.flush()
+                os.fsync(file_handle.fileno())
+            if current is not None:
+                os.chmod(temp_path, current.st_mode & 0o7777)
+                if os.geteuid() == 0:
+                    os.chown(temp_path, current.st_uid, current.st_gid)
+            os.replace(temp_path, target)
+        except OSError as exc:
+            with suppress(OSError):
+                os.unlink(temp_path)
+            logger.error(f"Failed to write {path} on host: {exc}")
+            raise DockerError(f"Failed to write {path} on host: {exc}")
+
+        return self._host_fingerprint(path)
+
+    async def _exec(self, cmd: str, command_type: str) -> tuple[int, str, str]:
+        with DOCKER_EXEC_SECONDS.time(command=command_type):
+            if self.exec_mode == EXEC_MODE_SESSION:
+                return await self._exec_in_session(cmd)
+            return await self._exec_in_container(cmd)
+
+    async def _exec_in_container(self, cmd: str) -> tuple[int, str, str]:
+        try:
+            if len(cmd.encode()) > MAX_INLINE_SCRIPT_BYTES:
+                cmd = await self._upload_script(cmd)
+
+            return await self.docker_engine.exec(self.container_name, ["sh", "-c", cmd])
+        except DockerNotFoundError:
             logger.error(f"Container {self.container_name} not found")
             raise DockerError(f"Container {self.container_name} not found")
-        except Exception as exc:
+        except (DockerEngineError, OSError, asyncio.TimeoutError) as exc:
             logger.error(f"Docker API error: {exc}")
             raise DockerError(f"Docker API error: {exc}")
 
-    async def read_file(self, path: str) -> str:
-        stdout, _ = await self.run_command(f"cat {path}")
-        return stdout
+    async def _upload_script(self, script: str) -> str:
+        name = f"amnezia-api-{secrets.token_hex(8)}.sh"
+        data = script.encode()
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mode = 0o600
+        info.mtime = int(time.time())
 
-    async def write_file(self, path: str, content: str) -> None:
-        escaped_content = content.replace("'", "'\\''")
-        cmd = f"cat > {path} <<'EOF'\n{escaped_content}\nEOF"
-        await self.run_command(cmd)
-        logger.debug(f"File written: {path}")
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode="w") as tar:
+            tar.addfile(info, io.BytesIO(data))
+
+        await self.docker_engine.put_archive(
+            self.container_name,
+            SCRIPT_UPLOAD_DIR,
+            archive.getvalue(),
+        )
+
+        path = f"{SCRIPT_UPLOAD_DIR}/{name}"
+        return f"sh {path}; status=$?; rm -f {path}; exit $status"
+
+    async def _exec_in_session(self, cmd: str) -> tuple[int, str, str]:
+        try:
+            return await get_shell_session(self.container_name).execute(cmd)
+        except DockerNotFoundError:
+            logger.error(f"Container {self.container_name} not found")
+            raise DockerError(f"Container {self.container_name} not found")
+        except Exception as exc:
+            logger.error(f"Shell session error: {exc}")
+            raise DockerError(f"Shell session error: {exc}")
+
+    @staticmethod
+    def _build_batch_script(commands: list[str], marker: str, stop_on_error: bool) -> str:
+        lines = ["__batch_failed=0"]
+        for command in commands:
+            lines.extend(
+                [
+                    'if [ "$__batch_failed" -eq 0 ]; then',
+                    "(",
+                    command,
+                    ")",
+                    "__batch_rc=$?",
+                    "else",
+                    f"__batch_rc={BATCH_SKIPPED_EXIT_CODE}",
+                    "fi",
+                    f"printf '\\n{marker} %s\\n' \"$__batch_rc\"",
+                    f"printf '\\n{marker}\\n' >&2",
+                ]
+            )
+            if stop_on_error:
+                lines.append('[ "$__batch_rc" -eq 0 ] || __batch_failed=1')
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _split_batch_output(
+        stdout: str,
+        stderr: str,
+        marker: str,
+        expected: int,
+    ) -> tuple[list[int], list[str], list[str]]:
+        stdout_chunks = re.split(rf"\n{re.escape(marker)} (-?\d+)\n", stdout)
+        stderr_chunks = stderr.split(f"\n{marker}\n")
+
+        exit_codes = [int(code) for code in stdout_chunks[1::2]]
+        stdout_parts = stdout_chunks[0::2][: len(exit_codes)]
+        stderr_parts = stderr_chunks[: len(exit_codes)]
+
+        if len(exit_codes) != expected:
+            raise DockerError(
+                f"Batch output is incomplete: expected {expected} result(s), "
+                f"got {len(exit_codes)}: {stderr.strip() or 'Unknown error'}"
+            )
+
+        return exit_codes, stdout_parts, stderr_parts
+
+    async def generate_peer_keys(self, count: int) -> list[tuple[str, str, str]]:
+        keys = []
+        for _ in range(count):
+            private_key = await self.generate_private_key()
+            public_key = await self.generate_public_key(private_key)
+            keys.append((private_key, public_key, await self.generate_preshared_key()))
+        return keys
 
     @abstractmethod
     async def get_peers_dump(self) -> str:
@@ -87,7 +408,7 @@ class ContainerConnection(ABC):
         pass
 
     @abstractmethod
-    async def write_protocol_config(self, content: str) -> None:
+    async def write_protocol_config(self, content: str) -> str:
         pass
 
     @abstractmethod
@@ -98,6 +419,10 @@ class ContainerConnection(ABC):
     async def generate_public_key(self, private_key: str) -> str:
         pass
 
+    @abstractmethod
+    async def generate_preshared_key(self) -> str:
+        pass
+
     @abstractmethod
     async def read_server_public_key(self) -> str:
         pass
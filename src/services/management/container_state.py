@@ -0,0 +1,154 @@
+import asyncio
+import json
+import time
+from contextlib import aclosing, suppress
+
+from src.management.logger import configure_logger
+from src.management.settings import get_settings
+from src.services.management.docker_engine import get_docker_engine
+from src.services.management.shell_session import reset_shell_session
+
+
+logger = configure_logger("ContainerState", "blue")
+
+EVENT_STATES = {
+    "create": "created",
+    "start": "running",
+    "restart": "running",
+    "unpause": "running",
+    "pause": "paused",
+    "stop": "exited",
+    "die": "exited",
+}
+SESSION_RESET_ACTIONS = {"start", "restart", "stop", "die", "destroy"}
+RECONNECT_DELAY_SECONDS = 5
+
+
+class ContainerStateCache:
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self.docker_engine = get_docker_engine()
+        self._states: dict[str, str] = {}
+        self._details: dict[str, dict] = {}
+        self._ready = False
+        self._stop_event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def get_state(self, container_name: str) -> str | None:
+        return self._states.get(container_name)
+
+    def running_containers(self) -> set[str]:
+        return {name for name, state in self._states.items() if state == "running"}
+
+    async def get_details(self, container_name: str) -> dict:
+        details = self._details.get(container_name)
+        if details is None:
+            details = await self.docker_engine.inspect_container(container_name)
+            if self._ready:
+                self._details[container_name] = details
+        return details
+
+    async def resync(self) -> None:
+        containers = await self.docker_engine.list_containers(all_containers=True)
+        states = {}
+        for container in containers:
+            for name in container.get("Names") or []:
+                states[name.lstrip("/")] = container.get("State") or "unknown"
+        self._states = states
+        self._details.clear()
+        logger.debug(f"Container states resynced: {len(states)} container(s)")
+
+    async def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+        self._ready = False
+
+    async def _run(self) -> None:
+        interval = max(1, self.settings.container_state_resync_seconds)
+        logger.info(f"Container state watcher started, full resync every {interval}s")
+
+        while not self._stop_event.is_set():
+            since = int(time.time())
+            try:
+                await self.resync()
+                self._ready = True
+                await asyncio.wait_for(self._watch(since), timeout=interval)
+            except asyncio.TimeoutError:
+                continue
+            except Exception as exc:
+                self._ready = False
+                logger.warning(f"Container event stream failed: {exc}")
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._stop_event.wait(),
+                        timeout=RECONNECT_DELAY_SECONDS,
+                    )
+
+        logger.info("Container state watcher stopped")
+
+    async def _watch(self, since: int) -> None:
+        buffer = b""
+        events = self.docker_engine.stream(
+            "GET",
+            "/events",
+            params={
+                "since": str(since),
+                "filters": json.dumps({"type": ["container"]}),
+            },
+        )
+        async with aclosing(events):
+            async for chunk in events:
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        await self._apply_event(json.loads(line))
+
+        raise ConnectionError("Docker event stream closed")
+
+    async def _apply_event(self, event: dict) -> None:
+        action = (event.get("Action") or event.get("status") or "").split(":", 1)[0]
+        attributes = (event.get("Actor") or {}).get("Attributes") or {}
+        name = attributes.get("name")
+        if not name:
+            return
+
+        if action == "destroy":
+            self._states.pop(name, None)
+        elif action == "rename":
+            old_name = attributes.get("oldName", "").lstrip("/")
+            self._states[name] = self._states.pop(old_name, "unknown")
+            self._details.pop(old_name, None)
+        elif action in EVENT_STATES:
+            self._states[name] = EVENT_STATES[action]
+        else:
+            return
+
+        self._details.pop(name, None)
+        logger.debug(f"Container {name}: {action} -> {self._states.get(name, 'removed')}")
+        if action in SESSION_RESET_ACTIONS:
+            await reset_shell_session(name)
+
+
+_container_state_cache: ContainerStateCache | None = None
+
+
+def get_container_state_cache() -> ContainerStateCache:
+    global _container_state_cache
+    if _container_state_cache is None:
+        _container_state_cache = ContainerStateCache()
+    return _container_state_cache
@@ -0,0 +1,403 @@
+import asyncio
+import json
+import os
+import struct
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from urllib.parse import quote, urlencode
+
+from src.management.logger import configure_logger
+
+
+logger = configure_logger("DockerEngine", "blue")
+
+DEFAULT_DOCKER_SOCKET = "/var/run/docker.sock"
+FRAME_HEADER_SIZE = 8
+STDOUT_STREAM = 1
+STDERR_STREAM = 2
+READ_CHUNK_SIZE = 64 * 1024
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+class DockerEngineError(Exception):
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class DockerNotFoundError(DockerEngineError):
+    pass
+
+
+class DockerConnectionError(DockerEngineError):
+    pass
+
+
+class _Response:
+    def __init__(self, status: int, headers: dict[str, str], reader: asyncio.StreamReader):
+        self.status = status
+        self.headers = headers
+        self._reader = reader
+        self.reusable = headers.get("connection", "").lower() != "close"
+
+    async def iter_body(self) -> AsyncIterator[bytes]:
+        reader = self._reader
+        if self.status in (101, 204, 304):
+            if self.status == 101:
+                self.reusable = False
+                while data := await reader.read(READ_CHUNK_SIZE):
+                    yield data
+            return
+
+        if self.headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await reader.readline()
+                if not size_line:
+                    raise DockerEngineError("Docker API response ended inside a chunk")
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+                yield await reader.readexactly(size)
+                await reader.readexactly(2)
+
+        if "content-length" in self.headers:
+            remaining = int(self.headers["content-length"])
+            while remaining > 0:
+                data = await reader.read(min(READ_CHUNK_SIZE, remaining))
+                if not data:
+                    raise DockerEngineError("Docker API response ended early")
+                remaining -= len(data)
+                yield data
+            return
+
+        self.reusable = False
+        while data := await reader.read(READ_CHUNK_SIZE):
+            yield data
+
+    async def read(self) -> bytes:
+        return b"".join([chunk async for chunk in self.iter_body()])
+
+
+class DockerEngineClient:
+    def __init__(
+        self,
+        socket_path: str | None = None,
+        max_connections: int = 16,
+        timeout: float = 60.0,
+    ):
+        self.socket_path = socket_path or _socket_path_from_env()
+        self.timeout = timeout
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(max_connections)
+        self._max_idle = max_connections
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        body: bytes | None = None,
+        json_body: dict | None = None,
+        content_type: str | None = None,
+    ) -> tuple[int, bytes]:
+        args = (method, path, params, body, json_body, content_type)
+        async with self._slots:
+            reader, writer, pooled = await self._acquire()
+            try:
+                return await self._roundtrip(reader, writer, *args)
+            except DockerConnectionError as exc:
+                if not pooled or method not in IDEMPOTENT_METHODS:
+                    raise
+                logger.debug(f"Pooled Docker connection went stale ({exc}), retrying {method} {path}")
+            reader, writer = await self._connect()
+            return await self._roundtrip(reader, writer, *args)
+
+    async def request_json(self, method: str, path: str, **kwargs) -> dict | list | None:
+        status, data = await self.request(method, path, **kwargs)
+        self._raise_for_status(status, data, path)
+        return json.loads(data) if data else None
+
+    async def stream(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        json_body: dict | None = None,
+    ) -> AsyncIterator[bytes]:
+        reader, writer = await self._connect()
+        try:
+            response = await asyncio.wait_for(
+                self._send(reader, writer, method, path, params, None, json_body, None),
+                timeout=self.timeout,
+            )
+            if response.status >= 400:
+                self._raise_for_status(response.status, await response.read(), path)
+            async for chunk in response.iter_body():
+                yield chunk
+        finally:
+            writer.close()
+
+    async def exec(
+        self,
+        container_name: str,
+        cmd: list[str],
+    ) -> tuple[int, str, str]:
+        created = await self.request_json(
+            "POST",
+            f"/containers/{quote(container_name, safe='')}/exec",
+            json_body={"AttachStdout": True, "AttachStderr": True, "Cmd": cmd},
+        )
+        exec_id = created["Id"]
+
+        stdout_parts: list[bytes] = []
+        stderr_parts: list[bytes] = []
+
+        async def collect() -> None:
+            async for stream_type, payload in self.exec_stream(exec_id):
+                if stream_type == STDERR_STREAM:
+                    stderr_parts.append(payload)
+                else:
+                    stdout_parts.append(payload)
+
+        await asyncio.wait_for(collect(), timeout=self.timeout)
+
+        inspected = await self.request_json("GET", f"/exec/{exec_id}/json")
+        exit_code = inspected.get("ExitCode")
+        return (
+            exit_code if exit_code is not None else -1,
+            b"".join(stdout_parts).decode(errors="replace"),
+            b"".join(stderr_parts).decode(errors="replace"),
+        )
+
+    async def exec_session(
+        self,
+        container_name: str,
+        cmd: list[str],
+    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        created = await self.request_json(
+            "POST",
+            f"/containers/{quote(container_name, safe='')}/exec",
+            json_body={
+                "AttachStdin": True,
+                "AttachStdout": True,
+                "AttachStderr": True,
+                "Tty": False,
+                "Cmd": cmd,
+            },
+        )
+        path = f"/exec/{created['Id']}/start"
+
+        reader, writer = await self._connect()
+        try:
+            response = await asyncio.wait_for(
+                self._send(
+                    reader,
+                    writer,
+                    "POST",
+                    path,
+                    None,
+                    None,
+                    {"Detach": False, "Tty": False},
+                    None,
+                    upgrade=True,
+                ),
+                timeout=self.timeout,
+            )
+            if response.status >= 400:
+                self._raise_for_status(response.status, await response.read(), path)
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    async def exec_stream(self, exec_id: str) -> AsyncIterator[tuple[int, bytes]]:
+        buffer = bytearray()
+        async for chunk in self.stream(
+            "POST",
+            f"/exec/{exec_id}/start",
+            json_body={"Detach": False, "Tty": False},
+        ):
+            buffer += chunk
+            while len(buffer) >= FRAME_HEADER_SIZE:
+                stream_type, size = struct.unpack(">BxxxL", buffer[:FRAME_HEADER_SIZE])
+                if len(buffer) < FRAME_HEADER_SIZE + size:
+                    break
+                yield stream_type, bytes(buffer[FRAME_HEADER_SIZE:FRAME_HEADER_SIZE + size])
+                del buffer[:FRAME_HEADER_SIZE + size]
+
+    async def put_archive(self, container_name: str, path: str, data: bytes) -> None:
+        status, body = await self.request(
+            "PUT",
+            f"/containers/{quote(container_name, safe='')}/archive",
+            params={"path": path},
+            body=data,
+            content_type="application/x-tar",
+        )
+        self._raise_for_status(status, body, path)
+
+    async def list_containers(self, all_containers: bool = False) -> list[dict]:
+        params = {"all": "1"} if all_containers else None
+        return await self.request_json("GET", "/containers/json", params=params) or []
+
+    async def inspect_container(self, container_name: str) -> dict:
+        return await self.request_json(
+            "GET",
+            f"/containers/{quote(container_name, safe='')}/json",
+        )
+
+    async def restart_container(self, container_name: str, timeout: int = 10) -> None:
+        status, body = await self.request(
+            "POST",
+            f"/containers/{quote(container_name, safe='')}/restart",
+            params={"t": str(timeout)},
+        )
+        self._raise_for_status(status, body, container_name)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+            with suppress(Exception):
+                await writer.wait_closed()
+
+    async def _roundtrip(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        method: str,
+        path: str,
+        params: dict | None,
+        body: bytes | None,
+        json_body: dict | None,
+        content_type: str | None,
+    ) -> tuple[int, bytes]:
+        try:
+            response = await asyncio.wait_for(
+                self._send(reader, writer, method, path, params, body, json_body, content_type),
+                timeout=self.timeout,
+            )
+            data = await asyncio.wait_for(response.read(), timeout=self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+        self._release(reader, writer, response.reusable)
+        return response.status, data
+
+    async def _acquire(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await self._connect()
+        return reader, writer, False
+
+    def _release(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        reusable: bool,
+    ) -> None:
+        if reusable and len(self._idle) < self._max_idle and not reader.at_eof():
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        try:
+            return await asyncio.wait_for(
+                asyncio.open_unix_connection(self.socket_path, limit=READ_CHUNK_SIZE * 4),
+                timeout=self.timeout,
+            )
+        except (OSError, asyncio.TimeoutError) as exc:
+            raise DockerEngineError(f"Cannot connect to Docker socket {self.socket_path}: {exc}")
+
+    async def _send(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        method: str,
+        path: str,
+        params: dict | None,
+        body: bytes | None,
+        json_body: dict | None,
+        content_type: str | None,
+        upgrade: bool = False,
+    ) -> _Response:
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            content_type = "application/json"
+
+        target = f"{path}?{urlencode(params)}" if params else path
+        lines = [f"{method} {target} HTTP/1.1", "Host: docker", "User-Agent: amnezia-api"]
+        if upgrade:
+            lines.extend(["Connection: Upgrade", "Upgrade: tcp"])
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+            if content_type:
+                lines.append(f"Content-Type: {content_type}")
+        elif method in ("POST", "PUT"):
+            lines.append("Content-Length: 0")
+
+        try:
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+            if body:
+                writer.write(body)
+            await writer.drain()
+            status_line = await reader.readline()
+        except ConnectionError as exc:
+            raise DockerConnectionError(f"Docker API connection failed: {exc}")
+        if not status_line:
+            raise DockerConnectionError("Docker API closed the connection")
+        try:
+            status = int(status_line.split(b" ", 2)[1])
+        except (IndexError, ValueError):
+            raise DockerEngineError(f"Malformed Docker API status line: {status_line!r}")
+
+        headers: dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        return _Response(status, headers, reader)
+
+    @staticmethod
+    def _raise_for_status(status: int, body: bytes, subject: str) -> None:
+        if status < 400:
+            return
+        try:
+            message = json.loads(body).get("message") or body.decode(errors="replace")
+        except (ValueError, AttributeError):
+            message = body.decode(errors="replace")
+        if status == 404:
+            raise DockerNotFoundError(message or f"{subject} not found", status)
+        raise DockerEngineError(f"Docker API error {status}: {message}", status)
+
+
+def _socket_path_from_env() -> str:
+    docker_host = os.environ.get("DOCKER_HOST", "")
+    if docker_host.startswith("unix://"):
+        return docker_host[len("unix://"):]
+    return DEFAULT_DOCKER_SOCKET
+
+
+_docker_engine: DockerEngineClient | None = None
+
+
+def get_docker_engine() -> DockerEngineClient:
+    global _docker_engine
+    if _docker_engine is None:
+        _docker_engine = DockerEngineClient()
+    return _docker_engine
+
+
+async def close_docker_engine() -> None:
+    global _docker_engine
+    engine, _docker_engine = _docker_engine, None
+    if engine is not None:
+        await engine.close()
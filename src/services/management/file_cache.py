@@ -0,0 +1,112 @@
+import hashlib
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from src.management.logger import configure_logger
+
+if TYPE_CHECKING:
+    from src.services.management.container_connection import ContainerConnection
+
+
+logger = configure_logger("FileCache", "blue")
+
+
+@dataclass
+class CachedFile:
+    content: str
+    digest: str
+    fingerprint: str | None
+    validated_at: float
+    derived: dict[str, Any] = field(default_factory=dict)
+
+
+class FileCache:
+    def __init__(self, validate_interval: float):
+        self.validate_interval = validate_interval
+        self._entries: dict[str, CachedFile] = {}
+
+    async def read(
+        self,
+        connection: "ContainerConnection",
+        files: dict[str, str],
+        commands: dict[str, str] | None = None,
+    ) -> tuple[dict[str, CachedFile], dict[str, str]]:
+        now = time.monotonic()
+        stale = [
+            path
+            for path in dict.fromkeys(files.values())
+            if not self._is_fresh(path, now)
+        ]
+
+        fingerprints, outputs = await connection.fingerprint_files_with_commands(
+            stale,
+            commands or {},
+        )
+
+        changed = []
+        for path in stale:
+            entry = self._entries.get(path)
+            fingerprint = fingerprints.get(path)
+            if entry is None or fingerprint is None or fingerprint != entry.fingerprint:
+                changed.append(path)
+            else:
+                entry.validated_at = now
+
+        if changed:
+            logger.debug(f"Reloading {len(changed)} file(s): {changed}")
+            contents = await connection.read_files_with_commands(
+                {path: path for path in changed}
+            )
+            for path in changed:
+                self._update(path, contents[path], fingerprints.get(path), now)
+
+        return {name: self._entries[path] for name, path in files.items()}, outputs
+
+    def store(
+        self,
+        path: str,
+        content: str,
+        fingerprint: str | None,
+        derived: dict[str, Any] | None = None,
+    ) -> CachedFile:
+        entry = self._update(path, content, fingerprint, time.monotonic())
+        if derived is not None:
+            entry.derived = dict(derived)
+        return entry
+
+    def invalidate(self, path: str | None = None) -> None:
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(path, None)
+
+    def _is_fresh(self, path: str, now: float) -> bool:
+        entry = self._entries.get(path)
+        return entry is not None and now - entry.validated_at < self.validate_interval
+
+    def _update(
+        self,
+        path: str,
+        content: str,
+        fingerprint: str | None,
+        now: float,
+    ) -> CachedFile:
+        content = content.strip()
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        entry = self._entries.get(path)
+
+        if entry is not None and entry.digest == digest:
+            entry.fingerprint = fingerprint
+            entry.validated_at = now
+            return entry
+
+        entry = CachedFile(
+            content=content,
+            digest=digest,
+            fingerprint=fingerprint,
+            validated_at=now,
+        )
+        self._entries[path] = entry
+        return entry
+
@@ -0,0 +1,161 @@
+import ipaddress
+import time
+from collections import deque
+from collections.abc import Iterable
+
+from src.management.logger import configure_logger
+
+
+logger = configure_logger("IPAllocator", "blue")
+
+SLOT_FREE = 0
+SLOT_USED = 1
+SLOT_RESERVED = 2
+SLOT_COOLING = 3
+
+_FREE_BYTE = bytes([SLOT_FREE])
+
+
+def parse_reserved_range(value: str) -> tuple[ipaddress.IPv4Address, ipaddress.IPv4Address]:
+    value = value.strip()
+    if "-" in value:
+        start, end = (part.strip() for part in value.split("-", 1))
+        first, last = ipaddress.IPv4Address(start), ipaddress.IPv4Address(end)
+    elif "/" in value:
+        network = ipaddress.IPv4Network(value, strict=False)
+        first, last = network.network_address, network.broadcast_address
+    else:
+        first = last = ipaddress.IPv4Address(value)
+
+    if last < first:
+        raise ValueError(f"Invalid reserved range: {value}")
+    return first, last
+
+
+class IPAllocator:
+    def __init__(self, reserved: Iterable[str] | None = None, cooldown_seconds: float = 0):
+        self.reserved_ranges = [parse_reserved_range(item) for item in reserved or []]
+        self.cooldown_seconds = cooldown_seconds
+        self.source: str | None = None
+        self._network: ipaddress.IPv4Network | None = None
+        self._slots = bytearray()
+        self._free_count = 0
+        self._hint = 0
+        self._cooling: deque[tuple[float, int]] = deque()
+
+    @property
+    def network(self) -> ipaddress.IPv4Network | None:
+        return self._network
+
+    @property
+    def free_count(self) -> int:
+        self._expire(time.monotonic())
+        return self._free_count
+
+    def rebuild(
+        self,
+        network: ipaddress.IPv4Network,
+        used: Iterable[ipaddress.IPv4Address],
+        source: str | None = None,
+    ) -> None:
+        cooling = self._cooling_addresses() if network == self._network else []
+
+        self._network = network
+        self._slots = bytearray(network.num_addresses)
+        self._cooling = deque()
+        self._hint = 0
+
+        if network.prefixlen < 31:
+            self._slots[0] = SLOT_RESERVED
+            self._slots[-1] = SLOT_RESERVED
+            if network.num_addresses > 2:
+                self._slots[1] = SLOT_RESERVED
+
+        base = int(network.network_address)
+        for first, last in self.reserved_ranges:
+            start = max(int(first), base) - base
+            end = min(int(last), base + network.num_addresses - 1) - base
+            if start <= end:
+                self._slots[start:end + 1] = bytes([SLOT_RESERVED]) * (end - start + 1)
+
+        for address in used:
+            index = self._index(address)
+            if index is not None and self._slots[index] != SLOT_RESERVED:
+                self._slots[index] = SLOT_USED
+
+        for released_at, address in cooling:
+            index = self._index(address)
+            if index is not None and self._slots[index] == SLOT_FREE:
+                self._slots[index] = SLOT_COOLING
+                self._cooling.append((released_at, index))
+
+        self._free_count = self._slots.count(SLOT_FREE)
+        self.source = source
+        logger.debug(
+            f"IP allocator rebuilt for {network}: {self._free_count} free, "
+            f"{len(self._cooling)} cooling"
+        )
+
+    def allocate(self) -> ipaddress.IPv4Address:
+        if self._network is None:
+            raise ValueError("IP allocator is not initialized")
+
+        self._expire(time.monotonic())
+        index = self._slots.find(_FREE_BYTE, self._hint)
+        if index < 0:
+            raise ValueError("No available IP addresses in subnet")
+
+        self._slots[index] = SLOT_USED
+        self._free_count -= 1
+        self._hint = index + 1
+        return self._network.network_address + index
+
+    def claim(self, address: ipaddress.IPv4Address) -> None:
+        index = self._index(address)
+        if index is None:
+            return
+        if self._slots[index] == SLOT_USED:
+            raise ValueError(f"IP address {address} is already in use")
+        if self._slots[index] == SLOT_RESERVED:
+            raise ValueError(f"IP address {address} is reserved")
+        if self._slots[index] == SLOT_FREE:
+            self._free_count -= 1
+        self._slots[index] = SLOT_USED
+
+    def release(self, address: ipaddress.IPv4Address, cool_down: bool = True) -> None:
+        index = self._index(address)
+        if index is None or self._slots[index] != SLOT_USED:
+            return
+
+        if cool_down and self.cooldown_seconds > 0:
+            self._slots[index] = SLOT_COOLING
+            self._cooling.append((time.monotonic(), index))
+        else:
+            self._mark_free(index)
+
+    def _expire(self, now: float) -> None:
+        while self._cooling and now - self._cooling[0][0] >= self.cooldown_seconds:
+            _, index = self._cooling.popleft()
+            if self._slots[index] == SLOT_COOLING:
+                self._mark_free(index)
+
+    def _mark_free(self, index: int) -> None:
+        self._slots[index] = SLOT_FREE
+        self._free_count += 1
+        if index < self._hint:
+            self._hint = index
+
+    def _cooling_addresses(self) -> list[tuple[float, ipaddress.IPv4Address]]:
+        if self._network is None:
+            return []
+        return [
+            (released_at, self._network.network_address + index)
+            for released_at, index in self._cooling
+            if self._slots[index] == SLOT_COOLING
+        ]
+
+    def _index(self, address: ipaddress.IPv4Address) -> int | None:
+        if self._network is None or address not in self._network:
+            return None
+        return int(address) - int(self._network.network_address)
+
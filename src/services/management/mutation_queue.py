@@ -0,0 +1,130 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+
+from src.management.logger import configure_logger
+
+
+logger = configure_logger("MutationQueue", "blue")
+
+MUTATION_ADD = "add"
+MUTATION_REMOVE = "remove"
+
+
+@dataclass
+class PeerMutation:
+    kind: str
+    public_key: str
+    preshared_key: str | None = None
+    allowed_ip: str | None = None
+    app_type: str | None = None
+    replaces: str | None = None
+
+
+BatchHandler = Callable[[list[PeerMutation]], Awaitable[list[Any]]]
+PendingMutation = tuple[PeerMutation, asyncio.Future]
+
+
+class MutationQueue:
+    def __init__(
+        self,
+        name: str,
+        handler: BatchHandler,
+        window_seconds: float,
+        max_batch_size: int,
+    ):
+        self.name = name
+        self.handler = handler
+        self.window_seconds = window_seconds
+        self.max_batch_size = max(1, max_batch_size)
+        self._queue: asyncio.Queue[list[PendingMutation]] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+        self._lock = asyncio.Lock()
+
+    async def submit(self, mutation: PeerMutation) -> Any:
+        (result,) = await self.submit_many([mutation])
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def submit_many(self, mutations: list[PeerMutation]) -> list[Any]:
+        if self._closed:
+            raise RuntimeError(f"Mutation queue {self.name} is closed")
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        group = [(mutation, loop.create_future()) for mutation in mutations]
+        self._queue.put_nowait(group)
+        return await asyncio.gather(*(future for _, future in group), return_exceptions=True)
+
+    async def run_exclusive(self, job: Callable[[], Awaitable[Any]]) -> Any:
+        async with self._lock:
+            return await job()
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._task is not None and not self._task.done():
+            await self._queue.join()
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        while not self._queue.empty():
+            for _, future in self._queue.get_nowait():
+                if not future.done():
+                    future.set_exception(RuntimeError(f"Mutation queue {self.name} is closed"))
+
+    def _ensure_worker(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = list(await self._queue.get())
+            groups = 1
+            deadline = loop.time() + self.window_seconds
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.extend(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+                    groups += 1
+                except asyncio.TimeoutError:
+                    break
+
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.extend(self._queue.get_nowait())
+                groups += 1
+
+            try:
+                await self._process(batch)
+            finally:
+                for _ in range(groups):
+                    self._queue.task_done()
+
+    async def _process(self, batch: list[PendingMutation]) -> None:
+        mutations = [mutation for mutation, _ in batch]
+        logger.debug(f"Applying {len(mutations)} mutation(s) for {self.name}")
+
+        try:
+            async with self._lock:
+                results = await self.handler(mutations)
+        except Exception as exc:
+            logger.error(f"Mutation batch for {self.name} failed: {exc}")
+            results = [exc] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
@@ -0,0 +1,218 @@
+import base64
+import ipaddress
+import json
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+
+
+SORT_PUBLIC_KEY = "public_key"
+SORT_HANDSHAKE = "handshake"
+SORT_TRAFFIC = "traffic"
+SORT_IP = "ip"
+
+
+@dataclass
+class PeerQuery:
+    sort: str = SORT_PUBLIC_KEY
+    descending: bool = False
+    limit: int | None = None
+    cursor: str | None = None
+    app_type: str | None = None
+    online_only: bool = False
+    ip_network: ipaddress.IPv4Network | None = None
+    handshake_after: float | None = None
+    handshake_before: float | None = None
+
+
+def encode_cursor(sort: str, descending: bool, key: float | str, public_key: str) -> str:
+    raw = json.dumps([sort, descending, key, public_key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, descending: bool) -> tuple[float | str, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_descending, key, public_key = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort or cursor_descending != descending:
+        raise ValueError("Cursor does not match the requested sort order")
+    if not isinstance(public_key, str):
+        raise ValueError("Invalid cursor")
+    return key, public_key
+
+
+class PeerIndex:
+    def __init__(self, peers: tuple[dict, ...]):
+        self.peers = peers
+        self._values: dict[str, list[float | str]] = {
+            SORT_PUBLIC_KEY: [peer["public_key"] for peer in peers],
+            SORT_HANDSHAKE: [_handshake_timestamp(peer) for peer in peers],
+            SORT_TRAFFIC: [
+                int(peer.get("rx_bytes", 0)) + int(peer.get("tx_bytes", 0)) for peer in peers
+            ],
+            SORT_IP: [_ip_value(peer) for peer in peers],
+        }
+        self._orders: dict[str, list[int]] = {}
+        self._sorted: dict[str, list[float | str]] = {}
+        for field, values in self._values.items():
+            order = sorted(range(len(peers)), key=lambda i: (values[i], peers[i]["public_key"]))
+            self._orders[field] = order
+            self._sorted[field] = [values[i] for i in order]
+
+    def find(self, public_key: str) -> dict | None:
+        keys = self._sorted[SORT_PUBLIC_KEY]
+        position = bisect_left(keys, public_key)
+        if position < len(keys) and keys[position] == public_key:
+            return self.peers[self._orders[SORT_PUBLIC_KEY][position]]
+        return None
+
+    def query(self, query: PeerQuery) -> tuple[list[dict], str | None]:
+        page: list[dict] = []
+        last: int | None = None
+        has_more = False
+        for index, peer in self._scan(query):
+            if query.limit is not None and len(page) >= query.limit:
+                has_more = True
+                break
+            page.append(peer)
+            last = index
+
+        next_cursor = None
+        if has_more and last is not None:
+            next_cursor = encode_cursor(
+                query.sort,
+                query.descending,
+                self._values[query.sort][last],
+                self.peers[last]["public_key"],
+            )
+        return page, next_cursor
+
+    def iter_peers(self, query: PeerQuery) -> Iterator[dict]:
+        return (peer for _, peer in self._scan(query))
+
+    def _scan(self, query: PeerQuery) -> Iterator[tuple[int, dict]]:
+        field = query.sort
+        if field not in self._orders:
+            raise ValueError(f"Invalid sort field: {field}")
+
+        predicates = self._predicates(query)
+        ranges = self._ranges(query)
+        bounds = {name: self._positions(name, low, high) for name, (low, high) in ranges.items()}
+        if any(start >= end for start, end in bounds.values()):
+            return iter(())
+
+        narrowest = min(bounds, key=lambda name: bounds[name][1] - bounds[name][0], default=None)
+        values = self._values[field]
+        if narrowest is None or narrowest == field:
+            positions = self._orders[field]
+            start, end = bounds.get(field, (0, len(positions)))
+        else:
+            start, end = bounds[narrowest]
+            positions = sorted(
+                self._orders[narrowest][start:end],
+                key=lambda i: (values[i], self.peers[i]["public_key"]),
+            )
+            start, end = 0, len(positions)
+        for name, (low, high) in ranges.items():
+            if name != narrowest:
+                predicates.append(_range_predicate(self._values[name], low, high))
+
+        if query.cursor:
+            after = decode_cursor(query.cursor, field, query.descending)
+            keys = _KeyView(positions, values, self.peers)
+            try:
+                if query.descending:
+                    end = bisect_left(keys, after, start, end)
+                else:
+                    start = bisect_right(keys, after, start, end)
+            except TypeError:
+                raise ValueError("Invalid cursor")
+
+        offsets = range(end - 1, start - 1, -1) if query.descending else range(start, end)
+        return self._filter(positions, offsets, predicates)
+
+    def _filter(
+        self,
+        positions: list[int],
+        offsets: range,
+        predicates: list[Callable[[int, dict], bool]],
+    ) -> Iterator[tuple[int, dict]]:
+        for offset in offsets:
+            index = positions[offset]
+            peer = self.peers[index]
+            if all(predicate(index, peer) for predicate in predicates):
+                yield index, peer
+
+    def _positions(self, field: str, low: float, high: float) -> tuple[int, int]:
+        values = self._sorted[field]
+        return bisect_left(values, low), bisect_right(values, high)
+
+    @staticmethod
+    def _ranges(query: PeerQuery) -> dict[str, tuple[float, float]]:
+        ranges: dict[str, tuple[float, float]] = {}
+        if query.ip_network is not None:
+            ranges[SORT_IP] = (
+                int(query.ip_network.network_address),
+                int(query.ip_network.broadcast_address),
+            )
+        if query.handshake_after is not None or query.handshake_before is not None:
+            ranges[SORT_HANDSHAKE] = (
+                query.handshake_after if query.handshake_after is not None else float("-inf"),
+                query.handshake_before if query.handshake_before is not None else float("inf"),
+            )
+        return ranges
+
+    @staticmethod
+    def _predicates(query: PeerQuery) -> list[Callable[[int, dict], bool]]:
+        predicates: list[Callable[[int, dict], bool]] = []
+        if query.app_type:
+            app_type = query.app_type
+            predicates.append(lambda index, peer: peer.get("app_type") == app_type)
+        if query.online_only:
+            predicates.append(lambda index, peer: bool(peer.get("online")))
+        return predicates
+
+
+class _KeyView:
+    def __init__(self, positions: list[int], values: list, peers: tuple[dict, ...]):
+        self._positions = positions
+        self._values = values
+        self._peers = peers
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __getitem__(self, offset: int) -> tuple:
+        index = self._positions[offset]
+        return self._values[index], self._peers[index]["public_key"]
+
+
+def _range_predicate(values: list, low: float, high: float) -> Callable[[int, dict], bool]:
+    return lambda index, peer: low <= values[index] <= high
+
+
+def _handshake_timestamp(peer: dict) -> float:
+    value = peer.get("last_handshake")
+    if not value:
+        return 0.0
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _ip_value(peer: dict) -> int:
+    allowed_ips = peer.get("allowed_ips") or []
+    if not allowed_ips:
+        return -1
+    try:
+        return int(ipaddress.ip_interface(allowed_ips[0]).ip)
+    except ValueError:
+        return -1
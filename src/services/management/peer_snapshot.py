@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from src.management.logger import configure_logger
+from src.management.metrics import SNAPSHOT_REFRESH_SECONDS
+from src.services.management.peer_index import PeerIndex
+from src.services.management.protocol_factory import get_protocol_service
+from src.services.management.traffic_accounting import get_traffic_accounting
+from src.services.management.traffic_series import get_traffic_series_store
+
+
+logger = configure_logger("PeerSnapshot", "blue")
+
+
+@dataclass(frozen=True)
+class PeerSnapshot:
+    protocol: str
+    version: int
+    created_at: datetime
+    peers: tuple[dict, ...]
+    digest: str
+    index: PeerIndex
+
+
+class PeerSnapshotStore:
+    def __init__(self, protocol: str):
+        self.protocol = protocol
+        self.stale = True
+        self._snapshot: PeerSnapshot | None = None
+        self._started_at = 0.0
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def snapshot(self) -> PeerSnapshot | None:
+        return self._snapshot
+
+    async def get(self, fresh: bool = False) -> PeerSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and not fresh:
+            return snapshot
+        return await self.refresh(not_before=time.monotonic())
+
+    async def refresh(self, not_before: float | None = None) -> PeerSnapshot:
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and not_before is not None and self._started_at >= not_before:
+                return snapshot
+
+            started_at = time.monotonic()
+            self.stale = False
+            with SNAPSHOT_REFRESH_SECONDS.time(protocol=self.protocol):
+                try:
+                    peers = await get_protocol_service(self.protocol).get_peers()
+                except Exception:
+                    self.stale = True
+                    raise
+
+                await self._apply_lifetime_totals(peers)
+                peers = tuple(peers)
+                get_traffic_series_store(self.protocol).record(peers)
+                digest = _peers_digest(peers)
+                if snapshot is not None and snapshot.digest == digest:
+                    peers, index = snapshot.peers, snapshot.index
+                else:
+                    index = PeerIndex(peers)
+
+            self._version += 1
+            snapshot = PeerSnapshot(
+                protocol=self.protocol,
+                version=self._version,
+                created_at=datetime.now(timezone.utc),
+                peers=peers,
+                digest=digest,
+                index=index,
+            )
+            self._snapshot = snapshot
+            self._started_at = started_at
+            logger.debug(
+                f"Peer snapshot v{snapshot.version} for {self.protocol}: {len(peers)} peer(s)"
+            )
+            return snapshot
+
+    async def _apply_lifetime_totals(self, peers: list[dict]) -> None:
+        accounting = get_traffic_accounting()
+        if accounting is None:
+            return
+        try:
+            totals = await accounting.record(self.protocol, peers)
+        except Exception as exc:
+            logger.error(f"Traffic accounting failed for {self.protocol}: {exc}")
+            return
+        for peer in peers:
+            total = totals.get(peer["public_key"])
+            if total is not None:
+                peer["lifetime_rx_bytes"], peer["lifetime_tx_bytes"] = total
+
+    def mark_stale(self) -> None:
+        self.stale = True
+        _refresh_requested.set()
+
+
+def _peers_digest(peers: tuple[dict, ...]) -> str:
+    payload = json.dumps(peers, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+_snapshot_stores: dict[str, PeerSnapshotStore] = {}
+_refresh_requested = asyncio.Event()
+
+
+def get_peer_snapshot_store(protocol: str) -> PeerSnapshotStore:
+    store = _snapshot_stores.get(protocol)
+    if store is None:
+        store = PeerSnapshotStore(protocol)
+        _snapshot_stores[protocol] = store
+    return store
+
+
+async def wait_for_refresh_request(timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(_refresh_requested.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        return False
+    _refresh_requested.clear()
+    return True
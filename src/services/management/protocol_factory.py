@@ -11,6 +11,8 @@ from src.services.management.base_protocol_service import BaseProtocolService
 logger = configure_logger("ProtocolFactory", "cyan")
 
 _protocol_config: dict[str, dict] = {}
+_protocol_services: dict[str, BaseProtocolService] = {}
+_retired_services: list[BaseProtocolService] = []
 
 
 def load_protocol_config(config_path: str | None = None) -> None:
@@ -20,6 +22,8 @@ def load_protocol_config(config_path: str | None = None) -> None:
 
     config_file = Path(config_path)
     _protocol_config.clear()
+    _retired_services.extend(_protocol_services.values())
+    _protocol_services.clear()
     if not config_file.exists():
         raise FileNotFoundError(f"Protocol config file not found: {config_file.resolve()}")
 
@@ -52,8 +56,10 @@ def load_protocol_config(config_path: str | None = None) -> None:
         raise
 
 
-def reload_protocol_config(config_path: str | None = None) -> None:
+async def reload_protocol_config(config_path: str | None = None) -> None:
+    await close_protocol_services()
     load_protocol_config(config_path=config_path)
+    init_protocol_services()
 
 
 def get_available_protocols() -> list[str]:
@@ -121,3 +127,34 @@ def create_protocol_service(protocol_name: str) -> BaseProtocolService:
     except Exception as exc:
         logger.error(f"Failed to create service instance for {protocol_name}: {exc}")
         raise ValueError(f"Failed to create protocol service for {protocol_name}: {exc}")
+
+
+def get_protocol_service(protocol_name: str) -> BaseProtocolService:
+    normalized_name = protocol_name.lower()
+    service = _protocol_services.get(normalized_name)
+    if service is None:
+        service = create_protocol_service(normalized_name)
+        _protocol_services[normalized_name] = service
+    return service
+
+
+def init_protocol_services() -> None:
+    for protocol_name in get_available_protocols():
+        try:
+            get_protocol_service(protocol_name)
+        except Exception as exc:
+            logger.error(f"Failed to initialize service for {protocol_name}: {exc}")
+    logger.info(f"Initialized {len(_protocol_services)} protocol service(s)")
+
+
+async def close_protocol_services() -> None:
+    services = [*_retired_services, *_protocol_services.values()]
+    _retired_services.clear()
+    for service in services:
+        try:
+            await service.close()
+        except Exception as exc:
+            logger.error(f"Failed to close service for {service.protocol_name}: {exc}")
+    for name, service in list(_protocol_services.items()):
+        if service in services:
+            del _protocol_services[name]
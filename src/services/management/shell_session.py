@@ -0,0 +1,138 @@
+import asyncio
+import re
+import secrets
+import struct
+
+from src.management.logger import configure_logger
+from src.services.management.docker_engine import get_docker_engine
+
+
+logger = configure_logger("ShellSession", "blue")
+
+SESSION_MARKER_PREFIX = "__AMNEZIA_API_SESSION"
+FRAME_HEADER_SIZE = 8
+STDOUT_STREAM = 1
+STDERR_STREAM = 2
+
+
+class ShellSessionError(Exception):
+    pass
+
+
+class ContainerShellSession:
+    def __init__(self, container_name: str, command_timeout: float = 30.0):
+        self.container_name = container_name
+        self.command_timeout = command_timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    async def execute(self, script: str) -> tuple[int, str, str]:
+        async with self._lock:
+            if self._writer is not None and not self._is_alive():
+                logger.warning(
+                    f"Shell session for {self.container_name} is closed, reconnecting"
+                )
+                self._close_stream()
+
+            if self._writer is None:
+                await self._open()
+
+            try:
+                return await self._roundtrip(script)
+            except BaseException:
+                self._close_stream()
+                raise
+
+    async def reset(self) -> None:
+        async with self._lock:
+            self._close_stream()
+
+    async def close(self) -> None:
+        async with self._lock:
+            self._close_stream()
+
+    async def _open(self) -> None:
+        self._reader, self._writer = await get_docker_engine().exec_session(
+            self.container_name,
+            ["sh"],
+        )
+        logger.info(f"Shell session opened for {self.container_name}")
+
+    def _is_alive(self) -> bool:
+        return not self._reader.at_eof() and not self._writer.is_closing()
+
+    async def _roundtrip(self, script: str) -> tuple[int, str, str]:
+        marker = f"{SESSION_MARKER_PREFIX}_{secrets.token_hex(8)}__".encode()
+        payload = (
+            f"(\n{script}\n) </dev/null\n"
+            f"printf '\\n%s %s\\n' '{marker.decode()}' \"$?\"\n"
+            f"printf '\\n%s\\n' '{marker.decode()}' >&2\n"
+        )
+        self._writer.write(payload.encode())
+        await self._writer.drain()
+
+        stdout_end = re.compile(rb"\n" + re.escape(marker) + rb" (-?\d+)\n$")
+        stderr_end = b"\n" + marker + b"\n"
+        stdout = bytearray()
+        stderr = bytearray()
+        exit_code: int | None = None
+
+        while exit_code is None or not stderr.endswith(stderr_end):
+            stream, size = struct.unpack(">BxxxL", await self._read_exactly(FRAME_HEADER_SIZE))
+            frame = await self._read_exactly(size)
+
+            if stream == STDERR_STREAM:
+                stderr.extend(frame)
+                continue
+
+            stdout.extend(frame)
+            if exit_code is None:
+                match = stdout_end.search(stdout, max(0, len(stdout) - len(frame) - len(marker) - 16))
+                if match:
+                    exit_code = int(match.group(1))
+                    del stdout[match.start():]
+
+        del stderr[-len(stderr_end):]
+        return exit_code, stdout.decode(), stderr.decode()
+
+    async def _read_exactly(self, size: int) -> bytes:
+        try:
+            return await asyncio.wait_for(
+                self._reader.readexactly(size),
+                timeout=self.command_timeout,
+            )
+        except asyncio.IncompleteReadError:
+            raise ShellSessionError(
+                f"Shell session for {self.container_name} closed unexpectedly"
+            )
+
+    def _close_stream(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+
+_shell_sessions: dict[str, ContainerShellSession] = {}
+
+
+def get_shell_session(container_name: str) -> ContainerShellSession:
+    session = _shell_sessions.get(container_name)
+    if session is None:
+        session = ContainerShellSession(container_name)
+        _shell_sessions[container_name] = session
+    return session
+
+
+async def reset_shell_session(container_name: str) -> None:
+    session = _shell_sessions.get(container_name)
+    if session is not None:
+        await session.reset()
+
+
+async def close_shell_sessions() -> None:
+    sessions = list(_shell_sessions.values())
+    _shell_sessions.clear()
+    for session in sessions:
+        await session.close()
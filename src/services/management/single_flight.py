@@ -0,0 +1,50 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from functools import lru_cache
+from typing import Any
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.executions = 0
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+        self._generations: dict[Hashable, int] = {}
+
+    async def run(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        scope: Hashable = None,
+    ) -> Any:
+        self.calls += 1
+        flight_key = (scope, self._generations.get(scope, 0), key)
+        future = self._in_flight.get(flight_key)
+        if future is None:
+            self.executions += 1
+            future = asyncio.ensure_future(factory())
+            self._in_flight[flight_key] = future
+            future.add_done_callback(lambda done: self._forget(flight_key, done))
+        return await asyncio.shield(future)
+
+    def invalidate(self, scope: Hashable) -> None:
+        self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.calls - self.executions,
+            "in_flight": len(self._in_flight),
+        }
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            future.exception()
+
+
+@lru_cache
+def get_read_single_flight() -> SingleFlight:
+    return SingleFlight()
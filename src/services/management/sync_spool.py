@@ -0,0 +1,231 @@
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from src.management.logger import configure_logger
+from src.management.settings import get_settings
+
+
+logger = configure_logger("SyncSpool", "blue")
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".ndjson"
+HEAD_FILE = "head"
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+
+
+@dataclass
+class SpoolEntry:
+    segment: int
+    end_offset: int
+    payload: dict
+
+
+class SyncSpool:
+    def __init__(self, path: str, max_bytes: int, segment_bytes: int = SEGMENT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.segment_bytes = max(1, min(segment_bytes, max_bytes // 4 or 1))
+        self._segments: list[int] = []
+        self._head_segment = 0
+        self._head_offset = 0
+        self._size = 0
+        self._count = 0
+        self._last_versions: dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._load()
+
+    @property
+    def pending(self) -> bool:
+        return self._count > 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def last_version(self, protocol: str) -> int:
+        return self._last_versions.get(protocol, 0)
+
+    def fits(self, payload: dict) -> bool:
+        return self._size + len(_encode(payload)) <= self.max_bytes
+
+    def append(self, payload: dict) -> None:
+        with self._lock:
+            line = _encode(payload)
+            tail = self._segments[-1] if self._segments else None
+            if tail is None or self._segment_size(tail) + len(line) > self.segment_bytes:
+                tail = (tail or 0) + 1
+                self._segments.append(tail)
+                if len(self._segments) == 1:
+                    self._set_head(tail, 0)
+
+            with open(self._segment_path(tail), "ab") as file_handle:
+                file_handle.write(line)
+                file_handle.flush()
+                os.fsync(file_handle.fileno())
+
+            self._size += len(line)
+            self._count += 1
+            self._track(payload)
+
+    def read(self, limit: int) -> list[SpoolEntry]:
+        with self._lock:
+            entries: list[SpoolEntry] = []
+            for segment, offset, payload in self._iter_entries():
+                entries.append(SpoolEntry(segment=segment, end_offset=offset, payload=payload))
+                if len(entries) >= limit:
+                    break
+            return entries
+
+    def ack(self, entry: SpoolEntry) -> None:
+        with self._lock:
+            acknowledged = 0
+            removed = 0
+            for segment, offset, _ in self._iter_entries():
+                if (segment, offset) > (entry.segment, entry.end_offset):
+                    break
+                acknowledged += 1
+            for segment in list(self._segments):
+                if segment >= entry.segment:
+                    break
+                removed += self._segment_size(segment) - self._head_offset_for(segment)
+                self._remove_segment(segment)
+
+            consumed = entry.end_offset - self._head_offset_for(entry.segment)
+            self._size -= removed + consumed
+            self._count -= acknowledged
+
+            if self._count == 0:
+                self.clear()
+                return
+            if entry.end_offset >= self._segment_size(entry.segment) and len(self._segments) > 1:
+                self._remove_segment(entry.segment)
+                self._set_head(self._segments[0], 0)
+            else:
+                self._set_head(entry.segment, entry.end_offset)
+
+    def collapse(self, protocol: str, payload: dict) -> None:
+        with self._lock:
+            kept = [
+                item
+                for _, _, item in self._iter_entries()
+                if item.get("protocol") != protocol
+            ]
+            dropped = self._count - len(kept)
+            self.clear()
+            for item in kept:
+                self.append(item)
+            self.append(payload)
+            logger.warning(
+                f"Sync spool over {self.max_bytes} bytes, collapsed {dropped} entries "
+                f"of protocol {protocol} into one full snapshot"
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            for segment in list(self._segments):
+                self._remove_segment(segment)
+            self._segments = []
+            self._size = 0
+            self._count = 0
+            self._last_versions = {}
+            self._set_head(0, 0)
+
+    def _load(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        self._segments = sorted(
+            int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            for name in os.listdir(self.path)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+
+        try:
+            with open(os.path.join(self.path, HEAD_FILE), "r") as file_handle:
+                head_segment, head_offset = (int(part) for part in file_handle.read().split())
+        except (OSError, ValueError):
+            head_segment, head_offset = 0, 0
+
+        for segment in list(self._segments):
+            if segment < head_segment:
+                self._remove_segment(segment)
+        if self._segments and self._segments[0] != head_segment:
+            head_segment, head_offset = self._segments[0], 0
+        self._head_segment, self._head_offset = head_segment, head_offset
+
+        for _, _, payload in self._iter_entries():
+            self._count += 1
+            self._track(payload)
+        self._size = sum(self._segment_size(segment) for segment in self._segments)
+        if self._segments:
+            self._size -= self._head_offset
+
+        if self._count:
+            logger.info(f"Sync spool holds {self._count} unacknowledged payload(s)")
+
+    def _iter_entries(self) -> Iterator[tuple[int, int, dict]]:
+        for segment in self._segments:
+            offset = self._head_offset_for(segment)
+            with open(self._segment_path(segment), "rb") as file_handle:
+                file_handle.seek(offset)
+                for line in file_handle:
+                    offset += len(line)
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        payload = json.loads(line)
+                    except ValueError:
+                        continue
+                    yield segment, offset, payload
+
+    def _track(self, payload: dict) -> None:
+        protocol = payload.get("protocol")
+        version = payload.get("version")
+        if protocol is not None and isinstance(version, int):
+            self._last_versions[protocol] = max(self._last_versions.get(protocol, 0), version)
+
+    def _head_offset_for(self, segment: int) -> int:
+        return self._head_offset if segment == self._head_segment else 0
+
+    def _set_head(self, segment: int, offset: int) -> None:
+        self._head_segment, self._head_offset = segment, offset
+        fd, temp_path = tempfile.mkstemp(dir=self.path, prefix=f".{HEAD_FILE}.")
+        with os.fdopen(fd, "w") as file_handle:
+            file_handle.write(f"{segment} {offset}\n")
+            file_handle.flush()
+            os.fsync(file_handle.fileno())
+        os.replace(temp_path, os.path.join(self.path, HEAD_FILE))
+
+    def _remove_segment(self, segment: int) -> None:
+        try:
+            os.unlink(self._segment_path(segment))
+        except FileNotFoundError:
+            pass
+        self._segments.remove(segment)
+
+    def _segment_size(self, segment: int) -> int:
+        return os.path.getsize(self._segment_path(segment))
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"{SEGMENT_PREFIX}{segment:08d}{SEGMENT_SUFFIX}")
+
+
+def _encode(payload: dict) -> bytes:
+    return (json.dumps(payload, separators=(",", ":")) + "\n").encode()
+
+
+_sync_spool: SyncSpool | None = None
+
+
+def get_sync_spool() -> SyncSpool:
+    global _sync_spool
+    if _sync_spool is None:
+        settings = get_settings()
+        _sync_spool = SyncSpool(settings.sync_spool_path, settings.sync_spool_max_bytes)
+    return _sync_spool
@@ -0,0 +1,272 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+
+from src.management.logger import configure_logger
+from src.management.settings import get_settings
+
+
+logger = configure_logger("TrafficAccounting", "blue")
+
+BUCKET_SECONDS = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS peer_counters (
+    protocol TEXT NOT NULL,
+    public_key TEXT NOT NULL,
+    last_rx INTEGER NOT NULL,
+    last_tx INTEGER NOT NULL,
+    total_rx INTEGER NOT NULL,
+    total_tx INTEGER NOT NULL,
+    first_seen INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    PRIMARY KEY (protocol, public_key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS traffic_usage (
+    protocol TEXT NOT NULL,
+    public_key TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    rx_bytes INTEGER NOT NULL,
+    tx_bytes INTEGER NOT NULL,
+    PRIMARY KEY (protocol, public_key, bucket)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS traffic_usage_by_bucket ON traffic_usage (protocol, bucket);
+"""
+
+UPSERT_COUNTERS = """
+INSERT INTO peer_counters
+    (protocol, public_key, last_rx, last_tx, total_rx, total_tx, first_seen, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (protocol, public_key) DO UPDATE SET
+    last_rx = excluded.last_rx,
+    last_tx = excluded.last_tx,
+    total_rx = excluded.total_rx,
+    total_tx = excluded.total_tx,
+    updated_at = excluded.updated_at
+"""
+
+UPSERT_USAGE = """
+INSERT INTO traffic_usage (protocol, public_key, bucket, rx_bytes, tx_bytes)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (protocol, public_key, bucket) DO UPDATE SET
+    rx_bytes = rx_bytes + excluded.rx_bytes,
+    tx_bytes = tx_bytes + excluded.tx_bytes
+"""
+
+
+class TrafficAccounting:
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[str, list[int]]] = {}
+
+    async def record(
+        self,
+        protocol: str,
+        peers: Iterable[dict],
+        timestamp: float | None = None,
+    ) -> dict[str, tuple[int, int]]:
+        samples = [
+            (peer["public_key"], int(peer.get("rx_bytes", 0)), int(peer.get("tx_bytes", 0)))
+            for peer in peers
+            if peer.get("public_key")
+        ]
+        now = int(timestamp if timestamp is not None else time.time())
+        return await asyncio.to_thread(self._record, protocol, samples, now)
+
+    async def get_peer_usage(
+        self,
+        protocol: str,
+        public_key: str,
+        since: int,
+        until: int,
+    ) -> dict | None:
+        return await asyncio.to_thread(self._get_peer_usage, protocol, public_key, since, until)
+
+    async def get_usage(self, protocol: str, since: int, until: int) -> list[dict]:
+        return await asyncio.to_thread(self._get_usage, protocol, since, until)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._counters = {}
+
+    def _record(
+        self,
+        protocol: str,
+        samples: list[tuple[str, int, int]],
+        now: int,
+    ) -> dict[str, tuple[int, int]]:
+        with self._lock:
+            connection = self._connect()
+            counters = self._load_counters(connection, protocol)
+            bucket = now - now % BUCKET_SECONDS
+
+            counter_rows = []
+            usage_rows = []
+            totals: dict[str, tuple[int, int]] = {}
+            resets = 0
+            for public_key, rx_bytes, tx_bytes in samples:
+                state = counters.get(public_key)
+                if state is None:
+                    state = [rx_bytes, tx_bytes, rx_bytes, tx_bytes]
+                    counters[public_key] = state
+                    counter_rows.append(
+                        (protocol, public_key, rx_bytes, tx_bytes, rx_bytes, tx_bytes, now, now)
+                    )
+                    totals[public_key] = (rx_bytes, tx_bytes)
+                    continue
+
+                last_rx, last_tx, total_rx, total_tx = state
+                if rx_bytes < last_rx or tx_bytes < last_tx:
+                    resets += 1
+                    delta_rx, delta_tx = rx_bytes, tx_bytes
+                else:
+                    delta_rx, delta_tx = rx_bytes - last_rx, tx_bytes - last_tx
+
+                if rx_bytes != last_rx or tx_bytes != last_tx:
+                    total_rx += delta_rx
+                    total_tx += delta_tx
+                    state[:] = [rx_bytes, tx_bytes, total_rx, total_tx]
+                    counter_rows.append(
+                        (protocol, public_key, rx_bytes, tx_bytes, total_rx, total_tx, now, now)
+                    )
+                    if delta_rx or delta_tx:
+                        usage_rows.append((protocol, public_key, bucket, delta_rx, delta_tx))
+                totals[public_key] = (total_rx, total_tx)
+
+            if counter_rows:
+                try:
+                    with connection:
+                        connection.executemany(UPSERT_COUNTERS, counter_rows)
+                        connection.executemany(UPSERT_USAGE, usage_rows)
+                except sqlite3.Error:
+                    self._counters.pop(protocol, None)
+                    raise
+
+            if resets:
+                logger.info(f"Detected counter reset for {resets} peer(s) of protocol {protocol}")
+            return totals
+
+    def _get_peer_usage(
+        self,
+        protocol: str,
+        public_key: str,
+        since: int,
+        until: int,
+    ) -> dict | None:
+        with self._lock:
+            connection = self._connect()
+            counters = connection.execute(
+                "SELECT total_rx, total_tx, first_seen, updated_at FROM peer_counters "
+                "WHERE protocol = ? AND public_key = ?",
+                (protocol, public_key),
+            ).fetchone()
+            if counters is None:
+                return None
+
+            buckets = connection.execute(
+                "SELECT bucket, rx_bytes, tx_bytes FROM traffic_usage "
+                "WHERE protocol = ? AND public_key = ? AND bucket >= ? AND bucket < ? "
+                "ORDER BY bucket",
+                (protocol, public_key, since - since % BUCKET_SECONDS, until),
+            ).fetchall()
+
+        return {
+            "public_key": public_key,
+            "lifetime_rx_bytes": counters[0],
+            "lifetime_tx_bytes": counters[1],
+            "first_seen": counters[2],
+            "updated_at": counters[3],
+            "rx_bytes": sum(row[1] for row in buckets),
+            "tx_bytes": sum(row[2] for row in buckets),
+            "buckets": [
+                {"bucket": row[0], "rx_bytes": row[1], "tx_bytes": row[2]}
+                for row in buckets
+            ],
+        }
+
+    def _get_usage(self, protocol: str, since: int, until: int) -> list[dict]:
+        with self._lock:
+            connection = self._connect()
+            rows = connection.execute(
+                "SELECT c.public_key, c.total_rx, c.total_tx, "
+                "COALESCE(u.rx_bytes, 0), COALESCE(u.tx_bytes, 0) "
+                "FROM peer_counters AS c LEFT JOIN ("
+                "    SELECT public_key, SUM(rx_bytes) AS rx_bytes, SUM(tx_bytes) AS tx_bytes "
+                "    FROM traffic_usage WHERE protocol = ? AND bucket >= ? AND bucket < ? "
+                "    GROUP BY public_key"
+                ") AS u ON u.public_key = c.public_key "
+                "WHERE c.protocol = ? ORDER BY c.public_key",
+                (protocol, since - since % BUCKET_SECONDS, until, protocol),
+            ).fetchall()
+
+        return [
+            {
+                "public_key": row[0],
+                "lifetime_rx_bytes": row[1],
+                "lifetime_tx_bytes": row[2],
+                "rx_bytes": row[3],
+                "tx_bytes": row[4],
+            }
+            for row in rows
+        ]
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+            logger.info(f"Traffic accounting store opened at {self.path}")
+        return self._connection
+
+    def _load_counters(
+        self,
+        connection: sqlite3.Connection,
+        protocol: str,
+    ) -> dict[str, list[int]]:
+        counters = self._counters.get(protocol)
+        if counters is None:
+            counters = {
+                row[0]: [row[1], row[2], row[3], row[4]]
+                for row in connection.execute(
+                    "SELECT public_key, last_rx, last_tx, total_rx, total_tx "
+                    "FROM peer_counters WHERE protocol = ?",
+                    (protocol,),
+                )
+            }
+            self._counters[protocol] = counters
+        return counters
+
+
+_traffic_accounting: TrafficAccounting | None = None
+
+
+def get_traffic_accounting() -> TrafficAccounting | None:
+    global _traffic_accounting
+    path = get_settings().traffic_db_path
+    if not path:
+        return None
+    if _traffic_accounting is None:
+        _traffic_accounting = TrafficAccounting(path)
+    return _traffic_accounting
+
+
+def close_traffic_accounting() -> None:
+    global _traffic_accounting
+    accounting, _traffic_accounting = _traffic_accounting, None
+    if accounting is not None:
+        accounting.close()
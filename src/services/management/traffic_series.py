@@ -0,0 +1,155 @@
+import time
+from array import array
+from collections.abc import Iterable
+
+
+RAW_CAPACITY = 16
+MINUTE_CAPACITY = 60
+MINUTE_SECONDS = 60
+QUARTER_CAPACITY = 96
+QUARTER_SECONDS = 900
+
+WINDOW_MINUTE = "1m"
+WINDOW_HOUR = "1h"
+WINDOW_DAY = "24h"
+
+WINDOW_SECONDS = {
+    WINDOW_MINUTE: 60,
+    WINDOW_HOUR: 3600,
+    WINDOW_DAY: 86400,
+}
+
+
+class TrafficRing:
+    __slots__ = ("capacity", "timestamps", "rx", "tx", "_next", "size")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array("I", bytes(4 * capacity))
+        self.rx = array("Q", bytes(8 * capacity))
+        self.tx = array("Q", bytes(8 * capacity))
+        self._next = 0
+        self.size = 0
+
+    def append(self, timestamp: int, rx_bytes: int, tx_bytes: int) -> None:
+        position = self._next
+        self.timestamps[position] = timestamp
+        self.rx[position] = rx_bytes
+        self.tx[position] = tx_bytes
+        self._next = (position + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def last_timestamp(self) -> int | None:
+        if self.size == 0:
+            return None
+        return self.timestamps[(self._next - 1) % self.capacity]
+
+    def samples(self) -> list[tuple[int, int, int]]:
+        start = (self._next - self.size) % self.capacity
+        result = []
+        for offset in range(self.size):
+            position = (start + offset) % self.capacity
+            result.append((self.timestamps[position], self.rx[position], self.tx[position]))
+        return result
+
+
+class PeerTrafficSeries:
+    __slots__ = ("raw", "minutes", "quarters")
+
+    def __init__(self) -> None:
+        self.raw = TrafficRing(RAW_CAPACITY)
+        self.minutes = TrafficRing(MINUTE_CAPACITY)
+        self.quarters = TrafficRing(QUARTER_CAPACITY)
+
+    def record(self, timestamp: int, rx_bytes: int, tx_bytes: int) -> None:
+        last = self.raw.last_timestamp()
+        if last is not None and timestamp <= last:
+            return
+        self.raw.append(timestamp, rx_bytes, tx_bytes)
+        for ring, seconds in ((self.minutes, MINUTE_SECONDS), (self.quarters, QUARTER_SECONDS)):
+            last = ring.last_timestamp()
+            if last is None or timestamp // seconds != last // seconds:
+                ring.append(timestamp, rx_bytes, tx_bytes)
+
+    def current_rate(self) -> dict[str, float]:
+        samples = self.raw.samples()
+        return _rate(samples[-2], samples[-1]) if len(samples) >= 2 else _zero_rate()
+
+    def window(self, name: str, now: int) -> dict:
+        since = now - WINDOW_SECONDS[name]
+        ring = {
+            WINDOW_MINUTE: self.raw,
+            WINDOW_HOUR: self.minutes,
+            WINDOW_DAY: self.quarters,
+        }[name]
+        samples = ring.samples()
+        window_samples = [sample for sample in samples if sample[0] >= since]
+        previous = [sample for sample in samples if sample[0] < since]
+        if previous:
+            window_samples.insert(0, previous[-1])
+
+        points = [
+            {"timestamp": current[0], **_rate(prior, current)}
+            for prior, current in zip(window_samples, window_samples[1:])
+        ]
+        average = (
+            _rate(window_samples[0], window_samples[-1])
+            if len(window_samples) >= 2
+            else _zero_rate()
+        )
+        return {"window": name, **average, "points": points}
+
+
+class TrafficSeriesStore:
+    def __init__(self, protocol: str):
+        self.protocol = protocol
+        self._series: dict[str, PeerTrafficSeries] = {}
+
+    def record(self, peers: Iterable[dict], timestamp: float | None = None) -> None:
+        now = int(timestamp if timestamp is not None else time.time())
+        seen = set()
+        for peer in peers:
+            public_key = peer.get("public_key")
+            if not public_key:
+                continue
+            seen.add(public_key)
+            series = self._series.get(public_key)
+            if series is None:
+                series = PeerTrafficSeries()
+                self._series[public_key] = series
+            series.record(now, int(peer.get("rx_bytes", 0)), int(peer.get("tx_bytes", 0)))
+
+        for public_key in [key for key in self._series if key not in seen]:
+            del self._series[public_key]
+
+    def get(self, public_key: str) -> PeerTrafficSeries | None:
+        return self._series.get(public_key)
+
+
+def _rate(prior: tuple[int, int, int], current: tuple[int, int, int]) -> dict[str, float]:
+    elapsed = current[0] - prior[0]
+    if elapsed <= 0:
+        return _zero_rate()
+    return {
+        "rx_bytes_per_second": _delta(prior[1], current[1]) / elapsed,
+        "tx_bytes_per_second": _delta(prior[2], current[2]) / elapsed,
+    }
+
+
+def _delta(prior: int, current: int) -> int:
+    return current - prior if current >= prior else current
+
+
+def _zero_rate() -> dict[str, float]:
+    return {"rx_bytes_per_second": 0.0, "tx_bytes_per_second": 0.0}
+
+
+_series_stores: dict[str, TrafficSeriesStore] = {}
+
+
+def get_traffic_series_store(protocol: str) -> TrafficSeriesStore:
+    store = _series_stores.get(protocol)
+    if store is None:
+        store = TrafficSeriesStore(protocol)
+        _series_stores[protocol] = store
+    return store
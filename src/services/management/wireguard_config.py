@@ -0,0 +1,192 @@
+import re
+from collections.abc import Iterator
+
+
+INTERFACE_SECTION = "Interface"
+PEER_SECTION = "Peer"
+
+_SECTION_HEADER_PATTERN = re.compile(r"^\s*\[([^\]]+)\]\s*$")
+_KEY_VALUE_PATTERN = re.compile(r"^\s*(\w+)\s*=\s*(.*?)\s*$")
+_METADATA_PATTERN = re.compile(r"^\s*#\s*(\w+)\s*=\s*(.*?)\s*$")
+
+
+class ConfigSection:
+    __slots__ = ("name", "lines", "_values", "_metadata")
+
+    def __init__(self, name: str, lines: list[str]):
+        self.name = name
+        self.lines = lines
+        self._values: dict[str, str] | None = None
+        self._metadata: dict[str, str] | None = None
+
+    @classmethod
+    def build(
+        cls,
+        name: str,
+        values: dict[str, str],
+        metadata: dict[str, str] | None = None,
+        leading_blank_line: bool = True,
+    ) -> "ConfigSection":
+        lines = ["\n"] if leading_blank_line else []
+        lines.append(f"[{name}]\n")
+        for key, value in (metadata or {}).items():
+            lines.append(f"# {key} = {value}\n")
+        for key, value in values.items():
+            lines.append(f"{key} = {value}\n")
+        return cls(name, lines)
+
+    @property
+    def values(self) -> dict[str, str]:
+        if self._values is None:
+            self._parse()
+        return self._values
+
+    @property
+    def metadata(self) -> dict[str, str]:
+        if self._metadata is None:
+            self._parse()
+        return self._metadata
+
+    def get(self, key: str) -> str | None:
+        return self.values.get(key.lower())
+
+    def get_metadata(self, key: str) -> str | None:
+        return self.metadata.get(key.lower())
+
+    def text(self) -> str:
+        return "".join(self.lines)
+
+    def ensure_trailing_newline(self) -> None:
+        if self.lines and not self.lines[-1].endswith("\n"):
+            self.lines[-1] = f"{self.lines[-1]}\n"
+
+    def _parse(self) -> None:
+        values: dict[str, str] = {}
+        metadata: dict[str, str] = {}
+        for line in self.lines:
+            metadata_match = _METADATA_PATTERN.match(line)
+            if metadata_match:
+                metadata.setdefault(metadata_match.group(1).lower(), metadata_match.group(2))
+                continue
+            value_match = _KEY_VALUE_PATTERN.match(line)
+            if value_match:
+                values.setdefault(value_match.group(1).lower(), value_match.group(2))
+        self._values = values
+        self._metadata = metadata
+
+
+class WireGuardConfig:
+    def __init__(self, preamble: list[str] | None = None):
+        self.preamble = preamble or []
+        self._sections: dict[object, ConfigSection] = {}
+        self._interface_key: object | None = None
+        self._peer_keys: dict[str, list[object]] = {}
+
+    @classmethod
+    def parse(cls, text: str) -> "WireGuardConfig":
+        config = cls()
+        current: ConfigSection | None = None
+
+        for line in text.splitlines(keepends=True):
+            header_match = _SECTION_HEADER_PATTERN.match(line)
+            if header_match:
+                leading_lines = config._pop_trailing_blank_lines(current)
+                if current is not None:
+                    config._append_section(current)
+                current = ConfigSection(header_match.group(1).strip(), [*leading_lines, line])
+            elif current is None:
+                config.preamble.append(line)
+            else:
+                current.lines.append(line)
+
+        if current is not None:
+            config._append_section(current)
+
+        return config
+
+    def serialize(self) -> str:
+        parts = ["".join(self.preamble)]
+        parts.extend(section.text() for section in self._sections.values())
+        return "".join(parts)
+
+    @property
+    def interface(self) -> ConfigSection | None:
+        if self._interface_key is None:
+            return None
+        return self._sections[self._interface_key]
+
+    @property
+    def peer_count(self) -> int:
+        return len(self._peer_keys)
+
+    def peer_public_keys(self) -> Iterator[str]:
+        return iter(self._peer_keys)
+
+    def peers(self) -> Iterator[tuple[str, ConfigSection]]:
+        for public_key, section_keys in self._peer_keys.items():
+            yield public_key, self._sections[section_keys[0]]
+
+    def has_peer(self, public_key: str) -> bool:
+        return public_key in self._peer_keys
+
+    def get_peer(self, public_key: str) -> ConfigSection | None:
+        section_keys = self._peer_keys.get(public_key)
+        if section_keys is None:
+            return None
+        return self._sections[section_keys[0]]
+
+    def add_peer(
+        self,
+        public_key: str,
+        values: dict[str, str],
+        metadata: dict[str, str] | None = None,
+    ) -> ConfigSection:
+        if public_key in self._peer_keys:
+            raise ValueError(f"Peer {public_key} already exists in config")
+
+        if self._sections:
+            next(reversed(self._sections.values())).ensure_trailing_newline()
+        elif self.preamble and not self.preamble[-1].endswith("\n"):
+            self.preamble[-1] = f"{self.preamble[-1]}\n"
+
+        section = ConfigSection.build(
+            PEER_SECTION,
+            {"PublicKey": public_key, **values},
+            metadata,
+            leading_blank_line=bool(self._sections or self.preamble),
+        )
+        self._append_section(section)
+        return section
+
+    def remove_peer(self, public_key: str) -> bool:
+        section_keys = self._peer_keys.pop(public_key, None)
+        if section_keys is None:
+            return False
+        for section_key in section_keys:
+            del self._sections[section_key]
+        return True
+
+    def _pop_trailing_blank_lines(self, section: ConfigSection | None) -> list[str]:
+        lines = section.lines if section is not None else self.preamble
+        first_header_line = 1 if section is not None else 0
+        split_at = len(lines)
+        while split_at > first_header_line and not lines[split_at - 1].strip():
+            split_at -= 1
+        trailing = lines[split_at:]
+        del lines[split_at:]
+        return trailing
+
+    def _append_section(self, section: ConfigSection) -> None:
+        section_key = object()
+        self._sections[section_key] = section
+
+        name = section.name.lower()
+        if name == INTERFACE_SECTION.lower():
+            if self._interface_key is None:
+                self._interface_key = section_key
+            return
+
+        if name == PEER_SECTION.lower():
+            public_key = section.get("PublicKey")
+            if public_key:
+                self._peer_keys.setdefault(public_key, []).append(section_key)
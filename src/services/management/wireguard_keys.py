@@ -0,0 +1,89 @@
+import base64
+import binascii
+import secrets
+
+
+KEY_SIZE = 32
+_FIELD_PRIME = 2**255 - 19
+_A24 = 121665
+_BASE_POINT = 9
+
+
+def generate_private_key() -> str:
+    return _encode_key(_clamp(secrets.token_bytes(KEY_SIZE)))
+
+
+def generate_preshared_key() -> str:
+    return _encode_key(secrets.token_bytes(KEY_SIZE))
+
+
+def derive_public_key(private_key: str) -> str:
+    scalar = _decode_key(private_key)
+    return _encode_key(_x25519(scalar, _BASE_POINT))
+
+
+def generate_keypair() -> tuple[str, str]:
+    private_key = generate_private_key()
+    return private_key, derive_public_key(private_key)
+
+
+def _encode_key(key: bytes) -> str:
+    return base64.b64encode(key).decode("ascii")
+
+
+def _decode_key(key: str) -> bytes:
+    try:
+        decoded = base64.b64decode(key.strip(), validate=True)
+    except (binascii.Error, ValueError):
+        raise ValueError("Key is not valid base64")
+    if len(decoded) != KEY_SIZE:
+        raise ValueError(f"Key must be {KEY_SIZE} bytes long, got {len(decoded)}")
+    return decoded
+
+
+def _clamp(scalar: bytes) -> bytes:
+    clamped = bytearray(scalar)
+    clamped[0] &= 248
+    clamped[31] = (clamped[31] & 127) | 64
+    return bytes(clamped)
+
+
+def _x25519(scalar: bytes, u: int) -> bytes:
+    k = int.from_bytes(_clamp(scalar), "little")
+    p = _FIELD_PRIME
+
+    x_1 = u
+    x_2, z_2 = 1, 0
+    x_3, z_3 = u, 1
+    swap = 0
+
+    for t in reversed(range(255)):
+        k_t = (k >> t) & 1
+        swap ^= k_t
+        if swap:
+            x_2, x_3 = x_3, x_2
+            z_2, z_3 = z_3, z_2
+        swap = k_t
+
+        a = (x_2 + z_2) % p
+        aa = a * a % p
+        b = (x_2 - z_2) % p
+        bb = b * b % p
+        e = (aa - bb) % p
+        c = (x_3 + z_3) % p
+        d = (x_3 - z_3) % p
+        da = d * a % p
+        cb = c * b % p
+        x_3 = (da + cb) % p
+        x_3 = x_3 * x_3 % p
+        z_3 = (da - cb) % p
+        z_3 = x_1 * (z_3 * z_3 % p) % p
+        x_2 = aa * bb % p
+        z_2 = e * (aa + _A24 * e) % p
+
+    if swap:
+        x_2, x_3 = x_3, x_2
+        z_2, z_3 = z_3, z_2
+
+    result = x_2 * pow(z_2, p - 2, p) % p
+    return result.to_bytes(KEY_SIZE, "little")
@@ -0,0 +1,153 @@
+import time
+from datetime import datetime
+
+from src.management.logger import configure_logger
+from src.management.metrics import HISTOGRAMS, gauge_family
+from src.management.settings import get_settings
+from src.services.management.container_state import get_container_state_cache
+from src.services.management.peer_index import SORT_TRAFFIC, PeerQuery
+from src.services.management.peer_snapshot import PeerSnapshot, get_peer_snapshot_store
+from src.services.management.protocol_factory import (
+    get_available_protocols,
+    get_protocol_config,
+)
+
+
+logger = configure_logger("MetricsService", "cyan")
+
+PEER_MODE_ALL = "all"
+PEER_MODE_TOP = "top"
+PEER_MODE_AGGREGATE = "aggregate"
+
+
+class MetricsService:
+    def __init__(self) -> None:
+        self.settings = get_settings()
+
+    def render(self) -> str:
+        snapshots = {
+            protocol: get_peer_snapshot_store(protocol).snapshot
+            for protocol in get_available_protocols()
+        }
+        now = time.time()
+
+        lines: list[str] = []
+        lines.extend(self._container_metrics(snapshots))
+        lines.extend(self._aggregate_metrics(snapshots, now))
+        lines.extend(self._peer_metrics(snapshots, now))
+        for histogram in HISTOGRAMS:
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+    def _container_metrics(self, snapshots: dict[str, PeerSnapshot | None]) -> list[str]:
+        cache = get_container_state_cache()
+        if not cache.ready:
+            return []
+
+        samples = []
+        for protocol in snapshots:
+            container_name = get_protocol_config(protocol).get("container_name", protocol)
+            running = cache.get_state(container_name) == "running"
+            samples.append(({"protocol": protocol, "container": container_name}, int(running)))
+        return gauge_family(
+            "amnezia_container_up",
+            "Whether the protocol container is running",
+            samples,
+        )
+
+    def _aggregate_metrics(
+        self,
+        snapshots: dict[str, PeerSnapshot | None],
+        now: float,
+    ) -> list[str]:
+        families: dict[str, tuple[str, list[tuple[dict, float]]]] = {
+            "amnezia_peers": ("Peers configured on the protocol", []),
+            "amnezia_peers_online": ("Peers with a recent handshake", []),
+            "amnezia_rx_bytes": ("Bytes received from all peers since their last counter reset", []),
+            "amnezia_tx_bytes": ("Bytes sent to all peers since their last counter reset", []),
+            "amnezia_lifetime_rx_bytes": ("Lifetime bytes received from all peers", []),
+            "amnezia_lifetime_tx_bytes": ("Lifetime bytes sent to all peers", []),
+            "amnezia_peer_snapshot_age_seconds": ("Age of the cached peer snapshot", []),
+        }
+        for protocol, snapshot in snapshots.items():
+            if snapshot is None:
+                continue
+            labels = {"protocol": protocol}
+            peers = snapshot.peers
+            values = {
+                "amnezia_peers": len(peers),
+                "amnezia_peers_online": sum(1 for peer in peers if peer.get("online")),
+                "amnezia_rx_bytes": sum(int(peer.get("rx_bytes", 0)) for peer in peers),
+                "amnezia_tx_bytes": sum(int(peer.get("tx_bytes", 0)) for peer in peers),
+                "amnezia_lifetime_rx_bytes": sum(
+                    int(peer.get("lifetime_rx_bytes", peer.get("rx_bytes", 0))) for peer in peers
+                ),
+                "amnezia_lifetime_tx_bytes": sum(
+                    int(peer.get("lifetime_tx_bytes", peer.get("tx_bytes", 0))) for peer in peers
+                ),
+                "amnezia_peer_snapshot_age_seconds": max(
+                    0.0, round(now - snapshot.created_at.timestamp(), 3)
+                ),
+            }
+            for name, value in values.items():
+                families[name][1].append((labels, value))
+
+        lines: list[str] = []
+        for name, (documentation, samples) in families.items():
+            lines.extend(gauge_family(name, documentation, samples))
+        return lines
+
+    def _peer_metrics(self, snapshots: dict[str, PeerSnapshot | None], now: float) -> list[str]:
+        mode = self.settings.metrics_peer_mode.lower()
+        if mode == PEER_MODE_AGGREGATE:
+            return []
+        if mode not in (PEER_MODE_ALL, PEER_MODE_TOP):
+            logger.warning(f"Unknown metrics peer mode {mode}, exporting aggregates only")
+            return []
+
+        rx_samples: list[tuple[dict, float]] = []
+        tx_samples: list[tuple[dict, float]] = []
+        handshake_samples: list[tuple[dict, float]] = []
+        for protocol, snapshot in snapshots.items():
+            if snapshot is None:
+                continue
+            if mode == PEER_MODE_TOP:
+                limit = max(0, self.settings.metrics_peer_top_n)
+                peers, _ = snapshot.index.query(
+                    PeerQuery(sort=SORT_TRAFFIC, descending=True, limit=limit)
+                )
+            else:
+                peers = snapshot.peers
+
+            for peer in peers:
+                labels = {"protocol": protocol, "public_key": peer["public_key"]}
+                rx_samples.append((labels, int(peer.get("rx_bytes", 0))))
+                tx_samples.append((labels, int(peer.get("tx_bytes", 0))))
+                handshake = _handshake_timestamp(peer.get("last_handshake"))
+                if handshake is not None:
+                    handshake_samples.append((labels, max(0.0, round(now - handshake, 3))))
+
+        return [
+            *gauge_family("amnezia_peer_rx_bytes", "Bytes received from the peer", rx_samples),
+            *gauge_family("amnezia_peer_tx_bytes", "Bytes sent to the peer", tx_samples),
+            *gauge_family(
+                "amnezia_peer_handshake_age_seconds",
+                "Seconds since the latest handshake of the peer",
+                handshake_samples,
+            ),
+        ]
+
+
+def _handshake_timestamp(value: str | datetime | None) -> float | None:
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return value.timestamp()
+
+
+def get_metrics_service() -> MetricsService:
+    return MetricsService()
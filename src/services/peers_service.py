@@ -1,25 +1,58 @@
+import asyncio
+import gzip
+import json
+from dataclasses import dataclass
 from functools import lru_cache
 
 import httpx
 from datetime import datetime, timezone
 
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 from src.management.logger import configure_logger
 from src.management.settings import get_settings
 from src.management.security import get_api_key_storage
 from src.services.host_service import HostService
+from src.services.management.peer_snapshot import get_peer_snapshot_store
 from src.services.management.protocol_factory import (
-    create_protocol_service,
+    get_protocol_service,
     get_available_protocols,
     get_protocol_config,
 )
+from src.services.management.sync_spool import get_sync_spool
 
 
 logger = configure_logger("PeersService", "cyan")
 
 
+SYNC_COMPRESSION_NONE = "none"
+SYNC_COMPRESSION_GZIP = "gzip"
+SYNC_COMPRESSION_ZSTD = "zstd"
+
+
+@dataclass
+class SyncState:
+    version: int
+    peers: dict[str, dict] | None
+
+
 class PeersService:
     def __init__(self):
         self.settings = get_settings()
+        self._sync_states: dict[str, SyncState] = {}
+        self._sync_batch_supported = True
+        self.sync_spool = get_sync_spool()
+        if self.settings.sync_compression == SYNC_COMPRESSION_ZSTD and zstandard is None:
+            logger.warning("zstandard is not installed, sync payloads fall back to gzip")
         try:
             self.host_service = HostService()
         except Exception as exc:
@@ -28,7 +61,7 @@ class PeersService:
 
     def _get_service(self, protocol: str):
         try:
-            return create_protocol_service(protocol)
+            return get_protocol_service(protocol)
         except ValueError as exc:
             logger.error(str(exc))
             raise
@@ -46,9 +79,9 @@ class PeersService:
         service = self._get_service(protocol)
         return await service.delete_peer(public_key=public_key)
 
-    async def get_peers(self, protocol: str) -> list[dict]:
-        service = self._get_service(protocol)
-        return await service.get_peers()
+    async def get_peers(self, protocol: str, fresh: bool = False) -> list[dict]:
+        snapshot = await get_peer_snapshot_store(protocol).get(fresh=fresh)
+        return list(snapshot.peers)
 
     async def get_peer_status(self, protocol: str, public_key: str) -> dict:
         peer = await self._get_peer(protocol, public_key)
@@ -109,6 +142,7 @@ class PeersService:
         self,
         central_api_url: str | None = None,
         protocols: list[str] | None = None,
+        client: httpx.AsyncClient | None = None,
     ) -> int:
         sync_url = (central_api_url or self.settings.central_api_url or "").strip()
         sync_api_key = get_api_key_storage().get_api_key().strip()
@@ -118,31 +152,233 @@ class PeersService:
             return 0
 
         target_protocols = protocols or get_available_protocols()
-        payloads = []
-
-        for protocol in target_protocols:
-            snapshot = await self.get_status_snapshot(protocol)
-            snapshot["sync_timestamp"] = datetime.now(timezone.utc).isoformat()
-            payloads.append(snapshot)
-
-        if not payloads:
+        if not target_protocols:
             logger.debug("No protocols to sync")
             return 0
 
+        if client is None:
+            async with create_sync_client() as own_client:
+                return await self._sync_protocols(
+                    own_client, sync_url, sync_api_key, target_protocols
+                )
+        return await self._sync_protocols(client, sync_url, sync_api_key, target_protocols)
+
+    async def _sync_protocols(
+        self,
+        client: httpx.AsyncClient,
+        sync_url: str,
+        sync_api_key: str,
+        protocols: list[str],
+    ) -> int:
+        url = f"{sync_url.rstrip('/')}/clusters/sync"
         headers = {"X-API-Key": sync_api_key}
+        fan_out = asyncio.Semaphore(max(1, self.settings.sync_max_concurrency))
+
+        drain_error: Exception | None = None
+        if self.sync_spool.pending:
+            try:
+                await self._drain_sync_spool(client, url, headers)
+            except Exception as exc:
+                drain_error = exc
+
+        async def sync_protocol(protocol: str) -> None:
+            async with fan_out:
+                snapshot = await self.get_status_snapshot(protocol)
+                snapshot["sync_timestamp"] = datetime.now(timezone.utc).isoformat()
+                await self._send_sync_payload(client, url, headers, snapshot)
+
+        results = await asyncio.gather(
+            *(sync_protocol(protocol) for protocol in protocols),
+            return_exceptions=True,
+        )
+        failures = [
+            (protocol, result)
+            for protocol, result in zip(protocols, results)
+            if isinstance(result, Exception)
+        ]
+        for protocol, exc in failures:
+            logger.error(f"Sync failed for protocol {protocol}: {exc}")
+        if drain_error is not None:
+            logger.error(
+                f"Sync spool drain failed, {self.sync_spool.count} payload(s) pending: {drain_error}"
+            )
+            raise drain_error
+        if failures:
+            raise failures[0][1]
+
+        logger.debug(f"Synced peer status for {len(protocols)} protocol(s)")
+        return len(protocols)
+
+    async def _send_sync_payload(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: dict[str, str],
+        snapshot: dict,
+    ) -> None:
+        protocol = snapshot["protocol"]
+        state = self._sync_states.get(protocol)
+        base_version = state.version if state else self.sync_spool.last_version(protocol)
+        version = base_version + 1
+        peers = {peer["public_key"]: peer for peer in snapshot["peers"]}
+        full_payload = {**snapshot, "sync_mode": "full", "version": version}
+
+        payload = full_payload
+        if self.settings.sync_delta_enabled and state is not None and state.peers is not None:
+            payload = self._build_delta_payload(snapshot, state, peers, version)
+
+        if self.sync_spool.pending:
+            await self._spool_payload(protocol, payload, full_payload, peers, version)
+            return
+
+        try:
+            response = await self._post_sync_payload(client, url, headers, payload)
+            if payload is not full_payload and self._full_sync_requested(response, version):
+                logger.info(f"Central API requested a full snapshot for protocol {protocol}")
+                payload = full_payload
+                response = await self._post_sync_payload(client, url, headers, payload)
+        except httpx.TransportError:
+            await self._spool_payload(protocol, payload, full_payload, peers, version)
+            raise
 
-        sync_base_url = sync_url.rstrip("/")
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for payload in payloads:
-                response = await client.post(
-                    f"{sync_base_url}/clusters/sync",
-                    json=payload,
-                    headers=headers,
+        if response.status_code >= 500:
+            await self._spool_payload(protocol, payload, full_payload, peers, version)
+        response.raise_for_status()
+        self._sync_states[protocol] = SyncState(version=version, peers=peers)
+
+    async def _spool_payload(
+        self,
+        protocol: str,
+        payload: dict,
+        full_payload: dict,
+        peers: dict[str, dict],
+        version: int,
+    ) -> None:
+        if self.sync_spool.fits(payload):
+            await asyncio.to_thread(self.sync_spool.append, payload)
+        else:
+            await asyncio.to_thread(self.sync_spool.collapse, protocol, full_payload)
+        self._sync_states[protocol] = SyncState(version=version, peers=peers)
+
+    async def _drain_sync_spool(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: dict[str, str],
+    ) -> None:
+        batch_size = max(1, self.settings.sync_spool_batch_size)
+        drained = 0
+        while self.sync_spool.pending:
+            entries = await asyncio.to_thread(self.sync_spool.read, batch_size)
+            if not entries:
+                break
+
+            if self._sync_batch_supported:
+                response = await self._post_sync_payload(
+                    client,
+                    f"{url}/batch",
+                    headers,
+                    {"payloads": [entry.payload for entry in entries]},
                 )
+                if response.status_code in (404, 405):
+                    logger.info("Central API has no batch sync endpoint, draining one by one")
+                    self._sync_batch_supported = False
+                    continue
+                if self._full_sync_requested(response):
+                    await self._reset_sync_spool()
+                    return
                 response.raise_for_status()
+                await asyncio.to_thread(self.sync_spool.ack, entries[-1])
+                drained += len(entries)
+                continue
+
+            for entry in entries:
+                response = await self._post_sync_payload(client, url, headers, entry.payload)
+                if self._full_sync_requested(response, entry.payload.get("version")):
+                    await self._reset_sync_spool()
+                    return
+                response.raise_for_status()
+                await asyncio.to_thread(self.sync_spool.ack, entry)
+                drained += 1
+
+        if drained:
+            logger.info(f"Drained {drained} spooled sync payload(s)")
+
+    async def _reset_sync_spool(self) -> None:
+        logger.info(
+            f"Central API rejected {self.sync_spool.count} spooled payload(s), "
+            "sending full snapshots instead"
+        )
+        await asyncio.to_thread(self.sync_spool.clear)
+        for state in self._sync_states.values():
+            state.peers = None
+
+    async def _post_sync_payload(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: dict[str, str],
+        payload: dict,
+    ) -> httpx.Response:
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        body, encoding = self._compress(body)
+        request_headers = {**headers, "Content-Type": "application/json"}
+        if encoding:
+            request_headers["Content-Encoding"] = encoding
+        return await client.post(url, content=body, headers=request_headers)
 
-        logger.debug(f"Synced peer status for {len(payloads)} protocol(s)")
-        return len(payloads)
+    def _compress(self, body: bytes) -> tuple[bytes, str | None]:
+        compression = self.settings.sync_compression.strip().lower()
+        if compression == SYNC_COMPRESSION_ZSTD and zstandard is not None:
+            return zstandard.ZstdCompressor(level=3).compress(body), SYNC_COMPRESSION_ZSTD
+        if compression in (SYNC_COMPRESSION_GZIP, SYNC_COMPRESSION_ZSTD):
+            return gzip.compress(body, compresslevel=5), SYNC_COMPRESSION_GZIP
+        return body, None
+
+    def _build_delta_payload(
+        self,
+        snapshot: dict,
+        state: SyncState,
+        peers: dict[str, dict],
+        version: int,
+    ) -> dict:
+        previous = state.peers
+        added = [peer for key, peer in peers.items() if key not in previous]
+        changed = [
+            peer
+            for key, peer in peers.items()
+            if key in previous and previous[key] != peer
+        ]
+        removed = [key for key in previous if key not in peers]
+
+        payload = {key: value for key, value in snapshot.items() if key != "peers"}
+        payload.update(
+            {
+                "sync_mode": "delta",
+                "base_version": state.version,
+                "version": version,
+                "added": added,
+                "changed": changed,
+                "removed": removed,
+            }
+        )
+        return payload
+
+    def _full_sync_requested(self, response: httpx.Response, version: int | None = None) -> bool:
+        if response.status_code == 409:
+            return True
+        if not response.is_success:
+            return False
+        try:
+            body = response.json()
+        except ValueError:
+            return False
+        if not isinstance(body, dict):
+            return False
+        if body.get("full_sync_required"):
+            return True
+        acknowledged = body.get("version")
+        return version is not None and acknowledged is not None and acknowledged != version
 
     async def _get_peer(self, protocol: str, public_key: str) -> dict:
         peers = await self.get_peers(protocol)
@@ -159,6 +395,8 @@ class PeersService:
             "last_handshake": peer.get("last_handshake"),
             "rx_bytes": int(peer.get("rx_bytes", 0)),
             "tx_bytes": int(peer.get("tx_bytes", 0)),
+            "lifetime_rx_bytes": int(peer.get("lifetime_rx_bytes", peer.get("rx_bytes", 0))),
+            "lifetime_tx_bytes": int(peer.get("lifetime_tx_bytes", peer.get("tx_bytes", 0))),
             "online": bool(peer.get("online", False)),
             "persistent_keepalive": int(peer.get("persistent_keepalive", 0)),
         }
@@ -169,6 +407,12 @@ class PeersService:
         return {
             "total_rx_bytes": total_rx,
             "total_tx_bytes": total_tx,
+            "lifetime_rx_bytes": sum(
+                int(peer.get("lifetime_rx_bytes", peer.get("rx_bytes", 0))) for peer in peers
+            ),
+            "lifetime_tx_bytes": sum(
+                int(peer.get("lifetime_tx_bytes", peer.get("tx_bytes", 0))) for peer in peers
+            ),
             "total_peers": len(peers),
             "online_peers": sum(1 for peer in peers if peer.get("online", False)),
         }
@@ -183,6 +427,21 @@ class PeersService:
         is_running = await self.host_service.is_container_running(container_name)
         return container_name, "running" if is_running else "stopped"
 
+
+def create_sync_client() -> httpx.AsyncClient:
+    settings = get_settings()
+    connections = max(1, settings.sync_max_concurrency)
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        timeout=30.0,
+        limits=httpx.Limits(
+            max_connections=connections,
+            max_keepalive_connections=connections,
+            keepalive_expiry=settings.sync_interval_seconds + 30,
+        ),
+    )
+
+
 @lru_cache
 def get_peers_service() -> PeersService:
     return PeersService()
@@ -1,5 +1,9 @@
+import asyncio
+import shlex
+
 from src.management.logger import configure_logger
 from src.services.management.container_connection import ContainerConnection
+from src.services.management import wireguard_keys
 
 
 logger = configure_logger("AmneziaWG2Connection", "blue")
@@ -13,40 +17,81 @@ class AmneziaWG2Connection(ContainerConnection):
         if not self.config_path:
             raise ValueError(f"Protocol {protocol_name} does not define config_path")
 
+    @property
+    def config_file(self) -> str:
+        return f"{self.config_path}/{self.interface}.conf"
+
+    @property
+    def server_public_key_file(self) -> str:
+        return f"{self.config_path}/wireguard_server_public_key.key"
+
+    @property
+    def preshared_key_file(self) -> str:
+        return f"{self.config_path}/wireguard_psk.key"
+
     async def get_peers_dump(self) -> str:
-        stdout, _ = await self.run_command(f"wg show {self.interface} dump")
+        ((stdout, _),) = await self.run_read_commands([self.dump_command()])
         return stdout
 
     async def sync_config(self) -> None:
-        config_file = f"{self.config_path}/{self.interface}.conf"
-        cmd = f"wg-quick strip {config_file} | wg syncconf {self.interface} /dev/stdin"
-        await self.run_command(cmd)
+        await self.run_command(self._sync_command())
         logger.info(f"WireGuard config synchronized for {self.interface}")
 
     async def read_protocol_config(self) -> str:
-        config_file = f"{self.config_path}/{self.interface}.conf"
-        return await self.read_file(config_file)
-
-    async def write_protocol_config(self, content: str) -> None:
-        config_file = f"{self.config_path}/{self.interface}.conf"
-        await self.write_file(config_file, content)
-        logger.info(f"WireGuard config written to {config_file}")
+        return await self.read_file(self.config_file)
+
+    async def write_protocol_config(self, content: str) -> str:
+        fingerprint = await self.write_file(self.config_file, content)
+        logger.info(f"WireGuard config written to {self.config_file}")
+        return fingerprint
+
+    async def apply_protocol_config(self, content: str) -> str:
+        fingerprint = await self.write_file_with_commands(
+            self.config_file,
+            content,
+            [self._sync_command()],
+        )
+        logger.info(
+            f"WireGuard config written to {self.config_file} "
+            f"and synchronized for {self.interface}"
+        )
+        return fingerprint
+
+    async def apply_peer_changes(
+        self,
+        content: str,
+        added_peers: list[dict] | None = None,
+        removed_public_keys: list[str] | None = None,
+    ) -> str:
+        commands = []
+        peers_command = self._set_peers_command(added_peers or [], removed_public_keys or [])
+        if peers_command:
+            commands.append(peers_command)
+
+        fingerprint = await self.write_file_with_commands(self.config_file, content, commands)
+        logger.info(
+            f"WireGuard config written to {self.config_file}, runtime updated for "
+            f"{len(added_peers or [])} added and {len(removed_public_keys or [])} removed peer(s)"
+        )
+        return fingerprint
 
     async def generate_private_key(self) -> str:
-        stdout, _ = await self.run_command("wg genkey")
-        return stdout
+        return wireguard_keys.generate_private_key()
 
     async def generate_public_key(self, private_key: str) -> str:
-        stdout, _ = await self.run_command(f"echo '{private_key}' | wg pubkey")
-        return stdout
+        return wireguard_keys.derive_public_key(private_key)
+
+    async def generate_preshared_key(self) -> str:
+        return wireguard_keys.generate_preshared_key()
+
+    async def generate_peer_keys(self, count: int) -> list[tuple[str, str, str]]:
+        return await asyncio.to_thread(self._generate_peer_keys, count)
 
     async def read_server_public_key(self) -> str:
-        key_file = f"{self.config_path}/wireguard_server_public_key.key"
-        return await self.read_file(key_file)
+        return await self.read_file(self.server_public_key_file)
 
     async def read_preshared_key(self) -> str:
-        key_file = f"{self.config_path}/wireguard_psk.key"
-        return await self.read_file(key_file)
+        return await self.read_file(self.preshared_key_file)
 
     async def get_wg_dump(self) -> str:
         return await self.get_peers_dump()
@@ -57,5 +102,59 @@ class AmneziaWG2Connection(ContainerConnection):
     async def read_wg_config(self) -> str:
         return await self.read_protocol_config()
 
-    async def write_wg_config(self, content: str) -> None:
-        await self.write_protocol_config(content)
+    async def write_wg_config(self, content: str) -> str:
+        return await self.write_protocol_config(content)
+
+    @staticmethod
+    def _generate_peer_keys(count: int) -> list[tuple[str, str, str]]:
+        keys = []
+        for _ in range(count):
+            private_key, public_key = wireguard_keys.generate_keypair()
+            keys.append((private_key, public_key, wireguard_keys.generate_preshared_key()))
+        return keys
+
+    def dump_command(self) -> str:
+        return f"wg show {shlex.quote(self.interface)} dump"
+
+    def _sync_command(self) -> str:
+        return (
+            f"wg-quick strip {shlex.quote(self.config_file)} | "
+            f"wg syncconf {shlex.quote(self.interface)} /dev/stdin"
+        )
+
+    def _set_peers_command(
+        self,
+        added_peers: list[dict],
+        removed_public_keys: list[str],
+    ) -> str | None:
+        if not added_peers and not removed_public_keys:
+            return None
+
+        arguments = [f"peer {shlex.quote(public_key)} remove" for public_key in removed_public_keys]
+        psk_lines = []
+        for index, peer in enumerate(added_peers):
+            peer_arguments = [f"peer {shlex.quote(peer['public_key'])}"]
+            if peer.get("preshared_key"):
+                peer_arguments.append(f'preshared-key "$psk_dir/{index}"')
+                psk_lines.append(
+                    f"printf '%s\\n' {shlex.quote(peer['preshared_key'])} > \"$psk_dir/{index}\""
+                )
+            allowed_ips = peer["allowed_ips"].replace(" ", "")
+            peer_arguments.append(f"allowed-ips {shlex.quote(allowed_ips)}")
+            arguments.append(" ".join(peer_arguments))
+
+        set_command = f"wg set {shlex.quote(self.interface)} {' '.join(arguments)}"
+        if not psk_lines:
+            return set_command
+
+        return "\n".join(
+            [
+                "umask 077",
+                'psk_dir="$(mktemp -d)" || exit 1',
+                *psk_lines,
+                set_command,
+                "rc=$?",
+                'rm -rf "$psk_dir"',
+                "exit $rc",
+            ]
+        )
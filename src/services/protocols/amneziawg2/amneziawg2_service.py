@@ -1,10 +1,22 @@
 import ipaddress
 import re
+from contextlib import suppress
 from datetime import datetime
 
 from src.management.logger import configure_logger
+from src.management.metrics import CONFIG_OPERATION_SECONDS
 from src.management.settings import get_settings
 from src.services.management.base_protocol_service import BaseProtocolService
+from src.services.management.file_cache import CachedFile, FileCache
+from src.services.management.ip_allocator import IPAllocator
+from src.services.management.mutation_queue import (
+    MUTATION_ADD,
+    MUTATION_REMOVE,
+    MutationQueue,
+    PeerMutation,
+)
+from src.services.management.peer_snapshot import get_peer_snapshot_store
+from src.services.management.wireguard_config import ConfigSection, WireGuardConfig
 from src.services.protocols.amneziawg2.amneziawg2_config_generator import (
     AmneziaWG2ConfigGenerator,
 )
@@ -14,6 +26,14 @@ from src.services.protocols.amneziawg2.amneziawg2_connection import AmneziaWG2Co
 logger = configure_logger("AmneziaWG2Service", "green")
 
 
+AWG_PARAM_KEYS = (
+    "H1", "H2", "H3", "H4",
+    "I1", "I2", "I3", "I4", "I5",
+    "Jc", "Jmin", "Jmax",
+    "S1", "S2", "S3", "S4",
+)
+
+
 class AmneziaWG2Service(BaseProtocolService):
     AMNEZIA_VPN_APP_TYPE = "amnezia_vpn"
     AMNEZIA_WG_APP_TYPE = "amnezia_wg"
@@ -55,6 +75,17 @@ class AmneziaWG2Service(BaseProtocolService):
         self.config_generator = AmneziaWG2ConfigGenerator()
         self._awg_params_defaults = dict(self.protocol_config.get("awg_junk_params", {}))
         self._default_app_type = self._resolve_default_app_type()
+        self._file_cache = FileCache(self.settings.config_cache_validate_interval_seconds)
+        self._mutation_queue = MutationQueue(
+            protocol_name,
+            self._apply_mutations,
+            window_seconds=self.settings.mutation_batch_window_ms / 1000,
+            max_batch_size=self.settings.mutation_batch_max_size,
+        )
+        self._ip_allocator = IPAllocator(
+            self.protocol_config.get("reserved_ips", []),
+            cooldown_seconds=self.settings.ip_reuse_cooldown_seconds,
+        )
 
     @property
     def protocol_name(self) -> str:
@@ -65,17 +96,16 @@ class AmneziaWG2Service(BaseProtocolService):
         return self._connection
 
     async def get_peers(self) -> list[dict]:
-        dump_output = await self.connection.get_peers_dump()
+        files, dump_output = await self._load_state(with_dump=True)
         peers_data = self._parse_wg_dump(dump_output)
-        wg_config = await self.connection.read_protocol_config()
-        app_types_by_public_key = self._extract_peer_app_types(wg_config)
+        wg_config = self._get_config_model(files["config"])
 
         peers = []
         for public_key, data in peers_data.items():
             peers.append(
                 {
                     "public_key": public_key,
-                    "app_type": app_types_by_public_key.get(public_key, self._default_app_type),
+                    "app_type": self._get_peer_app_type(wg_config, public_key),
                     "endpoint": data["endpoint"],
                     "allowed_ips": data["allowed_ips"],
                     "last_handshake": (
@@ -100,145 +130,484 @@ class AmneziaWG2Service(BaseProtocolService):
         normalized_app_type = self._normalize_app_type(app_type)
         private_key = await self.connection.generate_private_key()
         public_key = await self.connection.generate_public_key(private_key)
+        psk = await self.connection.generate_preshared_key()
+
+        allocated_ip = await self._mutation_queue.submit(
+            PeerMutation(
+                kind=MUTATION_ADD,
+                public_key=public_key,
+                preshared_key=psk,
+                allowed_ip=allocated_ip,
+                app_type=normalized_app_type,
+            )
+        )
 
-        if not allocated_ip:
-            allocated_ip = await self._allocate_ip_address()
-        if "/" not in allocated_ip:
-            allocated_ip = f"{allocated_ip}/32"
-
-        server_port = await self._get_server_port()
-        endpoint = f"{self.settings.server_public_host}:{server_port}"
-
-        await self._add_peer_to_config(public_key, allocated_ip, normalized_app_type)
-        await self.connection.sync_config()
-
-        config_payload = await self._generate_config_payload(
+        result = await self._build_peer_result(
             app_type=normalized_app_type,
             private_key=private_key,
             public_key=public_key,
-            allowed_ip=allocated_ip,
-            server_port=server_port,
+            psk=psk,
+            allocated_ip=allocated_ip,
         )
 
-        logger.info(f"Peer created for protocol {self.protocol_name} with IP {allocated_ip}")
+        logger.info(
+            f"Peer created for protocol {self.protocol_name} with IP {result['allocated_ip']}"
+        )
+        return result
+
+    async def create_peers(self, items: list[dict]) -> list[dict | Exception]:
+        results: list[dict | Exception | None] = [None] * len(items)
+        pending: list[tuple[int, str, str | None]] = []
+        for index, item in enumerate(items):
+            try:
+                normalized_app_type = self._normalize_app_type(item["app_type"])
+            except ValueError as exc:
+                results[index] = exc
+                continue
+            pending.append((index, normalized_app_type, item.get("allocated_ip")))
+
+        if any(allocated_ip for _, _, allocated_ip in pending):
+            files, _ = await self._load_state()
+            interface = self._get_interface(files["config"])
+            for index, _, allocated_ip in pending:
+                if allocated_ip:
+                    try:
+                        self._normalize_fixed_ip(allocated_ip, interface)
+                    except ValueError as exc:
+                        raise ValueError(f"Peer {index}: {exc}") from None
+
+        keys = await self.connection.generate_peer_keys(len(pending))
+        mutations = [
+            PeerMutation(
+                kind=MUTATION_ADD,
+                public_key=public_key,
+                preshared_key=psk,
+                allowed_ip=allocated_ip,
+                app_type=app_type,
+            )
+            for (_, app_type, allocated_ip), (_, public_key, psk) in zip(pending, keys)
+        ]
+        allocated_ips = await self._mutation_queue.submit_many(mutations)
+
+        files = None
+        for (index, app_type, _), (private_key, public_key, psk), allocated_ip in zip(
+            pending, keys, allocated_ips
+        ):
+            if isinstance(allocated_ip, Exception):
+                results[index] = allocated_ip
+                continue
+            if files is None:
+                files, _ = await self._load_state(with_server_public_key=True)
+            results[index] = self._render_peer_result(
+                files,
+                app_type=app_type,
+                private_key=private_key,
+                public_key=public_key,
+                psk=psk,
+                allocated_ip=allocated_ip,
+            )
 
-        return {
-            "protocol": self.protocol_name,
-            "app_type": normalized_app_type,
-            "config": config_payload["config"],
-            "public_key": public_key,
-            "private_key": private_key,
-            "allocated_ip": allocated_ip,
-            "endpoint": endpoint,
-        }
+        created = sum(1 for result in results if isinstance(result, dict))
+        logger.info(
+            f"Batch created {created} of {len(items)} peer(s) for protocol {self.protocol_name}"
+        )
+        return results
 
-    async def delete_peer(self, public_key: str) -> bool:
-        wg_config = await self.connection.read_protocol_config()
-        updated_config = self._remove_peer_from_raw_config(wg_config, public_key)
+    async def update_peer(self, public_key: str, app_type: str) -> dict | None:
+        normalized_app_type = self._normalize_app_type(app_type)
+        private_key = await self.connection.generate_private_key()
+        new_public_key = await self.connection.generate_public_key(private_key)
+        psk = await self.connection.generate_preshared_key()
+
+        allocated_ip = await self._mutation_queue.submit(
+            PeerMutation(
+                kind=MUTATION_ADD,
+                public_key=new_public_key,
+                preshared_key=psk,
+                app_type=normalized_app_type,
+                replaces=public_key,
+            )
+        )
+        if allocated_ip is None:
+            return None
+
+        result = await self._build_peer_result(
+            app_type=normalized_app_type,
+            private_key=private_key,
+            public_key=new_public_key,
+            psk=psk,
+            allocated_ip=allocated_ip,
+        )
 
-        if updated_config == wg_config:
-            return False
+        logger.info(
+            f"Peer {public_key} recreated for protocol {self.protocol_name} "
+            f"as {result['public_key']} with IP {result['allocated_ip']}"
+        )
+        return {"old_public_key": public_key, **result}
 
-        await self.connection.write_protocol_config(updated_config)
-        await self.connection.sync_config()
-        logger.info(f"Peer {public_key} deleted from protocol {self.protocol_name}")
-        return True
+    async def delete_peer(self, public_key: str) -> bool:
+        deleted = await self._mutation_queue.submit(
+            PeerMutation(kind=MUTATION_REMOVE, public_key=public_key)
+        )
+        if deleted:
+            logger.info(f"Peer {public_key} deleted from protocol {self.protocol_name}")
+        return deleted
+
+    async def delete_peers(self, public_keys: list[str]) -> dict[str, list[str]]:
+        public_keys = list(dict.fromkeys(public_keys))
+        results = await self._mutation_queue.submit_many(
+            [PeerMutation(kind=MUTATION_REMOVE, public_key=key) for key in public_keys]
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+        deleted = [key for key, result in zip(public_keys, results) if result]
+        missing = [key for key, result in zip(public_keys, results) if not result]
+        logger.info(
+            f"Batch deleted {len(deleted)} peer(s) from protocol {self.protocol_name}, "
+            f"{len(missing)} not found"
+        )
+        return {"deleted": deleted, "missing": missing}
 
     async def add_peer_to_config(self, public_key: str, allowed_ip: str) -> None:
-        await self._add_peer_to_config(public_key, allowed_ip, self._default_app_type)
+        files, _ = await self._load_state(with_preshared_key=True)
+        await self._mutation_queue.submit(
+            PeerMutation(
+                kind=MUTATION_ADD,
+                public_key=public_key,
+                preshared_key=files["preshared_key"].content,
+                allowed_ip=allowed_ip,
+                app_type=self._default_app_type,
+            )
+        )
 
     async def remove_peer_from_config(self, public_key: str) -> bool:
         return await self.delete_peer(public_key)
 
-    async def _add_peer_to_config(self, public_key: str, allowed_ip: str, app_type: str) -> None:
-        wg_config = await self.connection.read_protocol_config()
-        psk = await self.connection.read_preshared_key()
-        peer_section = (
-            f"\n[Peer]\n"
-            f"# {self.APP_TYPE_METADATA_KEY} = {app_type}\n"
-            f"PublicKey = {public_key}\n"
-            f"PresharedKey = {psk}\n"
-            f"AllowedIPs = {allowed_ip}\n"
+    async def reconcile_runtime(self) -> None:
+        with CONFIG_OPERATION_SECONDS.time(protocol=self.protocol_name, operation="sync"):
+            await self._mutation_queue.run_exclusive(self.connection.sync_config)
+
+    async def close(self) -> None:
+        await self._mutation_queue.close()
+
+    async def _load_state(
+        self,
+        with_dump: bool = False,
+        with_server_public_key: bool = False,
+        with_preshared_key: bool = False,
+    ) -> tuple[dict[str, CachedFile], str | None]:
+        files = {"config": self.connection.config_file}
+        if with_server_public_key:
+            files["server_public_key"] = self.connection.server_public_key_file
+        if with_preshared_key:
+            files["preshared_key"] = self.connection.preshared_key_file
+
+        commands = {}
+        if with_dump:
+            commands["dump"] = self.connection.dump_command()
+
+        with CONFIG_OPERATION_SECONDS.time(protocol=self.protocol_name, operation="read"):
+            cached_files, outputs = await self._file_cache.read(self.connection, files, commands)
+        return cached_files, outputs.get("dump")
+
+    async def _apply_mutations(self, mutations: list[PeerMutation]) -> list:
+        files, _ = await self._load_state(with_server_public_key=True)
+        config_entry = files["config"]
+        wg_config = self._get_config_model(config_entry)
+        interface = self._get_interface(config_entry)
+        allocator = self._get_ip_allocator(config_entry, wg_config, interface)
+
+        results: list = []
+        changed: list[int] = []
+        added_peers: list[dict] = []
+        removed_public_keys: list[str] = []
+        released: list[ipaddress.IPv4Address] = []
+        claim_errors, assigned = self._claim_fixed_ips(
+            mutations, wg_config, interface, allocator
         )
-        await self.connection.write_protocol_config(wg_config + peer_section)
 
-    def _remove_peer_from_raw_config(self, config: str, public_key: str) -> str:
-        peer_section_pattern = re.compile(
-            r"(?ms)^\s*\[Peer\]\s*$.*?(?=^\s*\[[^\]]+\]\s*$|\Z)"
+        for index, mutation in enumerate(mutations):
+            try:
+                if mutation.kind == MUTATION_REMOVE:
+                    peer = wg_config.get_peer(mutation.public_key)
+                    removed = wg_config.remove_peer(mutation.public_key)
+                    if removed:
+                        for address in self._peer_addresses(peer):
+                            allocator.release(address)
+                            released.append(address)
+                        removed_public_keys.append(mutation.public_key)
+                        changed.append(index)
+                    results.append(removed)
+                    continue
+
+                if wg_config.has_peer(mutation.public_key):
+                    raise ValueError(f"Peer {mutation.public_key} already exists")
+                if index in claim_errors:
+                    raise claim_errors[index]
+
+                allowed_ip = mutation.allowed_ip
+                if mutation.replaces:
+                    old_peer = wg_config.get_peer(mutation.replaces)
+                    if old_peer is None:
+                        results.append(None)
+                        continue
+                    old_allowed_ips = self._split_allowed_ips(old_peer.get("AllowedIPs"))
+                    allowed_ip = old_allowed_ips[0] if old_allowed_ips else None
+
+                if not allowed_ip:
+                    allowed_ip = self._allocate_ip_address(interface, allocator)
+                    assigned[index] = ipaddress.IPv4Address(allowed_ip.split("/", 1)[0])
+                if "/" not in allowed_ip:
+                    allowed_ip = f"{allowed_ip}/32"
+
+                if mutation.replaces:
+                    wg_config.remove_peer(mutation.replaces)
+                    removed_public_keys.append(mutation.replaces)
+
+                self._add_peer_section(
+                    wg_config,
+                    mutation.public_key,
+                    allowed_ip,
+                    mutation.app_type or self._default_app_type,
+                    mutation.preshared_key,
+                )
+                added_peers.append(
+                    {
+                        "public_key": mutation.public_key,
+                        "preshared_key": mutation.preshared_key,
+                        "allowed_ips": allowed_ip,
+                    }
+                )
+                changed.append(index)
+                results.append(allowed_ip)
+            except Exception as exc:
+                if index in assigned:
+                    allocator.release(assigned.pop(index), cool_down=False)
+                results.append(exc)
+
+        if changed:
+            try:
+                await self._apply_config(
+                    config_entry,
+                    wg_config,
+                    added_peers=added_peers,
+                    removed_public_keys=removed_public_keys,
+                )
+            except Exception as exc:
+                for address in assigned.values():
+                    allocator.release(address, cool_down=False)
+                for address in released:
+                    with suppress(ValueError):
+                        allocator.claim(address)
+                for index in changed:
+                    results[index] = exc
+
+        return results
+
+    async def _apply_config(
+        self,
+        config_entry: CachedFile,
+        wg_config: WireGuardConfig,
+        added_peers: list[dict] | None = None,
+        removed_public_keys: list[str] | None = None,
+    ) -> None:
+        config_file = self.connection.config_file
+        content = wg_config.serialize()
+        try:
+            with CONFIG_OPERATION_SECONDS.time(protocol=self.protocol_name, operation="write"):
+                fingerprint = await self.connection.apply_peer_changes(
+                    content,
+                    added_peers=added_peers,
+                    removed_public_keys=removed_public_keys,
+                )
+        except Exception:
+            self._file_cache.invalidate(config_file)
+            raise
+
+        entry = self._file_cache.store(
+            config_file,
+            content,
+            fingerprint,
+            derived={
+                "model": wg_config,
+                "interface": self._get_interface(config_entry),
+            },
         )
+        self._ip_allocator.source = entry.digest
+        get_peer_snapshot_store(self.protocol_name).mark_stale()
 
-        result_parts: list[str] = []
-        last_index = 0
-        removed_any = False
+    async def _build_peer_result(
+        self,
+        app_type: str,
+        private_key: str,
+        public_key: str,
+        psk: str,
+        allocated_ip: str,
+    ) -> dict:
+        files, _ = await self._load_state(with_server_public_key=True)
+        return self._render_peer_result(
+            files,
+            app_type=app_type,
+            private_key=private_key,
+            public_key=public_key,
+            psk=psk,
+            allocated_ip=allocated_ip,
+        )
 
-        for match in peer_section_pattern.finditer(config):
-            section = match.group(0)
-            key_match = re.search(
-                r"^\s*PublicKey\s*=\s*(\S+)\s*$",
-                section,
-                flags=re.MULTILINE,
-            )
-            if not key_match or key_match.group(1).strip() != public_key:
-                continue
+    def _render_peer_result(
+        self,
+        files: dict[str, CachedFile],
+        app_type: str,
+        private_key: str,
+        public_key: str,
+        psk: str,
+        allocated_ip: str,
+    ) -> dict:
+        interface = self._get_interface(files["config"])
+        server_port = self._get_server_port(interface)
+        endpoint = f"{self.settings.server_public_host}:{server_port}"
 
-            result_parts.append(config[last_index:match.start()])
-            last_index = match.end()
-            removed_any = True
+        config_payload = self._generate_config_payload(
+            app_type=app_type,
+            private_key=private_key,
+            public_key=public_key,
+            allowed_ip=allocated_ip,
+            server_port=server_port,
+            interface=interface,
+            server_public_key=files["server_public_key"].content,
+            psk=psk,
+        )
 
-        if not removed_any:
-            return config
+        return {
+            "protocol": self.protocol_name,
+            "app_type": app_type,
+            "config": config_payload["config"],
+            "public_key": public_key,
+            "private_key": private_key,
+            "allocated_ip": allocated_ip,
+            "endpoint": endpoint,
+        }
 
-        result_parts.append(config[last_index:])
-        return "".join(result_parts)
+    def _add_peer_section(
+        self,
+        wg_config: WireGuardConfig,
+        public_key: str,
+        allowed_ip: str,
+        app_type: str,
+        psk: str | None,
+    ) -> None:
+        values = {"PresharedKey": psk} if psk else {}
+        values["AllowedIPs"] = allowed_ip
+        wg_config.add_peer(
+            public_key,
+            values,
+            metadata={self.APP_TYPE_METADATA_KEY: app_type},
+        )
 
-    async def _allocate_ip_address(self) -> str:
-        wg_config = await self.connection.read_protocol_config()
-        subnet_match = re.search(r"Address\s*=\s*([\d\.]+/\d+)", wg_config)
-        if not subnet_match:
+    def _get_ip_allocator(
+        self,
+        config_entry: CachedFile,
+        wg_config: WireGuardConfig,
+        interface: dict,
+    ) -> IPAllocator:
+        allocator = self._ip_allocator
+        if not interface["address"]:
+            return allocator
+
+        network = ipaddress.IPv4Network(interface["address"], strict=False)
+        if allocator.source != config_entry.digest or allocator.network != network:
+            allocator.rebuild(network, self._collect_used_ips(wg_config), config_entry.digest)
+        return allocator
+
+    def _claim_fixed_ips(
+        self,
+        mutations: list[PeerMutation],
+        wg_config: WireGuardConfig,
+        interface: dict,
+        allocator: IPAllocator,
+    ) -> tuple[dict[int, Exception], dict[int, ipaddress.IPv4Address]]:
+        errors: dict[int, Exception] = {}
+        claimed: dict[int, ipaddress.IPv4Address] = {}
+        for index, mutation in enumerate(mutations):
+            if (
+                mutation.kind != MUTATION_ADD
+                or not mutation.allowed_ip
+                or mutation.replaces
+                or wg_config.has_peer(mutation.public_key)
+            ):
+                continue
+            try:
+                mutation.allowed_ip = self._normalize_fixed_ip(mutation.allowed_ip, interface)
+                address = ipaddress.IPv4Interface(mutation.allowed_ip).ip
+                allocator.claim(address)
+                claimed[index] = address
+            except ValueError as exc:
+                errors[index] = exc
+        return errors, claimed
+
+    @staticmethod
+    def _normalize_fixed_ip(value: str, interface: dict) -> str:
+        if not interface["address"]:
             raise ValueError("Could not find subnet in protocol config")
+        try:
+            address = ipaddress.IPv4Interface(value)
+        except ValueError:
+            raise ValueError(f"Invalid IP address: {value!r}") from None
+        if address.network.prefixlen != 32:
+            raise ValueError(f"Fixed IP address must be a single /32 address: {value!r}")
+
+        network = ipaddress.IPv4Network(interface["address"], strict=False)
+        if address.ip not in network:
+            raise ValueError(f"IP address {address.ip} is outside of subnet {network}")
+        return str(address)
+
+    def _collect_used_ips(self, wg_config: WireGuardConfig) -> list[ipaddress.IPv4Address]:
+        used_ips = []
+        for _, section in wg_config.peers():
+            used_ips.extend(self._peer_addresses(section))
+        return used_ips
+
+    def _peer_addresses(self, section: ConfigSection | None) -> list[ipaddress.IPv4Address]:
+        addresses = []
+        if section is None:
+            return addresses
+        for allowed_ip in self._split_allowed_ips(section.get("AllowedIPs")):
+            try:
+                addresses.append(ipaddress.IPv4Address(allowed_ip.split("/", 1)[0]))
+            except ValueError:
+                continue
+        return addresses
 
-        network = ipaddress.IPv4Network(subnet_match.group(1), strict=False)
-        used_ips = set()
-
-        dump_output = await self.connection.get_peers_dump()
-        peers = self._parse_wg_dump(dump_output)
-        for peer in peers.values():
-            for allowed_ip in peer["allowed_ips"]:
-                if "/" in allowed_ip:
-                    used_ips.add(ipaddress.IPv4Address(allowed_ip.split("/", 1)[0]))
-
-        for ip in network.hosts():
-            if ip not in used_ips and ip != network.network_address + 1:
-                return f"{ip}/32"
+    @staticmethod
+    def _split_allowed_ips(value: str | None) -> list[str]:
+        return [ip.strip() for ip in (value or "").split(",") if ip.strip()]
 
-        raise ValueError("No available IP addresses in subnet")
+    def _allocate_ip_address(self, interface: dict, allocator: IPAllocator) -> str:
+        if not interface["address"]:
+            raise ValueError("Could not find subnet in protocol config")
+        return f"{allocator.allocate()}/32"
 
-    async def _get_server_port(self) -> int:
-        wg_config = await self.connection.read_protocol_config()
-        match = re.search(
-            r"\[Interface\][\s\S]*?ListenPort\s*=\s*(\d+)",
-            wg_config,
-            re.IGNORECASE,
-        )
-        if not match:
+    def _get_server_port(self, interface: dict) -> int:
+        if interface["listen_port"] is None:
             raise ValueError("ListenPort not found in protocol config")
-        return int(match.group(1))
+        return interface["listen_port"]
 
-    async def _generate_config_uri(
+    def _generate_config_uri(
         self,
         private_key: str,
         public_key: str,
         allowed_ip: str,
         server_port: int,
+        interface: dict,
+        server_public_key: str,
+        psk: str,
     ) -> str:
-        server_public_key = await self.connection.read_server_public_key()
-        psk = await self.connection.read_preshared_key()
-        wg_config = await self.connection.read_protocol_config()
-        awg_params = self._extract_awg_params(wg_config)
-
-        subnet_match = re.search(r"Address\s*=\s*([\d\.]+)/\d+", wg_config)
-        if subnet_match:
-            subnet_base = subnet_match.group(1).rsplit(".", 1)[0]
+        awg_params = interface["awg_params"]
+
+        if interface["address"]:
+            subnet_base = interface["address"].split("/", 1)[0].rsplit(".", 1)[0]
             subnet_address = f"{subnet_base}.0"
         else:
             subnet_address = self.protocol_config.get("default_subnet_address", "10.8.1.0")
@@ -265,16 +634,16 @@ class AmneziaWG2Service(BaseProtocolService):
         self.config_generator.decode_vpn_link(config_uri)
         return config_uri
 
-    async def _generate_text_config(
+    def _generate_text_config(
         self,
         private_key: str,
         allowed_ip: str,
         server_port: int,
+        interface: dict,
+        server_public_key: str,
+        psk: str,
     ) -> str:
-        server_public_key = await self.connection.read_server_public_key()
-        psk = await self.connection.read_preshared_key()
-        wg_config = await self.connection.read_protocol_config()
-        awg_params = self._extract_awg_params(wg_config)
+        awg_params = interface["awg_params"]
         endpoint_line = f"Endpoint = {self.settings.server_public_host}:{server_port}\n"
 
         return self.AMNEZIAWG_CLIENT_TEMPLATE.format(
@@ -304,64 +673,100 @@ class AmneziaWG2Service(BaseProtocolService):
             KEEPALIVE=str(self.settings.persistent_keepalive_seconds),
         )
 
-    async def _generate_config_payload(
+    def _generate_config_payload(
         self,
         app_type: str,
         private_key: str,
         public_key: str,
         allowed_ip: str,
         server_port: int,
+        interface: dict,
+        server_public_key: str,
+        psk: str,
     ) -> dict:
         if app_type == self.AMNEZIA_VPN_APP_TYPE:
             return {
                 "type": self.AMNEZIA_VPN_APP_TYPE,
-                "config": await self._generate_config_uri(
+                "config": self._generate_config_uri(
                     private_key=private_key,
                     public_key=public_key,
                     allowed_ip=allowed_ip,
                     server_port=server_port,
+                    interface=interface,
+                    server_public_key=server_public_key,
+                    psk=psk,
                 ),
             }
 
         if app_type == self.AMNEZIA_WG_APP_TYPE:
             return {
                 "type": self.AMNEZIA_WG_APP_TYPE,
-                "config": await self._generate_text_config(
+                "config": self._generate_text_config(
                     private_key=private_key,
                     allowed_ip=allowed_ip,
                     server_port=server_port,
+                    interface=interface,
+                    server_public_key=server_public_key,
+                    psk=psk,
                 ),
             }
 
         raise ValueError(f"Unsupported app_type: {app_type}")
 
-    def _extract_awg_params(self, wg_config: str) -> dict:
-        params = self._awg_params_defaults.copy()
-        param_mapping = {
-            "H1": r"^[ \t]*#?[ \t]*H1[ \t]*=[ \t]*([^#\n]*)",
-            "H2": r"^[ \t]*#?[ \t]*H2[ \t]*=[ \t]*([^#\n]*)",
-            "H3": r"^[ \t]*#?[ \t]*H3[ \t]*=[ \t]*([^#\n]*)",
-            "H4": r"^[ \t]*#?[ \t]*H4[ \t]*=[ \t]*([^#\n]*)",
-            "I1": r"^[ \t]*#?[ \t]*I1[ \t]*=[ \t]*([^#\n]*)",
-            "I2": r"^[ \t]*#?[ \t]*I2[ \t]*=[ \t]*([^#\n]*)",
-            "I3": r"^[ \t]*#?[ \t]*I3[ \t]*=[ \t]*([^#\n]*)",
-            "I4": r"^[ \t]*#?[ \t]*I4[ \t]*=[ \t]*([^#\n]*)",
-            "I5": r"^[ \t]*#?[ \t]*I5[ \t]*=[ \t]*([^#\n]*)",
-            "Jc": r"^[ \t]*#?[ \t]*Jc[ \t]*=[ \t]*([^#\n]*)",
-            "Jmin": r"^[ \t]*#?[ \t]*Jmin[ \t]*=[ \t]*([^#\n]*)",
-            "Jmax": r"^[ \t]*#?[ \t]*Jmax[ \t]*=[ \t]*([^#\n]*)",
-            "S1": r"^[ \t]*#?[ \t]*S1[ \t]*=[ \t]*([^#\n]*)",
-            "S2": r"^[ \t]*#?[ \t]*S2[ \t]*=[ \t]*([^#\n]*)",
-            "S3": r"^[ \t]*#?[ \t]*S3[ \t]*=[ \t]*([^#\n]*)",
-            "S4": r"^[ \t]*#?[ \t]*S4[ \t]*=[ \t]*([^#\n]*)",
-        }
+    def _get_config_model(self, config_entry: CachedFile) -> WireGuardConfig:
+        wg_config = config_entry.derived.get("model")
+        if wg_config is None:
+            wg_config = WireGuardConfig.parse(config_entry.content)
+            config_entry.derived["model"] = wg_config
+        return wg_config
+
+    def _get_interface(self, config_entry: CachedFile) -> dict:
+        interface = config_entry.derived.get("interface")
+        if interface is None:
+            interface = self._parse_interface(self._get_config_model(config_entry))
+            config_entry.derived["interface"] = interface
+        return interface
+
+    def _parse_interface(self, wg_config: WireGuardConfig) -> dict:
+        awg_params = self._awg_params_defaults.copy()
+        found_awg_params: set[str] = set()
+        address = None
+        listen_port = None
+
+        section = wg_config.interface
+        for line in section.lines if section is not None else []:
+            param_match = re.match(r"^[ \t]*#?[ \t]*(\w+)[ \t]*=[ \t]*([^#\n]*)", line)
+            if not param_match:
+                continue
 
-        for key, pattern in param_mapping.items():
-            match = re.search(pattern, wg_config, flags=re.MULTILINE)
-            if match:
-                params[key] = match.group(1).strip()
+            key, value = param_match.group(1), param_match.group(2).strip()
+            if key in AWG_PARAM_KEYS and key not in found_awg_params:
+                awg_params[key] = value
+                found_awg_params.add(key)
+            elif line.lstrip().startswith("#"):
+                continue
+            elif key.lower() == "address" and address is None:
+                address_match = re.match(r"([\d\.]+/\d+)", value)
+                if address_match:
+                    address = address_match.group(1)
+            elif key.lower() == "listenport" and listen_port is None and value.isdigit():
+                listen_port = int(value)
 
-        return params
+        return {
+            "address": address,
+            "listen_port": listen_port,
+            "awg_params": awg_params,
+        }
+
+    def _get_peer_app_type(self, wg_config: WireGuardConfig, public_key: str) -> str:
+        section = wg_config.get_peer(public_key)
+        raw_app_type = section.get_metadata(self.APP_TYPE_METADATA_KEY) if section else None
+        if not raw_app_type:
+            return self._default_app_type
+        try:
+            return self._normalize_app_type(raw_app_type)
+        except ValueError:
+            return self._default_app_type
 
     def _parse_wg_dump(self, dump_output: str) -> dict:
         peers = {}
@@ -412,40 +817,6 @@ class AmneziaWG2Service(BaseProtocolService):
             return self.AMNEZIA_WG_APP_TYPE
         raise ValueError(f"Unsupported app_type: {app_type}")
 
-    def _extract_peer_app_types(self, wg_config: str) -> dict[str, str]:
-        peer_section_pattern = re.compile(
-            r"(?ms)^\s*\[Peer\]\s*$.*?(?=^\s*\[[^\]]+\]\s*$|\Z)"
-        )
-        app_types_by_public_key: dict[str, str] = {}
-
-        for match in peer_section_pattern.finditer(wg_config):
-            section = match.group(0)
-            public_key_match = re.search(
-                r"^\s*PublicKey\s*=\s*(\S+)\s*$",
-                section,
-                flags=re.MULTILINE,
-            )
-            if not public_key_match:
-                continue
-
-            metadata_match = re.search(
-                rf"^\s*#?\s*{self.APP_TYPE_METADATA_KEY}\s*=\s*(\S+)\s*$",
-                section,
-                flags=re.MULTILINE,
-            )
-            if metadata_match:
-                raw_app_type = metadata_match.group(1).strip()
-                try:
-                    normalized_app_type = self._normalize_app_type(raw_app_type)
-                except ValueError:
-                    normalized_app_type = self._default_app_type
-            else:
-                normalized_app_type = self._default_app_type
-
-            app_types_by_public_key[public_key_match.group(1).strip()] = normalized_app_type
-
-        return app_types_by_public_key
-
     def _resolve_default_app_type(self) -> str:
         raw_default = self.protocol_config.get("default_app_type", self.AMNEZIA_WG_APP_TYPE)
         try:
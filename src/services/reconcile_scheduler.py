@@ -0,0 +1,58 @@
+import asyncio
+from contextlib import suppress
+
+from src.management.logger import configure_logger
+from src.management.settings import get_settings
+from src.services.management.protocol_factory import (
+    get_available_protocols,
+    get_protocol_service,
+)
+
+
+logger = configure_logger("ReconcileScheduler", "yellow")
+
+
+class ReconcileScheduler:
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self._stop_event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self.settings.runtime_reconcile_interval_seconds <= 0:
+            logger.info("Runtime reconcile is disabled")
+            return
+        if self._task and not self._task.done():
+            return
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        interval = self.settings.runtime_reconcile_interval_seconds
+        logger.info(f"Reconcile scheduler started with interval {interval}s")
+
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                break
+
+            for protocol in get_available_protocols():
+                try:
+                    service = get_protocol_service(protocol)
+                    await service.reconcile_runtime()
+                    logger.debug(f"Runtime reconciled for protocol {protocol}")
+                except Exception as exc:
+                    logger.error(f"Runtime reconcile failed for protocol {protocol}: {exc}")
+
+        logger.info("Reconcile scheduler stopped")
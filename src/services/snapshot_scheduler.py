@@ -0,0 +1,53 @@
+import asyncio
+from contextlib import suppress
+
+from src.management.logger import configure_logger
+from src.management.settings import get_settings
+from src.services.management.peer_snapshot import (
+    get_peer_snapshot_store,
+    wait_for_refresh_request,
+)
+from src.services.management.protocol_factory import get_available_protocols
+
+
+logger = configure_logger("SnapshotScheduler", "yellow")
+
+
+class SnapshotScheduler:
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self._stop_event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        interval = max(1, self.settings.peer_snapshot_interval_seconds)
+        logger.info(f"Snapshot scheduler started with interval {interval}s")
+
+        stale_only = False
+        while not self._stop_event.is_set():
+            for protocol in get_available_protocols():
+                store = get_peer_snapshot_store(protocol)
+                if stale_only and not store.stale:
+                    continue
+                try:
+                    await store.refresh()
+                except Exception as exc:
+                    logger.error(f"Peer snapshot refresh failed for protocol {protocol}: {exc}")
+
+            stale_only = await wait_for_refresh_request(interval)
+
+        logger.info("Snapshot scheduler stopped")
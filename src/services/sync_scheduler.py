@@ -1,9 +1,14 @@
 import asyncio
+import random
+import time
 from contextlib import suppress
 
+import httpx
+
 from src.management.logger import configure_logger
+from src.management.metrics import SYNC_TICK_SECONDS
 from src.management.settings import get_settings
-from src.services.peers_service import get_peers_service
+from src.services.peers_service import create_sync_client, get_peers_service
 
 
 logger = configure_logger("SyncScheduler", "yellow")
@@ -15,11 +20,13 @@ class SyncScheduler:
         self.peers_service = get_peers_service()
         self._stop_event = asyncio.Event()
         self._task: asyncio.Task | None = None
+        self._client: httpx.AsyncClient | None = None
 
     async def start(self) -> None:
         if self._task and not self._task.done():
             return
         self._stop_event.clear()
+        self._client = create_sync_client()
         self._task = asyncio.create_task(self._run())
 
     async def stop(self) -> None:
@@ -29,21 +36,44 @@ class SyncScheduler:
             with suppress(asyncio.CancelledError):
                 await self._task
         self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def _run(self) -> None:
         interval = max(1, self.settings.sync_interval_seconds)
         logger.info(f"Sync scheduler started with interval {interval}s")
 
+        failures = 0
         while not self._stop_event.is_set():
+            started = time.perf_counter()
             try:
-                synced = await self.peers_service.sync_peers_status()
+                synced = await self.peers_service.sync_peers_status(client=self._client)
                 logger.debug(f"Sync iteration completed, protocol payloads sent: {synced}")
+                failures = 0
             except Exception as exc:
-                logger.error(f"Sync iteration failed: {exc}")
+                failures += 1
+                logger.error(f"Sync iteration failed ({failures} in a row): {exc}")
+            SYNC_TICK_SECONDS.observe(
+                time.perf_counter() - started,
+                result="error" if failures else "ok",
+            )
 
             try:
-                await asyncio.wait_for(self._stop_event.wait(), timeout=interval)
+                await asyncio.wait_for(
+                    self._stop_event.wait(),
+                    timeout=self._next_delay(interval, failures),
+                )
             except asyncio.TimeoutError:
                 continue
 
         logger.info("Sync scheduler stopped")
+
+    def _next_delay(self, interval: int, failures: int) -> float:
+        if failures == 0:
+            return interval * random.uniform(0.9, 1.1)
+        backoff = min(
+            max(interval, self.settings.sync_backoff_max_seconds),
+            interval * 2 ** min(failures, 16),
+        )
+        return random.uniform(backoff / 2, backoff)
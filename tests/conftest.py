@@ -0,0 +1,5 @@
+import os
+
+
+os.environ.setdefault("DEVELOPMENT", "true")
+os.environ.setdefault("SERVER_PUBLIC_HOST", "127.0.0.1")
@@ -0,0 +1,135 @@
+import asyncio
+import subprocess
+
+import pytest
+
+from src.services.management import protocol_factory
+from src.services.management.mutation_queue import MUTATION_ADD, PeerMutation
+from src.services.protocols.amneziawg2.amneziawg2_service import AmneziaWG2Service
+
+
+PROTOCOL = "awg-test"
+SERVER_PUBLIC_KEY = "c2VydmVyLXB1YmxpYy1rZXktZm9yLXRlc3RzLTMyYj0="
+CONFIG = """[Interface]
+PrivateKey = c2VydmVyLXByaXZhdGUta2V5LWZvci10ZXN0cy0zMmI=
+Address = 10.8.1.1/24
+ListenPort = 51820
+"""
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    config_dir = tmp_path / "awg"
+    config_dir.mkdir()
+    (config_dir / "awg0.conf").write_text(CONFIG)
+    (config_dir / "wireguard_server_public_key.key").write_text(SERVER_PUBLIC_KEY)
+    protocols_file = tmp_path / "protocols.yaml"
+    protocols_file.write_text(
+        "protocols:\n"
+        f"  {PROTOCOL}:\n"
+        "    service_class: src.services.protocols.amneziawg2.amneziawg2_service.AmneziaWG2Service\n"
+        "    container_name: awg-test\n"
+        "    interface: awg0\n"
+        "    config_path: /opt/amnezia/awg\n"
+        "    file_access: host\n"
+        f"    host_config_path: {config_dir}\n"
+    )
+    protocol_factory.load_protocol_config(str(protocols_file))
+
+    service = AmneziaWG2Service(PROTOCOL)
+    commands: list[str] = []
+
+    async def run_commands(batch, check=True):
+        commands.extend(batch)
+        return [("", "") for _ in batch]
+
+    monkeypatch.setattr(service.connection, "run_commands", run_commands)
+    service.commands = commands
+    service.config_path = config_dir / "awg0.conf"
+    yield service
+    asyncio.run(service.close())
+    protocol_factory._protocol_config.clear()
+
+
+HOSTILE_IPS = [
+    "10.8.1.7/32,$(touch${IFS}/tmp/pwned)",
+    "10.8.1.7/32\nPostUp = touch /tmp/pwned",
+    "10.8.1.7;id",
+    "10.8.1.0/24",
+    "10.8.2.7",
+    " 10.8.1.7",
+    "not-an-ip",
+]
+
+
+@pytest.mark.parametrize("allocated_ip", HOSTILE_IPS)
+def test_batch_rejects_invalid_fixed_ip_before_writing(service, allocated_ip):
+    items = [{"app_type": "amnezia_wg"}, {"app_type": "amnezia_wg", "allocated_ip": allocated_ip}]
+
+    with pytest.raises(ValueError, match="Peer 1"):
+        asyncio.run(service.create_peers(items))
+
+    assert service.commands == []
+    assert service.config_path.read_text() == CONFIG
+
+
+@pytest.mark.parametrize("allocated_ip", ["10.8.1.7", "10.8.1.7/32", "10.8.1.7/255.255.255.255"])
+def test_batch_stores_normalized_fixed_ip(service, allocated_ip):
+    results = asyncio.run(
+        service.create_peers([{"app_type": "amnezia_wg", "allocated_ip": allocated_ip}])
+    )
+
+    assert results[0]["allocated_ip"] == "10.8.1.7/32"
+    assert "AllowedIPs = 10.8.1.7/32\n" in service.config_path.read_text()
+    assert "allowed-ips 10.8.1.7/32" in service.commands[0]
+
+
+@pytest.mark.parametrize("allocated_ip", HOSTILE_IPS)
+def test_mutation_path_rejects_invalid_fixed_ip(service, allocated_ip):
+    mutation = PeerMutation(
+        kind=MUTATION_ADD,
+        public_key="cGVlci1wdWJsaWMta2V5LWZvci10ZXN0cy0zMmJ5dGU=",
+        allowed_ip=allocated_ip,
+        app_type="amnezia_wg",
+    )
+
+    (result,) = asyncio.run(service._apply_mutations([mutation]))
+
+    assert isinstance(result, ValueError)
+    assert service.commands == []
+    assert service.config_path.read_text() == CONFIG
+
+
+def test_set_peers_command_quotes_hostile_values(service, tmp_path):
+    pwned = tmp_path / "pwned"
+    hostile = f"$(touch {pwned})"
+    command = service.connection._set_peers_command(
+        [
+            {
+                "public_key": f"key;{hostile}",
+                "preshared_key": f"psk'{hostile}",
+                "allowed_ips": f"10.8.1.7/32,{hostile}",
+            }
+        ],
+        [f"old`touch {pwned}`"],
+    )
+    stub = 'wg() { for arg in "$@"; do printf "%s\\n" "$arg"; done; cat "$psk_dir/0"; }\n'
+
+    result = subprocess.run(["sh", "-c", stub + command], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert not pwned.exists()
+    lines = result.stdout.splitlines()
+    assert lines[7] == "preshared-key" and lines[8].endswith("/0")
+    assert lines[:7] + lines[9:] == [
+        "set",
+        "awg0",
+        "peer",
+        f"old`touch {pwned}`",
+        "remove",
+        "peer",
+        f"key;{hostile}",
+        "allowed-ips",
+        f"10.8.1.7/32,{hostile}".replace(" ", ""),
+        f"psk'{hostile}",
+    ]
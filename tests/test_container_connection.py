@@ -0,0 +1,184 @@
+import asyncio
+import io
+import subprocess
+import tarfile
+import threading
+
+import pytest
+
+from src.services.management import container_connection, protocol_factory
+from src.services.management.container_connection import (
+    BATCH_SKIPPED_EXIT_CODE,
+    MAX_INLINE_SCRIPT_BYTES,
+    ContainerConnection,
+    DockerError,
+)
+from src.services.protocols.amneziawg2.amneziawg2_connection import AmneziaWG2Connection
+
+
+PROTOCOL = "awg-test"
+
+
+@pytest.fixture
+def host_connection(tmp_path):
+    config_dir = tmp_path / "awg"
+    config_dir.mkdir()
+    (config_dir / "awg0.conf").write_text("[Interface]\nAddress = 10.8.1.1/24\n")
+    (config_dir / "wireguard_psk.key").write_text("psk\n")
+    protocols_file = tmp_path / "protocols.yaml"
+    protocols_file.write_text(
+        "protocols:\n"
+        f"  {PROTOCOL}:\n"
+        "    service_class: src.services.protocols.amneziawg2.amneziawg2_service.AmneziaWG2Service\n"
+        "    container_name: awg-test\n"
+        "    interface: awg0\n"
+        "    config_path: /opt/amnezia/awg\n"
+        "    file_access: host\n"
+        f"    host_config_path: {config_dir}\n"
+    )
+    protocol_factory.load_protocol_config(str(protocols_file))
+    yield AmneziaWG2Connection(PROTOCOL)
+    protocol_factory._protocol_config.clear()
+
+
+def test_host_reads_run_off_the_event_loop(host_connection, monkeypatch):
+    threads: list[int] = []
+    read_host_file = host_connection._read_host_file
+
+    def recording_read(path):
+        threads.append(threading.get_ident())
+        return read_host_file(path)
+
+    monkeypatch.setattr(host_connection, "_read_host_file", recording_read)
+
+    async def scenario():
+        config = await host_connection.read_file(host_connection.config_file)
+        files = await host_connection.read_files_with_commands(
+            {"config": host_connection.config_file, "psk": host_connection.preshared_key_file}
+        )
+        return threading.get_ident(), config, files
+
+    loop_thread, config, files = asyncio.run(scenario())
+
+    assert config == "[Interface]\nAddress = 10.8.1.1/24"
+    assert files == {"config": config, "psk": "psk"}
+    assert len(threads) == 3
+    assert loop_thread not in threads
+
+
+MARKER = "__AMNEZIA_API_BATCH_0123456789abcdef__"
+
+
+def _run_batch(commands: list[str], stop_on_error: bool = True) -> tuple[str, str]:
+    script = ContainerConnection._build_batch_script(commands, MARKER, stop_on_error)
+    result = subprocess.run(["sh", "-c", script], capture_output=True, text=True)
+    return result.stdout, result.stderr
+
+
+def test_batch_round_trip_separates_output_per_command():
+    commands = ["echo one", "printf two; echo warn >&2", "true"]
+    stdout, stderr = _run_batch(commands)
+
+    exit_codes, stdout_parts, stderr_parts = ContainerConnection._split_batch_output(
+        stdout, stderr, MARKER, len(commands)
+    )
+
+    assert exit_codes == [0, 0, 0]
+    assert [part.strip() for part in stdout_parts] == ["one", "two", ""]
+    assert [part.strip() for part in stderr_parts] == ["", "warn", ""]
+
+
+@pytest.mark.parametrize(
+    "stop_on_error, expected_codes, expected_stdout",
+    [
+        (True, [0, 3, BATCH_SKIPPED_EXIT_CODE], ["first", "", ""]),
+        (False, [0, 3, 0], ["first", "", "third"]),
+    ],
+)
+def test_batch_reports_failure_in_the_middle(stop_on_error, expected_codes, expected_stdout):
+    commands = ["echo first", "echo broken >&2; exit 3", "echo third"]
+    stdout, stderr = _run_batch(commands, stop_on_error=stop_on_error)
+
+    exit_codes, stdout_parts, stderr_parts = ContainerConnection._split_batch_output(
+        stdout, stderr, MARKER, len(commands)
+    )
+
+    assert exit_codes == expected_codes
+    assert [part.strip() for part in stdout_parts] == expected_stdout
+    assert stderr_parts[1].strip() == "broken"
+
+
+def test_batch_output_with_marker_like_text_is_not_split():
+    fake_marker = "__AMNEZIA_API_BATCH_ffffffffffffffff__"
+    commands = [
+        f"printf '\\n{fake_marker} 9\\n{MARKER}x 7\\n'",
+        f"printf '\\n{fake_marker}\\n' >&2",
+    ]
+    stdout, stderr = _run_batch(commands)
+
+    exit_codes, stdout_parts, stderr_parts = ContainerConnection._split_batch_output(
+        stdout, stderr, MARKER, len(commands)
+    )
+
+    assert exit_codes == [0, 0]
+    assert stdout_parts[0] == f"\n{fake_marker} 9\n{MARKER}x 7\n"
+    assert stderr_parts[1] == f"\n{fake_marker}\n"
+
+
+@pytest.mark.parametrize("cut", ["missing", "truncated"])
+def test_batch_output_without_trailing_marker_is_an_error(cut):
+    commands = ["echo one", "echo two"]
+    stdout, stderr = _run_batch(commands)
+    if cut == "missing":
+        stdout = stdout[: stdout.rindex(f"\n{MARKER}")]
+    else:
+        stdout = stdout[:-3]
+
+    with pytest.raises(DockerError, match="expected 2 result"):
+        ContainerConnection._split_batch_output(stdout, stderr, MARKER, len(commands))
+
+
+class LocalEngine:
+    def __init__(self) -> None:
+        self.archives: list[tuple[str, str, bytes]] = []
+        self.commands: list[list[str]] = []
+
+    async def put_archive(self, container_name: str, path: str, data: bytes) -> None:
+        self.archives.append((container_name, path, data))
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            tar.extractall(path, filter="data")
+
+    async def exec(self, container_name: str, cmd: list[str]) -> tuple[int, str, str]:
+        self.commands.append(cmd)
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        return result.returncode, result.stdout, result.stderr
+
+
+def test_large_batch_is_uploaded_as_a_script(host_connection, tmp_path, monkeypatch):
+    upload_dir = tmp_path / "upload"
+    upload_dir.mkdir()
+    monkeypatch.setattr(container_connection, "SCRIPT_UPLOAD_DIR", str(upload_dir))
+    engine = LocalEngine()
+    host_connection.docker_engine = engine
+    payload = "x" * (MAX_INLINE_SCRIPT_BYTES + 1024)
+
+    results = asyncio.run(
+        host_connection.run_commands([f"printf '%s' '{payload}' | wc -c", "echo done"])
+    )
+
+    assert results == [(str(len(payload)), ""), ("done", "")]
+    assert len(engine.archives) == 1
+    assert engine.archives[0][:2] == ("awg-test", str(upload_dir))
+    assert len(engine.commands[0][2]) < MAX_INLINE_SCRIPT_BYTES
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_small_batch_runs_inline(host_connection):
+    engine = LocalEngine()
+    host_connection.docker_engine = engine
+
+    with pytest.raises(DockerError, match="nope"):
+        asyncio.run(host_connection.run_commands(["echo ok", "echo nope >&2; exit 1"]))
+
+    assert engine.archives == []
+    assert engine.commands[0][:2] == ["sh", "-c"]
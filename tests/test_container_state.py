@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import pytest
+
+from src.services.management import container_state
+from src.services.management.container_state import ContainerStateCache
+
+
+class FakeEngine:
+    def __init__(self, containers: list[dict], events: list[dict]):
+        self.containers = containers
+        self.events = events
+        self.inspections = 0
+
+    async def list_containers(self, all_containers: bool = False) -> list[dict]:
+        return self.containers
+
+    async def inspect_container(self, container_name: str) -> dict:
+        self.inspections += 1
+        return {"Name": f"/{container_name}"}
+
+    async def stream(self, method: str, path: str, params: dict | None = None):
+        payload = b"".join(json.dumps(event).encode() + b"\n" for event in self.events)
+        for offset in range(0, len(payload), 7):
+            yield payload[offset:offset + 7]
+
+
+def _event(action: str, name: str, **attributes) -> dict:
+    return {"Type": "container", "Action": action, "Actor": {"Attributes": {"name": name, **attributes}}}
+
+
+@pytest.fixture
+def cache_factory(monkeypatch):
+    def build(containers: list[dict], events: list[dict] = ()) -> tuple[ContainerStateCache, FakeEngine]:
+        engine = FakeEngine(containers, list(events))
+        monkeypatch.setattr(container_state, "get_docker_engine", lambda: engine)
+        return ContainerStateCache(), engine
+
+    return build
+
+
+def test_resync_reads_all_container_names(cache_factory):
+    cache, _ = cache_factory(
+        [
+            {"Names": ["/amnezia-awg2"], "State": "running"},
+            {"Names": ["/old", "/alias"], "State": "exited"},
+        ]
+    )
+    asyncio.run(cache.resync())
+
+    assert cache.get_state("amnezia-awg2") == "running"
+    assert cache.get_state("alias") == "exited"
+    assert cache.running_containers() == {"amnezia-awg2"}
+
+
+def test_events_update_state_from_a_split_stream(cache_factory):
+    cache, _ = cache_factory(
+        [{"Names": ["/awg"], "State": "running"}, {"Names": ["/gone"], "State": "running"}],
+        [
+            _event("die", "awg"),
+            _event("start", "awg"),
+            _event("pause", "awg"),
+            _event("exec_start: sh", "awg"),
+            _event("destroy", "gone"),
+            _event("rename", "awg2", oldName="/awg"),
+        ],
+    )
+
+    async def scenario():
+        await cache.resync()
+        with pytest.raises(ConnectionError):
+            await cache._watch(0)
+
+    asyncio.run(scenario())
+    assert cache.get_state("awg") is None
+    assert cache.get_state("awg2") == "paused"
+    assert cache.get_state("gone") is None
+
+
+def test_details_are_cached_until_an_event_touches_the_container(cache_factory):
+    cache, engine = cache_factory([{"Names": ["/awg"], "State": "running"}])
+
+    async def scenario():
+        cache._ready = True
+        await cache.get_details("awg")
+        await cache.get_details("awg")
+        await cache._apply_event(_event("restart", "awg"))
+        await cache.get_details("awg")
+
+    asyncio.run(scenario())
+    assert engine.inspections == 2
@@ -0,0 +1,217 @@
+import asyncio
+import re
+import struct
+
+import pytest
+
+from src.services.management.docker_engine import (
+    DockerConnectionError,
+    DockerEngineClient,
+    DockerEngineError,
+    DockerNotFoundError,
+)
+from src.services.management.shell_session import ContainerShellSession
+
+
+def _response(status: int, body: bytes = b"", headers: str = "") -> bytes:
+    head = f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n{headers}"
+    return (head + f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+
+def _chunked(status: int, parts: list[bytes]) -> bytes:
+    head = f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\nTransfer-Encoding: chunked\r\n\r\n"
+    chunks = b"".join(f"{len(part):x}\r\n".encode() + part + b"\r\n" for part in parts)
+    return head.encode() + chunks + b"0\r\n\r\n"
+
+
+def _frame(stream: int, data: bytes) -> bytes:
+    return struct.pack(">BxxxL", stream, len(data)) + data
+
+
+class FakeDockerServer:
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.connections = 0
+        self.requests: list[tuple[str, str]] = []
+        self.drop_after: int | None = None
+        self._server: asyncio.AbstractServer | None = None
+
+    async def __aenter__(self) -> "FakeDockerServer":
+        self._server = await asyncio.start_unix_server(self._handle, self.socket_path)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        handled = 0
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                method, target, _ = line.decode().split(" ", 2)
+                headers = {}
+                while (header := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = header.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get("content-length", 0)))
+
+                if self.drop_after is not None and handled >= self.drop_after:
+                    return
+                handled += 1
+                self.requests.append((method, target))
+                if await self._route(method, target, headers, reader, writer):
+                    return
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _route(self, method, target, headers, reader, writer) -> bool:
+        if target == "/containers/json":
+            writer.write(_chunked(200, [b'[{"Names": ["/awg"],', b' "State": "running"}]']))
+        elif target == "/containers/missing/json":
+            writer.write(_response(404, b'{"message": "No such container: missing"}'))
+        elif target == "/containers/broken/json":
+            writer.write(_response(500, b'{"message": "daemon exploded"}'))
+        elif target == "/containers/awg/exec":
+            writer.write(_response(201, b'{"Id": "abc"}'))
+        elif target == "/exec/abc/start" and headers.get("upgrade") == "tcp":
+            writer.write(b"HTTP/1.1 101 UPGRADED\r\nConnection: Upgrade\r\nUpgrade: tcp\r\n\r\n")
+            await writer.drain()
+            await self._serve_shell(reader, writer)
+            return True
+        elif target == "/exec/abc/start":
+            payload = (
+                _frame(1, b"hello ")
+                + _frame(2, b"warning\n")
+                + _frame(1, b"world\n")
+            )
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/vnd.docker.raw-stream\r\n\r\n")
+            for offset in range(0, len(payload), 5):
+                writer.write(payload[offset:offset + 5])
+                await writer.drain()
+            return True
+        elif target == "/exec/abc/json":
+            writer.write(_response(200, b'{"ExitCode": 3}'))
+        else:
+            writer.write(_response(404, b'{"message": "page not found"}'))
+        return False
+
+    @staticmethod
+    async def _serve_shell(reader, writer) -> None:
+        buffer = b""
+        while True:
+            data = await reader.read(4096)
+            if not data:
+                return
+            buffer += data
+            while b">&2\n" in buffer:
+                script, _, buffer = buffer.partition(b">&2\n")
+                marker = re.search(rb"__AMNEZIA_API_SESSION_[0-9a-f]+__", script).group()
+                writer.write(_frame(1, b"session output\n" + b"\n" + marker + b" 7\n"))
+                writer.write(_frame(2, b"session error\n" + b"\n" + marker + b"\n"))
+                await writer.drain()
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "docker.sock")
+
+
+def _run(socket_path, scenario):
+    async def main():
+        async with FakeDockerServer(socket_path) as server:
+            client = DockerEngineClient(socket_path=socket_path, timeout=5)
+            try:
+                return await scenario(server, client)
+            finally:
+                await client.close()
+
+    return asyncio.run(main())
+
+
+def test_chunked_response_is_reassembled(socket_path):
+    async def scenario(server, client):
+        return await client.list_containers()
+
+    assert _run(socket_path, scenario) == [{"Names": ["/awg"], "State": "running"}]
+
+
+def test_exec_demultiplexes_stdout_and_stderr(socket_path):
+    async def scenario(server, client):
+        return await client.exec("awg", ["sh", "-c", "true"])
+
+    assert _run(socket_path, scenario) == (3, "hello world\n", "warning\n")
+
+
+def test_error_statuses_map_to_exceptions(socket_path):
+    async def scenario(server, client):
+        with pytest.raises(DockerNotFoundError, match="No such container"):
+            await client.inspect_container("missing")
+        with pytest.raises(DockerEngineError, match="daemon exploded") as error:
+            await client.inspect_container("broken")
+        return error.value.status_code
+
+    assert _run(socket_path, scenario) == 500
+
+
+def test_connection_error_when_socket_is_missing(tmp_path):
+    async def scenario():
+        client = DockerEngineClient(socket_path=str(tmp_path / "absent.sock"), timeout=1)
+        with pytest.raises(DockerEngineError, match="Cannot connect"):
+            await client.list_containers()
+
+    asyncio.run(scenario())
+
+
+def test_idle_connections_are_reused(socket_path):
+    async def scenario(server, client):
+        for _ in range(3):
+            await client.list_containers()
+        return server.connections, len(server.requests)
+
+    assert _run(socket_path, scenario) == (1, 3)
+
+
+def test_stale_pooled_connection_is_retried_for_idempotent_requests(socket_path):
+    async def scenario(server, client):
+        server.drop_after = 1
+        await client.list_containers()
+        containers = await client.list_containers()
+        return containers, server.connections
+
+    containers, connections = _run(socket_path, scenario)
+    assert containers == [{"Names": ["/awg"], "State": "running"}]
+    assert connections == 2
+
+
+def test_stale_pooled_connection_is_not_retried_for_post(socket_path):
+    async def scenario(server, client):
+        server.drop_after = 1
+        await client.list_containers()
+        with pytest.raises(DockerConnectionError):
+            await client.request("POST", "/containers/awg/exec", json_body={"Cmd": ["true"]})
+        return server.connections
+
+    assert _run(socket_path, scenario) == 1
+
+
+def test_shell_session_runs_commands_over_upgraded_exec(socket_path, monkeypatch):
+    async def scenario(server, client):
+        monkeypatch.setattr(
+            "src.services.management.shell_session.get_docker_engine",
+            lambda: client,
+        )
+        session = ContainerShellSession("awg", command_timeout=5)
+        first = await session.execute("echo one")
+        second = await session.execute("echo two")
+        await session.close()
+        return first, second, server.connections
+
+    first, second, connections = _run(socket_path, scenario)
+    assert first == (7, "session output\n", "session error\n")
+    assert second == first
+    assert connections == 2
@@ -0,0 +1,47 @@
+import pytest
+from starlette.requests import Request
+
+from src.api.v1.management.etag import is_not_modified, make_etag, not_modified_response
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_make_etag_is_quoted_and_stable():
+    etag = make_etag("peers", "awg", "digest", [("limit", "10")])
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("peers", "awg", "digest", [("limit", "10")])
+
+
+def test_make_etag_separates_parts():
+    assert make_etag("ab", "c") != make_etag("a", "bc")
+    assert make_etag("peers", "digest-1") != make_etag("peers", "digest-2")
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ('"other"', False),
+        ("{etag}", True),
+        ("W/{etag}", True),
+        ('"other", {etag}', True),
+        ("*", True),
+    ],
+)
+def test_is_not_modified(header, expected):
+    etag = make_etag("peers")
+    request = _request(None if header is None else header.format(etag=etag))
+
+    assert is_not_modified(request, etag) is expected
+
+
+def test_not_modified_response_carries_etag_and_headers():
+    response = not_modified_response('"abc"', {"X-Snapshot-Version": "3"})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == '"abc"'
+    assert response.headers["x-snapshot-version"] == "3"
@@ -0,0 +1,68 @@
+import ipaddress
+
+import pytest
+
+from src.services.management.ip_allocator import IPAllocator
+
+
+NETWORK = ipaddress.IPv4Network("10.8.1.0/29")
+
+
+def _allocator(cooldown_seconds: float = 0, used: tuple[str, ...] = ()) -> IPAllocator:
+    allocator = IPAllocator(cooldown_seconds=cooldown_seconds)
+    allocator.rebuild(NETWORK, [ipaddress.IPv4Address(address) for address in used])
+    return allocator
+
+
+def test_allocate_skips_network_gateway_and_broadcast():
+    allocator = _allocator(used=("10.8.1.3",))
+    assert [str(allocator.allocate()) for _ in range(4)] == [
+        "10.8.1.2",
+        "10.8.1.4",
+        "10.8.1.5",
+        "10.8.1.6",
+    ]
+    with pytest.raises(ValueError):
+        allocator.allocate()
+
+
+def test_claim_rejects_used_and_reserved_addresses():
+    allocator = _allocator(used=("10.8.1.2",))
+    with pytest.raises(ValueError):
+        allocator.claim(ipaddress.IPv4Address("10.8.1.2"))
+    with pytest.raises(ValueError):
+        allocator.claim(ipaddress.IPv4Address("10.8.1.1"))
+
+
+def test_release_respects_cooldown():
+    allocator = _allocator(cooldown_seconds=3600)
+    address = allocator.allocate()
+    allocator.release(address)
+    assert allocator.allocate() != address
+
+
+def test_release_without_cooldown_frees_immediately():
+    allocator = _allocator(cooldown_seconds=3600)
+    free_count = allocator.free_count
+    address = allocator.allocate()
+    allocator.release(address, cool_down=False)
+    assert allocator.free_count == free_count
+    assert allocator.allocate() == address
+
+
+def test_failed_batch_rollback_restores_slots():
+    allocator = _allocator(used=("10.8.1.2",))
+    free_count = allocator.free_count
+    removed = ipaddress.IPv4Address("10.8.1.2")
+
+    allocator.release(removed)
+    assigned = [allocator.allocate(), allocator.allocate()]
+    assert removed in assigned
+
+    for address in assigned:
+        allocator.release(address, cool_down=False)
+    allocator.claim(removed)
+
+    assert allocator.free_count == free_count
+    with pytest.raises(ValueError):
+        allocator.claim(removed)
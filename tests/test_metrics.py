@@ -0,0 +1,70 @@
+import pytest
+
+from src.management.metrics import Histogram, command_label, format_value, gauge_family, sample
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Test latency", ("route",), buckets=(0.1, 1.0, 0.5))
+    for value in (0.05, 0.1, 0.3, 0.7, 5.0):
+        histogram.observe(value, route="/peers")
+
+    assert histogram.render() == [
+        "# HELP test_seconds Test latency",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/peers",le="0.1"} 2',
+        'test_seconds_bucket{route="/peers",le="0.5"} 3',
+        'test_seconds_bucket{route="/peers",le="1"} 4',
+        'test_seconds_bucket{route="/peers",le="+Inf"} 5',
+        'test_seconds_sum{route="/peers"} 6.15',
+        'test_seconds_count{route="/peers"} 5',
+    ]
+
+
+def test_histogram_renders_series_per_label_set_in_order():
+    histogram = Histogram("test_seconds", "Test latency", ("result",), buckets=(1.0,))
+    histogram.observe(2.0, result="ok")
+    histogram.observe(0.5, result="error")
+
+    lines = histogram.render()
+
+    assert lines[2] == 'test_seconds_bucket{result="error",le="1"} 1'
+    assert lines[6] == 'test_seconds_bucket{result="ok",le="1"} 0'
+    assert lines[7] == 'test_seconds_bucket{result="ok",le="+Inf"} 1'
+
+
+def test_histogram_time_observes_elapsed_seconds():
+    histogram = Histogram("test_seconds", "Test latency", buckets=(60.0,))
+    with histogram.time():
+        pass
+
+    assert histogram.render()[2] == 'test_seconds_bucket{le="60"} 1'
+
+
+def test_label_values_are_escaped():
+    line = sample("amnezia_peers", 1, {"name": 'a\\b\n"c"'})
+
+    assert line == 'amnezia_peers{name="a\\\\b\\n\\"c\\""} 1'
+
+
+def test_gauge_family_without_labels():
+    assert gauge_family("amnezia_up", "Up", [({}, 1)]) == [
+        "# HELP amnezia_up Up",
+        "# TYPE amnezia_up gauge",
+        "amnezia_up 1",
+    ]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(3, "3"), (2.0, "2"), (0.25, "0.25"), (float("inf"), "+Inf"), (float("-inf"), "-Inf")],
+)
+def test_format_value(value, expected):
+    assert format_value(value) == expected
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [("/usr/bin/wg show", "wg"), ("", "empty"), ("$(rm -rf /)", "other")],
+)
+def test_command_label(command, expected):
+    assert command_label(command) == expected
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from src.services.management.mutation_queue import (
+    MUTATION_ADD,
+    MutationQueue,
+    PeerMutation,
+)
+
+
+def test_close_drains_pending_batches_before_stopping():
+    async def scenario():
+        applied: list[list[str]] = []
+
+        async def handler(mutations):
+            await asyncio.sleep(0.01)
+            applied.append([mutation.public_key for mutation in mutations])
+            return [mutation.public_key for mutation in mutations]
+
+        queue = MutationQueue("test", handler, window_seconds=0.005, max_batch_size=2)
+        submitted = [
+            asyncio.create_task(queue.submit(PeerMutation(MUTATION_ADD, f"key{index}")))
+            for index in range(5)
+        ]
+        await asyncio.sleep(0)
+        await queue.close()
+
+        results = await asyncio.gather(*submitted)
+        with pytest.raises(RuntimeError):
+            await queue.submit(PeerMutation(MUTATION_ADD, "late"))
+        return applied, results
+
+    applied, results = asyncio.run(scenario())
+    assert results == [f"key{index}" for index in range(5)]
+    assert sum(len(batch) for batch in applied) == 5
+    assert max(len(batch) for batch in applied) <= 2
+
+
+def test_exclusive_jobs_do_not_overlap_batches():
+    async def scenario():
+        events: list[str] = []
+
+        async def handler(mutations):
+            events.append("batch start")
+            await asyncio.sleep(0.02)
+            events.append("batch end")
+            return [None] * len(mutations)
+
+        async def job():
+            events.append("job")
+            return "synced"
+
+        queue = MutationQueue("test", handler, window_seconds=0, max_batch_size=10)
+        submitted = asyncio.create_task(queue.submit(PeerMutation(MUTATION_ADD, "key")))
+        while not events:
+            await asyncio.sleep(0)
+        result = await queue.run_exclusive(job)
+        await submitted
+        await queue.close()
+        return events, result
+
+    events, result = asyncio.run(scenario())
+    assert events == ["batch start", "batch end", "job"]
+    assert result == "synced"
@@ -0,0 +1,117 @@
+import ipaddress
+from datetime import datetime
+
+import pytest
+
+from src.services.management.peer_index import (
+    SORT_HANDSHAKE,
+    SORT_IP,
+    SORT_PUBLIC_KEY,
+    SORT_TRAFFIC,
+    PeerIndex,
+    PeerQuery,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def _peer(index: int) -> dict:
+    return {
+        "public_key": f"key{index:02d}",
+        "allowed_ips": [f"10.8.{index // 10}.{index % 10 + 2}/32"],
+        "rx_bytes": (index * 37) % 11 * 100,
+        "tx_bytes": index,
+        "last_handshake": datetime.fromtimestamp(1_700_000_000 + index * 60).isoformat()
+        if index % 4
+        else None,
+        "online": index % 2 == 0,
+        "app_type": "amnezia_vpn" if index % 3 == 0 else "amnezia_wg",
+    }
+
+
+PEERS = tuple(_peer(index) for index in range(30))
+
+
+def _walk(index: PeerIndex, query: PeerQuery) -> list[str]:
+    keys: list[str] = []
+    while True:
+        page, cursor = index.query(query)
+        keys.extend(peer["public_key"] for peer in page)
+        if cursor is None:
+            return keys
+        query.cursor = cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(SORT_TRAFFIC, True, 1234, "a/b+c=")
+    assert decode_cursor(cursor, SORT_TRAFFIC, True) == (1234, "a/b+c=")
+
+
+@pytest.mark.parametrize("cursor", ["!!!", encode_cursor(SORT_IP, False, 1, "k")])
+def test_cursor_rejects_garbage_and_mismatched_sort(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, SORT_TRAFFIC, False)
+
+
+def test_iter_peers_rejects_bad_cursor_before_iteration():
+    with pytest.raises(ValueError):
+        PeerIndex(PEERS).iter_peers(PeerQuery(cursor="!!!"))
+
+
+@pytest.mark.parametrize("sort", [SORT_PUBLIC_KEY, SORT_HANDSHAKE, SORT_TRAFFIC, SORT_IP])
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_every_peer_once_in_order(sort, descending):
+    index = PeerIndex(PEERS)
+    keys = _walk(index, PeerQuery(sort=sort, descending=descending, limit=7))
+
+    full, cursor = index.query(PeerQuery(sort=sort, descending=descending))
+    assert cursor is None
+    assert keys == [peer["public_key"] for peer in full]
+    assert sorted(keys) == sorted(peer["public_key"] for peer in PEERS)
+
+
+def test_traffic_sort_orders_by_total_bytes():
+    page, _ = PeerIndex(PEERS).query(PeerQuery(sort=SORT_TRAFFIC, descending=True, limit=5))
+    totals = [peer["rx_bytes"] + peer["tx_bytes"] for peer in page]
+    assert totals == sorted(totals, reverse=True)
+    assert totals[0] == max(peer["rx_bytes"] + peer["tx_bytes"] for peer in PEERS)
+
+
+def test_ip_network_filter_is_inclusive():
+    network = ipaddress.IPv4Network("10.8.1.0/28")
+    page, _ = PeerIndex(PEERS).query(PeerQuery(sort=SORT_IP, ip_network=network))
+    assert [peer["allowed_ips"][0] for peer in page] == [
+        f"10.8.1.{host}/32" for host in range(2, 12)
+    ]
+
+
+def test_handshake_range_combined_with_other_filters():
+    after = datetime.fromtimestamp(1_700_000_000 + 5 * 60).timestamp()
+    before = datetime.fromtimestamp(1_700_000_000 + 20 * 60).timestamp()
+    query = PeerQuery(
+        sort=SORT_PUBLIC_KEY,
+        handshake_after=after,
+        handshake_before=before,
+        online_only=True,
+        app_type="amnezia_wg",
+        limit=2,
+    )
+    keys = _walk(PeerIndex(PEERS), query)
+
+    expected = [
+        peer["public_key"]
+        for index, peer in enumerate(PEERS)
+        if index % 4 and 5 <= index <= 20 and peer["online"] and peer["app_type"] == "amnezia_wg"
+    ]
+    assert keys == expected
+
+
+def test_empty_range_returns_no_page():
+    network = ipaddress.IPv4Network("192.168.0.0/24")
+    assert PeerIndex(PEERS).query(PeerQuery(ip_network=network)) == ([], None)
+
+
+def test_find_by_public_key():
+    index = PeerIndex(PEERS)
+    assert index.find("key07") is PEERS[7]
+    assert index.find("missing") is None
@@ -0,0 +1,91 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.v1.peers.crud import read
+from src.services.management.peer_index import PeerIndex
+from src.services.management.peer_snapshot import PeerSnapshot
+
+
+PROTOCOL = "amneziawg2"
+
+
+def _peer(index: int) -> dict:
+    return {
+        "public_key": f"key{index:02d}",
+        "allowed_ips": [f"10.8.1.{index + 2}/32"],
+        "app_type": "amnezia_vpn",
+        "online": True,
+        "last_handshake": None,
+        "rx_bytes": index * 10,
+        "tx_bytes": index,
+    }
+
+
+class FakeSnapshotStore:
+    def __init__(self, peers: tuple[dict, ...]):
+        self.snapshot = PeerSnapshot(
+            protocol=PROTOCOL,
+            version=1,
+            created_at=datetime.now(timezone.utc),
+            peers=peers,
+            digest="digest-1",
+            index=PeerIndex(peers),
+        )
+
+    async def get(self, fresh: bool = False) -> PeerSnapshot:
+        return self.snapshot
+
+
+@pytest.fixture
+def client(monkeypatch):
+    store = FakeSnapshotStore(tuple(_peer(index) for index in range(5)))
+    monkeypatch.setattr(read, "get_active_protocol_name", lambda: PROTOCOL)
+    monkeypatch.setattr(read, "get_peer_snapshot_store", lambda protocol: store)
+
+    app = FastAPI()
+    app.include_router(read.router)
+    return TestClient(app)
+
+
+def test_stream_returns_ndjson(client):
+    response = client.get("/stream", params={"sort": "traffic", "order": "desc"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["public_key"] for line in lines] == [f"key{index:02d}" for index in range(4, -1, -1)]
+
+
+def test_stream_rejects_invalid_cursor_before_streaming(client):
+    response = client.get("/stream", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_list_returns_304_for_matching_etag(client):
+    first = client.get("/", params={"limit": 2})
+    etag = first.headers["etag"]
+
+    second = client.get("/", params={"limit": 2}, headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+
+
+def test_list_skips_etag_for_relative_handshake_filters(client):
+    first = client.get("/", params={"handshake_older_than": 60})
+
+    assert first.status_code == 200
+    assert "etag" not in first.headers
+    second = client.get(
+        "/",
+        params={"handshake_older_than": 60},
+        headers={"If-None-Match": "*"},
+    )
+    assert second.status_code == 200
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from src.services.management import protocol_factory
+
+
+EVENTS: list[str] = []
+
+
+class FakeService:
+    def __init__(self, protocol_name: str):
+        self._protocol_name = protocol_name
+        EVENTS.append(f"create {protocol_name}")
+
+    @property
+    def protocol_name(self) -> str:
+        return self._protocol_name
+
+    async def close(self) -> None:
+        EVENTS.append(f"close {self._protocol_name}")
+
+
+class BrokenService:
+    def __init__(self, protocol_name: str):
+        raise RuntimeError("container is missing")
+
+
+@pytest.fixture
+def protocols_file(tmp_path):
+    EVENTS.clear()
+    path = tmp_path / "protocols.yaml"
+    path.write_text(
+        "protocols:\n"
+        "  alpha:\n"
+        "    service_class: tests.test_protocol_factory.FakeService\n"
+        "  broken:\n"
+        "    service_class: tests.test_protocol_factory.BrokenService\n"
+    )
+    yield str(path)
+    asyncio.run(protocol_factory.close_protocol_services())
+    protocol_factory._protocol_config.clear()
+
+
+def test_init_survives_a_failing_service(protocols_file):
+    protocol_factory.load_protocol_config(protocols_file)
+    protocol_factory.init_protocol_services()
+
+    assert EVENTS == ["create alpha"]
+    assert isinstance(protocol_factory.get_protocol_service("alpha"), FakeService)
+
+
+def test_reload_closes_replaced_services_before_creating_new_ones(protocols_file):
+    protocol_factory.load_protocol_config(protocols_file)
+    protocol_factory.init_protocol_services()
+    old_service = protocol_factory.get_protocol_service("alpha")
+
+    asyncio.run(protocol_factory.reload_protocol_config(protocols_file))
+
+    assert EVENTS == ["create alpha", "close alpha", "create alpha"]
+    assert protocol_factory.get_protocol_service("alpha") is not old_service
+    assert protocol_factory._retired_services == []
@@ -0,0 +1,141 @@
+import asyncio
+import os
+import signal
+import struct
+from contextlib import suppress
+
+import pytest
+
+from src.services.management import shell_session
+from src.services.management.shell_session import ContainerShellSession, ShellSessionError
+
+
+class ProcessWriter:
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        self.process.stdin.write(data)
+
+    async def drain(self) -> None:
+        await self.process.stdin.drain()
+
+    def is_closing(self) -> bool:
+        return self.closed or self.process.returncode is not None
+
+    def close(self) -> None:
+        self.closed = True
+        _kill_group(self.process)
+
+
+def _kill_group(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is None:
+        with suppress(ProcessLookupError):
+            os.killpg(process.pid, signal.SIGKILL)
+
+
+class LocalShellEngine:
+    def __init__(self) -> None:
+        self.processes: list[asyncio.subprocess.Process] = []
+        self._pumps: list[asyncio.Task] = []
+
+    async def exec_session(self, container_name: str, cmd: list[str]):
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        reader = asyncio.StreamReader()
+        self.processes.append(process)
+        self._pumps.append(asyncio.create_task(self._pump(process, reader)))
+        return reader, ProcessWriter(process)
+
+    async def _pump(self, process, reader: asyncio.StreamReader) -> None:
+        async def forward(stream: int, source: asyncio.StreamReader) -> None:
+            while chunk := await source.read(7):
+                reader.feed_data(struct.pack(">BxxxL", stream, len(chunk)) + chunk)
+
+        await asyncio.gather(forward(1, process.stdout), forward(2, process.stderr))
+        reader.feed_eof()
+
+    async def close(self) -> None:
+        for process in self.processes:
+            _kill_group(process)
+            await process.wait()
+        await asyncio.gather(*self._pumps, return_exceptions=True)
+
+
+@pytest.fixture
+def run_session(monkeypatch):
+    def run(scenario):
+        async def main():
+            engine = LocalShellEngine()
+            monkeypatch.setattr(shell_session, "get_docker_engine", lambda: engine)
+            session = ContainerShellSession("awg", command_timeout=5)
+            try:
+                return await scenario(session, engine)
+            finally:
+                await session.close()
+                await engine.close()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def test_commands_share_one_shell_and_keep_framing(run_session):
+    async def scenario(session, engine):
+        first = await session.execute("printf 'no newline'; echo oops >&2; exit 4")
+        second = await session.execute("echo '__AMNEZIA_API_SESSION_fake__ 0'; printf '\\n'")
+        third = await session.execute("cd /; pwd")
+        return first, second, third, len(engine.processes)
+
+    first, second, third, processes = run_session(scenario)
+
+    assert first == (4, "no newline", "oops\n")
+    assert second == (0, "__AMNEZIA_API_SESSION_fake__ 0\n\n", "")
+    assert third == (0, "/\n", "")
+    assert processes == 1
+
+
+def test_cancelled_command_drops_the_session(run_session):
+    async def scenario(session, engine):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(session.execute("sleep 10"), timeout=0.2)
+        await asyncio.wait_for(engine.processes[0].wait(), timeout=2)
+        result = await session.execute("echo fresh")
+        return result, len(engine.processes)
+
+    result, processes = run_session(scenario)
+
+    assert result == (0, "fresh\n", "")
+    assert processes == 2
+
+
+def test_shell_exit_mid_command_raises_and_reconnects(run_session):
+    async def scenario(session, engine):
+        with pytest.raises(ShellSessionError, match="closed unexpectedly"):
+            await session.execute("kill -9 $$")
+        return await session.execute("echo back"), len(engine.processes)
+
+    result, processes = run_session(scenario)
+
+    assert result == (0, "back\n", "")
+    assert processes == 2
+
+
+def test_dead_session_is_replaced_before_the_next_command(run_session):
+    async def scenario(session, engine):
+        await session.execute("true")
+        _kill_group(engine.processes[0])
+        await engine.processes[0].wait()
+        await asyncio.sleep(0.05)
+        return await session.execute("echo again"), len(engine.processes)
+
+    result, processes = run_session(scenario)
+
+    assert result == (0, "again\n", "")
+    assert processes == 2
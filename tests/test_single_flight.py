@@ -0,0 +1,57 @@
+import asyncio
+
+from src.services.management.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        executions = []
+
+        async def read():
+            executions.append(1)
+            await release.wait()
+            return "content"
+
+        tasks = [asyncio.create_task(flight.run("cat", read, scope="awg")) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*tasks), executions, flight.stats()
+
+    results, executions, stats = asyncio.run(scenario())
+    assert results == ["content"] * 3
+    assert len(executions) == 1
+    assert stats["coalesced"] == 2
+
+
+def test_invalidate_keeps_later_callers_off_a_pre_write_read():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        started = asyncio.Event()
+        state = {"content": "before"}
+
+        async def read():
+            content = state["content"]
+            started.set()
+            await release.wait()
+            return content
+
+        early = asyncio.create_task(flight.run("cat", read, scope="awg"))
+        await started.wait()
+
+        flight.invalidate("awg")
+        state["content"] = "after"
+        late = asyncio.create_task(flight.run("cat", read, scope="awg"))
+        other = asyncio.create_task(flight.run("cat", read, scope="xray"))
+        await asyncio.sleep(0)
+        release.set()
+        return await early, await late, await other, flight.stats()
+
+    early, late, other, stats = asyncio.run(scenario())
+    assert early == "before"
+    assert late == "after"
+    assert other == "after"
+    assert stats["executions"] == 3
+    assert stats["in_flight"] == 0
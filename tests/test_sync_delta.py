@@ -0,0 +1,49 @@
+import pytest
+
+from src.services import peers_service
+from src.services.management.sync_spool import SyncSpool
+from src.services.peers_service import PeersService, SyncState
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    spool = SyncSpool(str(tmp_path / "spool"), max_bytes=1024 * 1024)
+    monkeypatch.setattr(peers_service, "get_sync_spool", lambda: spool)
+    return PeersService()
+
+
+def _peer(public_key: str, rx_bytes: int = 0) -> dict:
+    return {"public_key": public_key, "online": True, "rx_bytes": rx_bytes, "tx_bytes": 0}
+
+
+def test_delta_payload_lists_added_changed_and_removed_peers(service):
+    previous = {key: _peer(key) for key in ("kept", "updated", "gone")}
+    current_peers = [_peer("kept"), _peer("updated", rx_bytes=42), _peer("new")]
+    snapshot = {
+        "protocol": "amneziawg2",
+        "server_id": "server-1",
+        "sync_timestamp": "2026-01-01T00:00:00+00:00",
+        "peers": current_peers,
+    }
+    peers = {peer["public_key"]: peer for peer in current_peers}
+
+    payload = service._build_delta_payload(snapshot, SyncState(version=4, peers=previous), peers, 5)
+
+    assert payload["sync_mode"] == "delta"
+    assert payload["base_version"] == 4
+    assert payload["version"] == 5
+    assert payload["added"] == [_peer("new")]
+    assert payload["changed"] == [_peer("updated", rx_bytes=42)]
+    assert payload["removed"] == ["gone"]
+    assert "peers" not in payload
+    assert payload["protocol"] == "amneziawg2"
+    assert payload["server_id"] == "server-1"
+
+
+def test_delta_payload_is_empty_when_nothing_changed(service):
+    peers = {"kept": _peer("kept")}
+    snapshot = {"protocol": "amneziawg2", "peers": list(peers.values())}
+
+    payload = service._build_delta_payload(snapshot, SyncState(version=1, peers=dict(peers)), peers, 2)
+
+    assert (payload["added"], payload["changed"], payload["removed"]) == ([], [], [])
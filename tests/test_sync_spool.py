@@ -0,0 +1,85 @@
+import os
+
+from src.services.management.sync_spool import SEGMENT_PREFIX, SyncSpool, _encode
+
+
+def _payload(version: int, protocol: str = "amneziawg2") -> dict:
+    return {"protocol": protocol, "version": version, "sync_mode": "delta", "pad": "x" * 8}
+
+
+def _segments(path) -> list[str]:
+    return sorted(name for name in os.listdir(path) if name.startswith(SEGMENT_PREFIX))
+
+
+def _versions(spool: SyncSpool) -> list[int]:
+    return [entry.payload["version"] for entry in spool.read(100)]
+
+
+def test_partial_segment_ack_keeps_the_rest(tmp_path):
+    spool = SyncSpool(str(tmp_path), max_bytes=1024 * 1024)
+    for version in (1, 2, 3):
+        spool.append(_payload(version))
+
+    entries = spool.read(2)
+    spool.ack(entries[-1])
+
+    assert spool.count == 1
+    assert spool.size == len(_encode(_payload(3)))
+    assert _versions(spool) == [3]
+    reloaded = SyncSpool(str(tmp_path), max_bytes=1024 * 1024)
+    assert reloaded.count == 1
+    assert reloaded.size == spool.size
+    assert _versions(reloaded) == [3]
+
+
+def test_ack_across_segments_removes_consumed_files(tmp_path):
+    line = len(_encode(_payload(1)))
+    spool = SyncSpool(str(tmp_path), max_bytes=line * 8)
+    for version in range(1, 6):
+        spool.append(_payload(version))
+    assert len(_segments(tmp_path)) == 3
+
+    entries = spool.read(3)
+    spool.ack(entries[-1])
+
+    assert spool.count == 2
+    assert spool.size == line * 2
+    assert len(_segments(tmp_path)) == 2
+    assert _versions(spool) == [4, 5]
+    assert _versions(SyncSpool(str(tmp_path), max_bytes=line * 8)) == [4, 5]
+
+    spool.ack(spool.read(2)[-1])
+    assert not spool.pending
+    assert _segments(tmp_path) == []
+
+
+def test_collapse_replaces_protocol_entries_with_full_snapshot(tmp_path):
+    line = len(_encode(_payload(1)))
+    spool = SyncSpool(str(tmp_path), max_bytes=line * 3)
+    spool.append(_payload(1))
+    spool.append(_payload(1, protocol="xray"))
+    spool.append(_payload(2))
+    full = {"protocol": "amneziawg2", "version": 3, "sync_mode": "full", "peers": []}
+    assert not spool.fits(full)
+
+    spool.collapse("amneziawg2", full)
+
+    payloads = [entry.payload for entry in spool.read(100)]
+    assert payloads == [_payload(1, protocol="xray"), full]
+    assert spool.count == 2
+    assert spool.last_version("amneziawg2") == 3
+    assert spool.last_version("xray") == 1
+
+
+def test_reload_skips_torn_trailing_line(tmp_path):
+    spool = SyncSpool(str(tmp_path), max_bytes=1024 * 1024)
+    spool.append(_payload(1))
+    spool.append(_payload(2))
+    with open(tmp_path / _segments(tmp_path)[-1], "ab") as file_handle:
+        file_handle.write(_encode(_payload(3))[:-5])
+
+    reloaded = SyncSpool(str(tmp_path), max_bytes=1024 * 1024)
+
+    assert reloaded.count == 2
+    assert _versions(reloaded) == [1, 2]
+    assert reloaded.last_version("amneziawg2") == 2
@@ -0,0 +1,114 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from src.services.management.traffic_accounting import (
+    BUCKET_SECONDS,
+    SCHEMA,
+    TrafficAccounting,
+)
+
+
+PROTOCOL = "amneziawg2"
+HOUR = 1_700_000_000 - 1_700_000_000 % BUCKET_SECONDS
+
+
+@pytest.fixture
+def accounting(tmp_path):
+    store = TrafficAccounting(str(tmp_path / "traffic" / "accounting.db"))
+    yield store
+    store.close()
+
+
+def _record(store: TrafficAccounting, timestamp: int, **counters: tuple[int, int]):
+    peers = [
+        {"public_key": key, "rx_bytes": rx_bytes, "tx_bytes": tx_bytes}
+        for key, (rx_bytes, tx_bytes) in counters.items()
+    ]
+    return asyncio.run(store.record(PROTOCOL, peers, timestamp=timestamp))
+
+
+def _usage(store: TrafficAccounting, key: str, since: int, until: int) -> dict:
+    return asyncio.run(store.get_peer_usage(PROTOCOL, key, since, until))
+
+
+def test_first_sighting_sets_baseline_without_usage(accounting):
+    totals = _record(accounting, HOUR + 10, a=(500, 300))
+
+    assert totals == {"a": (500, 300)}
+    usage = _usage(accounting, "a", HOUR, HOUR + BUCKET_SECONDS)
+    assert (usage["lifetime_rx_bytes"], usage["lifetime_tx_bytes"]) == (500, 300)
+    assert (usage["rx_bytes"], usage["tx_bytes"]) == (0, 0)
+    assert usage["first_seen"] == HOUR + 10
+
+
+@pytest.mark.parametrize("after_reset", [(40, 400), (600, 30)])
+def test_counter_reset_counts_new_value(accounting, after_reset):
+    _record(accounting, HOUR, a=(500, 300))
+    totals = _record(accounting, HOUR + 60, a=after_reset)
+
+    assert totals == {"a": (500 + after_reset[0], 300 + after_reset[1])}
+    usage = _usage(accounting, "a", HOUR, HOUR + BUCKET_SECONDS)
+    assert (usage["rx_bytes"], usage["tx_bytes"]) == after_reset
+
+
+def test_usage_is_attributed_to_hourly_buckets(accounting):
+    _record(accounting, HOUR + 5, a=(0, 0))
+    _record(accounting, HOUR + 1800, a=(100, 10))
+    _record(accounting, HOUR + 3599, a=(150, 20))
+    _record(accounting, HOUR + BUCKET_SECONDS, a=(400, 50))
+
+    usage = _usage(accounting, "a", HOUR, HOUR + 2 * BUCKET_SECONDS)
+
+    assert usage["buckets"] == [
+        {"bucket": HOUR, "rx_bytes": 150, "tx_bytes": 20},
+        {"bucket": HOUR + BUCKET_SECONDS, "rx_bytes": 250, "tx_bytes": 30},
+    ]
+
+
+def test_since_and_until_select_buckets(accounting):
+    _record(accounting, HOUR, a=(0, 0), b=(0, 0))
+    _record(accounting, HOUR + 60, a=(100, 10), b=(5, 5))
+    _record(accounting, HOUR + BUCKET_SECONDS + 60, a=(300, 30))
+    _record(accounting, HOUR + 2 * BUCKET_SECONDS + 60, a=(600, 60))
+
+    second_hour = _usage(accounting, "a", HOUR + BUCKET_SECONDS + 120, HOUR + 2 * BUCKET_SECONDS)
+    assert [bucket["bucket"] for bucket in second_hour["buckets"]] == [HOUR + BUCKET_SECONDS]
+    assert (second_hour["rx_bytes"], second_hour["tx_bytes"]) == (200, 20)
+
+    usage = asyncio.run(accounting.get_usage(PROTOCOL, HOUR, HOUR + BUCKET_SECONDS))
+    assert [(row["public_key"], row["rx_bytes"], row["lifetime_rx_bytes"]) for row in usage] == [
+        ("a", 100, 600),
+        ("b", 5, 5),
+    ]
+    assert asyncio.run(accounting.get_peer_usage(PROTOCOL, "missing", HOUR, HOUR + 1)) is None
+
+
+def test_failed_write_reloads_counters_from_database(accounting):
+    _record(accounting, HOUR, a=(100, 100))
+    _record(accounting, HOUR + 60, a=(150, 120))
+
+    accounting._connection.execute("DROP TABLE traffic_usage")
+    with pytest.raises(sqlite3.Error):
+        _record(accounting, HOUR + 120, a=(200, 200))
+    accounting._connection.executescript(SCHEMA)
+
+    totals = _record(accounting, HOUR + BUCKET_SECONDS, a=(250, 210))
+
+    assert totals == {"a": (250, 210)}
+    usage = _usage(accounting, "a", HOUR + BUCKET_SECONDS, HOUR + 2 * BUCKET_SECONDS)
+    assert (usage["rx_bytes"], usage["tx_bytes"]) == (100, 90)
+
+
+def test_counters_survive_reopen(tmp_path):
+    path = str(tmp_path / "accounting.db")
+    first = TrafficAccounting(path)
+    _record(first, HOUR, a=(100, 100))
+    first.close()
+
+    second = TrafficAccounting(path)
+    try:
+        assert _record(second, HOUR + 60, a=(130, 110)) == {"a": (130, 110)}
+    finally:
+        second.close()
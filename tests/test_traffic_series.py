@@ -0,0 +1,85 @@
+from src.services.management.traffic_series import (
+    RAW_CAPACITY,
+    WINDOW_HOUR,
+    WINDOW_MINUTE,
+    PeerTrafficSeries,
+    TrafficRing,
+    TrafficSeriesStore,
+)
+
+
+def test_ring_wraps_and_keeps_latest_samples_in_order():
+    ring = TrafficRing(3)
+    assert ring.last_timestamp() is None
+    assert ring.samples() == []
+
+    for step in range(5):
+        ring.append(100 + step, step * 10, step)
+
+    assert ring.size == 3
+    assert ring.last_timestamp() == 104
+    assert ring.samples() == [(102, 20, 2), (103, 30, 3), (104, 40, 4)]
+
+
+def test_raw_ring_is_bounded():
+    series = PeerTrafficSeries()
+    for step in range(RAW_CAPACITY + 5):
+        series.record(1000 + step * 10, step, step)
+
+    samples = series.raw.samples()
+    assert len(samples) == RAW_CAPACITY
+    assert samples[0][0] == 1000 + 5 * 10
+
+
+def test_current_rate_uses_latest_interval():
+    series = PeerTrafficSeries()
+    series.record(1000, 0, 0)
+    series.record(1010, 1000, 500)
+
+    assert series.current_rate() == {"rx_bytes_per_second": 100.0, "tx_bytes_per_second": 50.0}
+
+
+def test_counter_reset_counts_new_value_as_delta():
+    series = PeerTrafficSeries()
+    series.record(1000, 5000, 5000)
+    series.record(1010, 200, 6000)
+
+    assert series.current_rate() == {"rx_bytes_per_second": 20.0, "tx_bytes_per_second": 100.0}
+
+
+def test_out_of_order_samples_are_ignored():
+    series = PeerTrafficSeries()
+    series.record(1000, 0, 0)
+    series.record(1000, 999, 999)
+    series.record(990, 999, 999)
+
+    assert series.raw.samples() == [(1000, 0, 0)]
+
+
+def test_window_includes_sample_before_the_window_start():
+    series = PeerTrafficSeries()
+    for step in range(4):
+        series.record(1000 + step * 30, step * 300, 0)
+
+    window = series.window(WINDOW_MINUTE, now=1100)
+
+    assert [point["timestamp"] for point in window["points"]] == [1060, 1090]
+    assert window["rx_bytes_per_second"] == 10.0
+
+
+def test_minute_ring_keeps_one_sample_per_minute():
+    series = PeerTrafficSeries()
+    for timestamp in (60, 70, 119, 120, 185):
+        series.record(timestamp, timestamp, 0)
+
+    assert [sample[0] for sample in series.minutes.samples()] == [60, 120, 185]
+    assert series.window(WINDOW_HOUR, now=185)["rx_bytes_per_second"] == 1.0
+
+
+def test_store_drops_series_of_removed_peers():
+    store = TrafficSeriesStore("amneziawg2")
+    store.record([{"public_key": "a"}, {"public_key": "b"}], timestamp=1000)
+    store.record([{"public_key": "a", "rx_bytes": 10}], timestamp=1010)
+
+    assert store.get("b") is None
+    assert store.get("a").current_rate()["rx_bytes_per_second"] == 1.0
@@ -0,0 +1,47 @@
+from src.services.management.wireguard_config import WireGuardConfig
+
+
+CONFIG = """[Interface]
+PrivateKey = server
+Address = 10.8.1.0/24
+
+[Peer]
+PublicKey = alpha
+AllowedIPs = 10.8.1.2/32
+
+[Peer]
+# Name = beta
+PublicKey = beta
+AllowedIPs = 10.8.1.3/32
+"""
+
+
+def test_parse_serialize_round_trip():
+    config = WireGuardConfig.parse(CONFIG)
+    assert config.serialize() == CONFIG
+    assert list(config.peer_public_keys()) == ["alpha", "beta"]
+    assert config.get_peer("beta").get_metadata("name") == "beta"
+
+
+def test_add_and_remove_peer():
+    config = WireGuardConfig.parse(CONFIG)
+    config.add_peer("gamma", {"AllowedIPs": "10.8.1.4/32"})
+    assert config.get_peer("gamma").get("AllowedIPs") == "10.8.1.4/32"
+
+    assert config.remove_peer("alpha")
+    assert not config.remove_peer("alpha")
+    assert "alpha" not in config.serialize()
+    assert config.peer_count == 2
+
+
+def test_remove_peer_drops_every_duplicate_section():
+    duplicate = "\n[Peer]\nPublicKey = alpha\nAllowedIPs = 10.8.1.9/32\n"
+    config = WireGuardConfig.parse(CONFIG + duplicate)
+    assert config.peer_count == 2
+    assert config.get_peer("alpha").get("AllowedIPs") == "10.8.1.2/32"
+
+    assert config.remove_peer("alpha")
+    serialized = config.serialize()
+    assert "alpha" not in serialized
+    assert "10.8.1.9" not in serialized
+    assert "PublicKey = beta" in serialized
@@ -0,0 +1,102 @@
+import base64
+
+import pytest
+
+from src.services.management.wireguard_keys import (
+    KEY_SIZE,
+    _clamp,
+    _x25519,
+    derive_public_key,
+    generate_keypair,
+    generate_preshared_key,
+    generate_private_key,
+)
+
+
+def _u(hex_value: str) -> int:
+    raw = bytearray(bytes.fromhex(hex_value))
+    raw[31] &= 127
+    return int.from_bytes(raw, "little")
+
+
+def _b64(hex_value: str) -> str:
+    return base64.b64encode(bytes.fromhex(hex_value)).decode()
+
+
+@pytest.mark.parametrize(
+    ("scalar", "u", "expected"),
+    [
+        (
+            "a546e36bf0527c9d3b16154b82465edd62144c0ac1fc5a18506a2244ba449ac4",
+            "e6db6867583030db3594c1a424b15f7c726624ec26b3353b10a903a6d0ab1c4c",
+            "c3da55379de9c6908e94ea4df28d084f32eccf03491c71f754b4075577a28552",
+        ),
+        (
+            "4b66e9d4d1b4673c5ad22691957d6af5c11b6421e0ea01d42ca4169e7918ba0d",
+            "e5210f12786811d3f4b7959d0538ae2c31dbe7106fc03c3efc4cd549c715a493",
+            "95cbde9476e8907d7aade45cb4b873f88b595a68799fa152e6f8f7647aac7957",
+        ),
+    ],
+)
+def test_x25519_rfc7748_vectors(scalar, u, expected):
+    assert _x25519(bytes.fromhex(scalar), _u(u)).hex() == expected
+
+
+def test_x25519_rfc7748_iteration():
+    k = u = (9).to_bytes(KEY_SIZE, "little")
+    k, u = _x25519(k, int.from_bytes(u, "little")), k
+    assert k.hex() == "422c8e7a6227d7bca1350b3e2bb7279f7897b87bb6854b783c60e80311ae3079"
+
+
+def test_x25519_rfc7748_key_agreement():
+    alice_private = "77076d0a7318a57d3c16c17251b26645df4c2f87ebc0992ab177fba51db92c2a"
+    bob_private = "5dab087e624a8a4b79e17f8b83800ee66f3bb1292618b6fd1c2f8b27ff88e0eb"
+    alice_public = "8520f0098930a754748b7ddcb43ef75a0dbf3a0d26381af4eba4a98eaa9b4e6a"
+    bob_public = "de9edb7d7b7dc1b4d35b61c2ece435373f8343c85b78674dadfc7e146f882b4f"
+    shared = "4a5d9d5ba4ce2de1728e3bf480350f25e07e21c947d19e3376f09b3c1e161742"
+
+    assert derive_public_key(_b64(alice_private)) == _b64(alice_public)
+    assert derive_public_key(_b64(bob_private)) == _b64(bob_public)
+    assert _x25519(bytes.fromhex(alice_private), _u(bob_public)).hex() == shared
+    assert _x25519(bytes.fromhex(bob_private), _u(alice_public)).hex() == shared
+
+
+def test_clamp_sets_and_clears_fixed_bits():
+    clamped = _clamp(b"\xff" * KEY_SIZE)
+    assert clamped[0] == 248
+    assert clamped[31] == 127
+    assert _clamp(bytes(KEY_SIZE))[31] == 64
+    assert _clamp(clamped) == clamped
+
+
+def test_generated_private_key_is_clamped():
+    raw = base64.b64decode(generate_private_key())
+    assert len(raw) == KEY_SIZE
+    assert raw[0] & 7 == 0
+    assert raw[31] & 128 == 0
+    assert raw[31] & 64 == 64
+
+
+def test_unclamped_private_key_derives_same_public_key():
+    raw = bytes(range(KEY_SIZE))
+    unclamped = base64.b64encode(raw).decode()
+    clamped = base64.b64encode(_clamp(raw)).decode()
+    assert derive_public_key(unclamped) == derive_public_key(clamped)
+
+
+def test_keypair_base64_round_trip():
+    private_key, public_key = generate_keypair()
+    assert len(private_key) == 44 and private_key.endswith("=")
+    assert base64.b64encode(base64.b64decode(public_key)).decode() == public_key
+    assert derive_public_key(private_key) == public_key
+    assert derive_public_key(f" {private_key}\n") == public_key
+
+
+def test_preshared_key_is_32_bytes():
+    assert len(base64.b64decode(generate_preshared_key())) == KEY_SIZE
+
+
+@pytest.mark.parametrize("key", ["not base64!", base64.b64encode(b"short").decode(), ""])
+def test_derive_public_key_rejects_invalid_keys(key):
+    with pytest.raises(ValueError):
+        derive_public_key(key)